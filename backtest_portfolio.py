@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+"""
+Portfolio backtest: all symbols trade one shared account, like the live bot.
+
+  python backtest_portfolio.py --interval 5m --days 90
+  python backtest_portfolio.py --symbols BTCUSDT ETHUSDT --strategies LiquidityGrab TrendPullback
+"""
+import argparse
+
+from src.core.backtest import STRATEGY_CLASSES
+from src.core.portfolio_backtest import PortfolioBacktest
+from src.exchange.binance_client import BinanceClient
+from config.settings import Config
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Shared-balance multi-symbol backtest")
+    parser.add_argument('--symbols', nargs='+', default=None, help="Default: Config.SYMBOLS")
+    parser.add_argument('--strategies', nargs='+', default=['LiquidityGrab'], choices=list(STRATEGY_CLASSES))
+    parser.add_argument('--interval', default=Config.TIMEFRAME)
+    parser.add_argument('--days', type=int, default=30)
+    parser.add_argument('--workers', type=int, default=None)
+    args = parser.parse_args()
+
+    exchange = BinanceClient(Config.BINANCE_API_KEY, Config.BINANCE_API_SECRET, testnet=Config.TESTNET)
+    portfolio = PortfolioBacktest(exchange, Config, strategies=args.strategies, max_workers=args.workers)
+    result = portfolio.run(args.symbols or Config.SYMBOLS, args.interval, args.days)
+
+    stats = result['stats']
+    print(f"\nTrades: {stats['total_trades']} | Win rate: {stats['win_rate']:.2f}% | "
+          f"PnL: {stats['total_pnl']:.2f} | Fees: {stats['total_fees']:.2f}")
+    print(f"Balance: {stats['initial_balance']:.2f} -> {stats['final_balance']:.2f} "
+          f"({stats['return_pct']:.2f}%) | Max drawdown: {stats['max_drawdown_pct']:.2f}%")
+    print(f"Max open positions: {result['max_open_positions']} | "
+          f"Rejected for margin: {result['rejected_margin']}")
+    for symbol, row in result['symbols'].items():
+        print(f"  {symbol:<12} {row['total_trades']:>5} trades  {row['win_rate']:6.2f}%  {row['total_pnl']:10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+import time
+import pandas as pd
+import numpy as np
+from src.utils.indicators import atr_percentile, RollingPercentileRank
+
+def legacy_atr_percentile(atr_series, lookback=100):
+    """Previous rolling().apply implementation, kept for comparison."""
+    return atr_series.rolling(window=lookback).apply(
+        lambda x: (x.iloc[-1] <= x).sum() / len(x) * 100 if len(x) > 0 else 50
+    )
+
+def timed(func, *args, repeat=3):
+    """Result and best time of `repeat` runs (runs vary by +-15% otherwise)."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(*args)
+        best = min(best, time.perf_counter() - start)
+    return result, best
+
+def benchmark(rows, lookback=100):
+    print(f"\n{rows:,} rows (lookback={lookback})")
+    atr = pd.Series(np.abs(np.random.default_rng(0).standard_normal(rows)).cumsum() % 50 + 1)
+
+    legacy, legacy_time = timed(legacy_atr_percentile, atr, lookback)
+    fast, fast_time = timed(atr_percentile, atr, lookback)
+
+    # Incremental path: one push per candle
+    ranker = RollingPercentileRank(lookback)
+    start = time.perf_counter()
+    incremental = np.array([ranker.push(v) for v in atr.values])
+    incremental_time = time.perf_counter() - start
+
+    batch_ok = np.allclose(legacy.values, fast.values, equal_nan=True)
+    incremental_ok = np.allclose(legacy.values, incremental, equal_nan=True)
+    print(f"  rolling().apply : {legacy_time * 1000:10.1f} ms")
+    print(f"  batch (bisect)  : {fast_time * 1000:10.1f} ms  ({legacy_time / fast_time:.1f}x)")
+    print(f"  incremental     : {incremental_time / rows * 1e6:10.2f} us/candle")
+    print(f"  {'PASS' if batch_ok and incremental_ok else 'FAIL'}: results match legacy implementation")
+
+if __name__ == "__main__":
+    print("Benchmarking atr_percentile...")
+    benchmark(1_500)
+    benchmark(100_000)
@@ -0,0 +1,141 @@
+import time
+import pandas as pd
+import numpy as np
+from src.core.backtest import BacktestEngine
+from src.utils.indicators import calculate_indicators
+
+class MockConfig:
+    RISK_PER_TRADE = 0.01
+    STOP_LOSS_ATR_MULTIPLIER = 2.0
+    TAKE_PROFIT_RR = 1.5
+
+def make_candles(periods, seed=42):
+    rng = np.random.default_rng(seed)
+    close = 100 + np.cumsum(rng.normal(0, 0.3, periods))
+    open_ = np.roll(close, 1)
+    open_[0] = close[0]
+    return pd.DataFrame({
+        'timestamp': pd.date_range(start='2024-01-01', periods=periods, freq='1min'),
+        'open': open_,
+        'high': np.maximum(open_, close) + np.abs(rng.normal(0, 0.2, periods)),
+        'low': np.minimum(open_, close) - np.abs(rng.normal(0, 0.2, periods)),
+        'close': close,
+        'volume': rng.integers(100, 1000, periods).astype(float)
+    })
+
+def legacy_run_backtest(engine, df, symbol):
+    """Previous per-row df.iloc loop, kept for comparison."""
+    df = calculate_indicators(df)
+    trades = []
+    balance = engine.initial_balance
+    position = None
+    for i in range(205, len(df)):
+        current_candle = df.iloc[i]
+        prev_candle = df.iloc[i-1]
+        current_price = current_candle['close']
+        current_time = current_candle.name
+        if position:
+            should_close = False
+            if position['side'] == 'LONG':
+                if current_candle['low'] <= position['stop_loss']:
+                    should_close, exit_reason, exit_price = True, "SL Hit", position['stop_loss']
+                elif current_candle['high'] >= position['take_profit']:
+                    should_close, exit_reason, exit_price = True, "TP Hit", position['take_profit']
+            else:
+                if current_candle['high'] >= position['stop_loss']:
+                    should_close, exit_reason, exit_price = True, "SL Hit", position['stop_loss']
+                elif current_candle['low'] <= position['take_profit']:
+                    should_close, exit_reason, exit_price = True, "TP Hit", position['take_profit']
+            if should_close:
+                if position['side'] == 'LONG':
+                    pnl = (exit_price - position['entry_price']) * position['quantity']
+                else:
+                    pnl = (position['entry_price'] - exit_price) * position['quantity']
+                balance += pnl
+                trades.append({**position, 'exit_price': exit_price, 'pnl': pnl,
+                               'exit_time': current_time, 'exit_reason': exit_reason})
+                position = None
+                continue
+        if position is None:
+            signal = legacy_check_signal(current_candle, prev_candle)
+            if signal != 'NONE':
+                entry_price = current_price
+                sl_dist = current_candle['atr'] * engine.sl_multiplier
+                if signal == 'LONG':
+                    stop_loss = entry_price - sl_dist
+                    take_profit = entry_price + (sl_dist * engine.tp_rr)
+                else:
+                    stop_loss = entry_price + sl_dist
+                    take_profit = entry_price - (sl_dist * engine.tp_rr)
+                risk_amount = balance * engine.risk_per_trade
+                price_diff = abs(entry_price - stop_loss)
+                quantity = risk_amount / price_diff if price_diff > 0 else 0
+                if quantity > 0:
+                    position = {'side': signal, 'entry_price': entry_price, 'stop_loss': stop_loss,
+                                'take_profit': take_profit, 'quantity': quantity, 'entry_time': current_time}
+    if position:
+        last_price = df.iloc[-1]['close']
+        if position['side'] == 'LONG':
+            pnl = (last_price - position['entry_price']) * position['quantity']
+        else:
+            pnl = (position['entry_price'] - last_price) * position['quantity']
+        balance += pnl
+        trades.append({**position, 'exit_price': last_price, 'pnl': pnl,
+                       'exit_time': df.iloc[-1].name, 'exit_reason': 'End of Backtest'})
+    return trades, balance
+
+def legacy_check_signal(current, prev):
+    if (current['close'] > current['ema_trend'] and current['close'] > current['vwap'] and
+            current['ema_fast'] > current['ema_slow'] and current['rsi'] > 50 and
+            current['volume'] > current['vol_ma']):
+        cross_up = (prev['ema_fast'] <= prev['ema_slow']) and (current['ema_fast'] > current['ema_slow'])
+        price_cross_up = (prev['close'] <= prev['ema_fast']) and (current['close'] > current['ema_fast'])
+        if cross_up or price_cross_up:
+            return 'LONG'
+    elif (current['close'] < current['ema_trend'] and current['close'] < current['vwap'] and
+            current['ema_fast'] < current['ema_slow'] and current['rsi'] < 50 and
+            current['volume'] > current['vol_ma']):
+        cross_down = (prev['ema_fast'] >= prev['ema_slow']) and (current['ema_fast'] < current['ema_slow'])
+        price_cross_down = (prev['close'] >= prev['ema_fast']) and (current['close'] < current['ema_fast'])
+        if cross_down or price_cross_down:
+            return 'SHORT'
+    return 'NONE'
+
+def trades_match(legacy_trades, trades):
+    if len(legacy_trades) != len(trades):
+        return False
+    for old, new in zip(legacy_trades, trades):
+        if old['side'] != new['side'] or old['exit_reason'] != new['exit_reason']:
+            return False
+        if pd.Timestamp(old['entry_time']) != pd.Timestamp(new['entry_time']):
+            return False
+        if pd.Timestamp(old['exit_time']) != pd.Timestamp(new['exit_time']):
+            return False
+        for field in ('entry_price', 'exit_price', 'stop_loss', 'take_profit', 'quantity', 'pnl'):
+            if not np.isclose(old[field], new[field]):
+                return False
+    return True
+
+def benchmark(rows):
+    print(f"\n{rows:,} candles")
+    engine = BacktestEngine(None, MockConfig())
+    df = make_candles(rows)
+
+    start = time.perf_counter()
+    legacy_trades, legacy_balance = legacy_run_backtest(engine, df.copy(), 'BTCUSDT')
+    legacy_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    trades, balance = engine.simulate(df.copy(), 'BTCUSDT')
+    fast_time = time.perf_counter() - start
+
+    print(f"  df.iloc loop : {legacy_time:8.2f} s")
+    print(f"  array engine : {fast_time:8.2f} s  ({legacy_time / fast_time:.0f}x)")
+    ok = trades_match(legacy_trades, trades) and np.isclose(legacy_balance, balance)
+    print(f"  {'PASS' if ok else 'FAIL'}: {len(trades)} trades, final balance {balance:.2f} "
+          f"({'matches' if ok else 'differs from'} legacy)")
+
+if __name__ == "__main__":
+    print("Benchmarking BacktestEngine...")
+    benchmark(10_000)
+    benchmark(100_000)
@@ -0,0 +1,89 @@
+import os
+import tempfile
+import time
+import numpy as np
+import pandas as pd
+from flask import Flask
+
+from src.database.models import db, BacktestTrade
+from src.core.backtest import BacktestEngine, TRADE_DTYPE
+
+class MockConfig:
+    RISK_PER_TRADE = 0.01
+    STOP_LOSS_ATR_MULTIPLIER = 2.0
+    TAKE_PROFIT_RR = 1.5
+    TRADING_FEE_RATE = 0.0005
+
+def make_trades(n, seed=7):
+    rng = np.random.default_rng(seed)
+    trades = np.zeros(n, dtype=TRADE_DTYPE)
+    entry = rng.uniform(100, 200, n)
+    trades['symbol'] = 'BTCUSDT'
+    trades['side'] = np.where(rng.random(n) > 0.5, 'LONG', 'SHORT')
+    trades['entry_price'] = entry
+    trades['exit_price'] = entry * rng.uniform(0.98, 1.02, n)
+    trades['stop_loss'] = entry * 0.98
+    trades['take_profit'] = entry * 1.03
+    trades['quantity'] = rng.uniform(0.1, 2, n)
+    trades['pnl'] = rng.normal(0, 5, n)
+    trades['fee'] = 0.1
+    start = np.datetime64('2024-01-01T00:00')
+    trades['entry_time'] = start + np.arange(n) * np.timedelta64(5, 'm')
+    trades['exit_time'] = trades['entry_time'] + np.timedelta64(15, 'm')
+    trades['exit_reason'] = 'TP Hit'
+    trades['strategy'] = 'Backtest-Scalping'
+    return trades
+
+def legacy_save(trades, run_id):
+    """Previous approach: one ORM object per trade."""
+    for t in trades:
+        db.session.add(BacktestTrade(
+            run_id=run_id,
+            symbol=t['symbol'],
+            side=t['side'],
+            entry_price=float(t['entry_price']),
+            exit_price=float(t['exit_price']),
+            stop_loss=float(t['stop_loss']),
+            take_profit=float(t['take_profit']),
+            quantity=float(t['quantity']),
+            pnl=float(t['pnl']),
+            fee=float(t['fee']),
+            entry_time=pd.Timestamp(t['entry_time']).to_pydatetime(),
+            exit_time=pd.Timestamp(t['exit_time']).to_pydatetime(),
+            exit_reason=t['exit_reason']
+        ))
+    db.session.commit()
+
+def benchmark_save():
+    path = os.path.join(tempfile.mkdtemp(), 'bench.db')
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = f'sqlite:///{path}'
+    db.init_app(app)
+    engine = BacktestEngine(None, MockConfig())
+
+    print("Benchmarking backtest persistence (SQLite)...")
+    with app.app_context():
+        db.create_all()
+        for n in (10_000, 100_000):
+            trades = make_trades(n)
+            final_balance = engine.initial_balance + trades['pnl'].sum()
+
+            t0 = time.perf_counter()
+            run = engine.save_to_database(trades, final_balance, 'BTCUSDT', '5m')
+            bulk = time.perf_counter() - t0
+            stored = BacktestTrade.query.filter_by(run_id=run.id).count()
+
+            t0 = time.perf_counter()
+            legacy_save(trades, run.id + 1000)
+            legacy = time.perf_counter() - t0
+
+            print(f"\n{n:,} trades")
+            print(f"  per-row ORM : {legacy:8.2f} s")
+            print(f"  bulk insert : {bulk:8.2f} s  ({legacy / bulk:.0f}x)")
+            last = BacktestTrade.query.filter_by(run_id=run.id).order_by(BacktestTrade.id.desc()).first()
+            ok = (stored == n and run.total_trades == n and np.isclose(run.total_pnl, trades['pnl'].sum())
+                  and last.exit_time == pd.Timestamp(trades['exit_time'][-1]).to_pydatetime())
+            print(f"  {'PASS' if ok else 'FAIL'}: {stored} rows stored, summary total_pnl {run.total_pnl:.2f}, datetimes round-trip")
+
+if __name__ == "__main__":
+    benchmark_save()
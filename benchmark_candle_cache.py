@@ -0,0 +1,86 @@
+import json
+import time
+import numpy as np
+import pandas as pd
+from src.exchange.websocket_manager import BinanceWebSocket
+
+def make_messages(symbols, candles, updates_per_candle, seed=0):
+    """Kline messages: intrabar updates followed by the closing update."""
+    rng = np.random.default_rng(seed)
+    start = 1_704_067_200_000
+    messages = []
+    for i in range(candles):
+        for symbol in symbols:
+            price = 100 + rng.normal()
+            for u in range(updates_per_candle):
+                messages.append(json.dumps({'e': 'kline', 'k': {
+                    's': symbol, 't': start + i * 60_000, 'x': u == updates_per_candle - 1,
+                    'o': f"{price:.4f}", 'h': f"{price + 1:.4f}", 'l': f"{price - 1:.4f}",
+                    'c': f"{price + rng.normal(0, 0.1):.4f}", 'v': f"{rng.uniform(10, 100):.3f}",
+                }}))
+    return messages
+
+class ConcatCache:
+    """The previous cache: pd.concat + tail on every closed candle."""
+    def __init__(self, max_cached_candles, candle_limit, on_candle_close):
+        self.max_cached_candles = max_cached_candles
+        self.candle_limit = candle_limit
+        self.on_candle_close = on_candle_close
+        self.candle_cache = {}
+        self.current_candles = {}
+
+    def on_message(self, message):
+        kline = json.loads(message)['k']
+        symbol = kline['s']
+        candle = {
+            'timestamp': pd.to_datetime(kline['t'], unit='ms'),
+            'open': float(kline['o']), 'high': float(kline['h']), 'low': float(kline['l']),
+            'close': float(kline['c']), 'volume': float(kline['v']),
+        }
+        self.current_candles[symbol] = candle
+        if kline['x']:
+            new_row = pd.DataFrame([candle])
+            df = self.candle_cache.get(symbol)
+            self.candle_cache[symbol] = new_row if df is None else pd.concat([df, new_row], ignore_index=True).tail(self.max_cached_candles)
+            df = pd.concat([self.candle_cache[symbol], pd.DataFrame([self.current_candles[symbol]])], ignore_index=True)
+            self.on_candle_close(symbol, df.tail(self.candle_limit).copy())
+
+def benchmark_candle_cache():
+    symbols = [f"SYM{i}USDT" for i in range(20)]
+    messages = make_messages(symbols, candles=400, updates_per_candle=5)
+    closes = sum('"x": true' in m for m in messages)
+    print(f"Candle cache: {len(messages):,} kline messages, {closes:,} candle closes, {len(symbols)} symbols...")
+
+    old_frames, new_frames = {}, {}
+    old = ConcatCache(250, 205, lambda symbol, df: old_frames.__setitem__(symbol, df))
+    t0 = time.perf_counter()
+    for message in messages:
+        old.on_message(message)
+    old_time = time.perf_counter() - t0
+
+    ws = BinanceWebSocket(symbols, candle_limit=205, on_candle_close=lambda symbol, df: new_frames.__setitem__(symbol, df))
+    t0 = time.perf_counter()
+    for message in messages:
+        ws._on_message(None, message)
+    while ws.dispatch_metrics()['dispatched'] < closes:  # Callbacks run on worker threads
+        time.sleep(0.001)
+    new_time = time.perf_counter() - t0
+    ws.stop()
+
+    print(f"\n  concat + tail cache : {old_time:7.2f} s ({old_time / closes * 1e6:7.1f} us/close)")
+    print(f"  ring buffer cache   : {new_time:7.2f} s ({new_time / closes * 1e6:7.1f} us/close)")
+    print(f"  speedup             : {old_time / new_time:7.1f}x")
+
+    # The old on-close frame repeated the just-closed candle as the current
+    # one; the ring buffer frame holds 205 distinct candles instead
+    ok = all(
+        len(new_frames[s]) == 205 and
+        new_frames[s].iloc[1:].reset_index(drop=True).equals(old_frames[s].iloc[:-1].reset_index(drop=True))
+        for s in symbols
+    )
+    symbol = symbols[0]
+    ok = ok and ws.is_ready(symbol) and ws.get_current_price(symbol) == old.current_candles[symbol]['close']
+    print(f"  {'PASS' if ok else 'FAIL'}: frames match the concat cache")
+
+if __name__ == "__main__":
+    benchmark_candle_cache()
@@ -0,0 +1,110 @@
+import time
+import numpy as np
+import pandas as pd
+from config.settings import Config
+from src.core.backtest import STRATEGY_CLASSES, WARMUP_CANDLES
+from src.core.portfolio_backtest import PortfolioBacktest
+from verify_helpers import make_candles
+
+def reference_portfolio(portfolio, streams):
+    """Per-candle loop over the union of candle times, for comparison."""
+    index = [dict(zip(data['times'].tolist(), range(len(data['times'])))) for _, _, data in streams]
+    all_times = sorted(set().union(*index))
+    balance = portfolio.initial_balance
+    used_margin = 0.0
+    open_trades = {}  # stream -> (exit_time, pnl, margin)
+    next_bar = [WARMUP_CANDLES] * len(streams)
+    trades = []
+    for t in all_times:
+        for s in [s for s, trade in open_trades.items() if trade[0] == t]:
+            _, pnl, margin = open_trades.pop(s)
+            balance += pnl
+            used_margin -= margin
+        for s, (symbol, name, data) in enumerate(streams):
+            bar = index[s].get(t)
+            if bar is None or s in open_trades or bar < next_bar[s] or data['signals'][bar] == 0:
+                continue
+            side = 'LONG' if data['signals'][bar] > 0 else 'SHORT'
+            entry, sl, tp = data['entry'][bar], data['stop_loss'][bar], data['take_profit'][bar]
+            quantity = portfolio._position_size(balance, entry, sl)
+            margin = entry * quantity / portfolio.leverage
+            if not quantity > 0 or margin > balance - used_margin:
+                continue
+            exit_bar, exit_price = len(data['close']) - 1, data['close'][-1]
+            for j in range(bar + 1, len(data['close'])):
+                if side == 'LONG' and data['low'][j] <= sl or side == 'SHORT' and data['high'][j] >= sl:
+                    exit_bar, exit_price = j, sl
+                    break
+                if side == 'LONG' and data['high'][j] >= tp or side == 'SHORT' and data['low'][j] <= tp:
+                    exit_bar, exit_price = j, tp
+                    break
+            pnl, _ = portfolio.engines[name].settle(side, entry, exit_price, quantity)
+            trades.append((symbol, data['times'][bar], pnl))
+            open_trades[s] = (data['times'][exit_bar].tolist(), pnl, margin)
+            used_margin += margin
+            next_bar[s] = exit_bar + 1
+    # Trades entered on a stream's last candle close on that same candle
+    balance += sum(pnl for _, pnl, _ in open_trades.values())
+    return trades, balance
+
+def benchmark_portfolio():
+    symbols = Config.SYMBOLS
+    periods = 90 * 288  # 90 days of 5m candles
+    frames = {}
+    for i, symbol in enumerate(symbols):
+        # Every third symbol lists later, so candle grids differ in length
+        late = 0 if i % 3 else 2000 + 100 * i
+        frames[symbol] = make_candles(periods - late, pd.Timestamp('2024-01-01') + pd.Timedelta(minutes=5 * late), i)
+
+    print(f"Portfolio backtest: {len(frames)} symbols x up to {periods:,} 5m candles (LiquidityGrab)...")
+    portfolio = PortfolioBacktest(None, Config, strategies=['LiquidityGrab'])
+
+    t0 = time.perf_counter()
+    streams = portfolio.prepare(frames)
+    prepare_time = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    result = portfolio.simulate(streams)
+    merge_time = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    expected, expected_balance = reference_portfolio(portfolio, streams)
+    loop_time = time.perf_counter() - t0
+
+    print(f"\n  signal precompute ({portfolio.max_workers} workers): {prepare_time:7.2f} s")
+    print(f"  heap merge + trade loop         : {merge_time:7.2f} s")
+    print(f"  per-candle reference loop       : {loop_time:7.2f} s")
+
+    trades = result['trades']
+    got = sorted(zip(trades['symbol'].tolist(), trades['entry_time'].tolist(), trades['pnl'].tolist()))
+    want = sorted((symbol, t.tolist(), pnl) for symbol, t, pnl in expected)
+    ok = (len(got) == len(want) and all(a[:2] == b[:2] and np.isclose(a[2], b[2]) for a, b in zip(got, want))
+          and np.isclose(result['final_balance'], expected_balance))
+    print(f"\n  {len(trades)} trades, final balance {result['final_balance']:.2f}, "
+          f"max open positions {result['max_open_positions']}, rejected (margin) {result['rejected_margin']}")
+    print(f"  {'PASS' if ok else 'FAIL'}: matches the per-candle reference")
+
+def benchmark_shared_indicators(symbols=3):
+    """All strategies per symbol: one shared indicator frame vs one per strategy."""
+    frames = {s: make_candles(90 * 288, '2024-01-01', i) for i, s in enumerate(Config.SYMBOLS[:symbols])}
+    portfolio = PortfolioBacktest(None, Config, strategies=list(STRATEGY_CLASSES), max_workers=1)
+    print(f"\nPrecompute, {len(frames)} symbols x {len(STRATEGY_CLASSES)} strategies (1 worker)...")
+
+    t0 = time.perf_counter()
+    streams = portfolio.prepare(frames)
+    shared_time = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    separate = [(s, name, portfolio.engines[name].signal_arrays(frames[s], s))
+                for s in frames for name in portfolio.strategies]
+    separate_time = time.perf_counter() - t0
+
+    ok = all(a[:2] == b[:2] and all(np.array_equal(a[2][k], b[2][k], equal_nan=k != 'times') for k in a[2])
+             for a, b in zip(streams, separate))
+    print(f"  shared indicator frame per symbol: {shared_time:7.2f} s")
+    print(f"  indicators per strategy          : {separate_time:7.2f} s")
+    print(f"  {'PASS' if ok else 'FAIL'}: identical signal arrays")
+
+if __name__ == "__main__":
+    benchmark_portfolio()
+    benchmark_shared_indicators()
@@ -40,6 +40,9 @@ class Config:
     TIMEFRAME = os.getenv("TIMEFRAME", "5m") # Increased to 5m to overcome fees
     LEVERAGE = int(os.getenv("LEVERAGE", "5"))
     
+    # LiquidityGrab: candles scanned for support/resistance levels
+    LEVEL_LOOKBACK = int(os.getenv("LEVEL_LOOKBACK", "50"))
+    
     # Risk Management
     RISK_PER_TRADE = float(os.getenv("RISK_PER_TRADE", "0.01")) # 1% (used if POSITION_SIZE_USDT is 0)
     POSITION_SIZE_USDT = float(os.getenv("POSITION_SIZE_USDT", "0")) # Fixed USDT amount per trade (0 = use percentage)
@@ -47,6 +50,16 @@ class Config:
     TAKE_PROFIT_RR = float(os.getenv("TAKE_PROFIT_RR", "1.5"))
     TRADING_FEE_RATE = float(os.getenv("TRADING_FEE_RATE", "0.0005")) # 0.05% per side (Maker/Taker avg)
     
+    # Backtesting: local on-disk kline history (filled from REST on demand)
+    KLINE_STORE_DIR = os.getenv("KLINE_STORE_DIR", "data/klines")
+    BACKTEST_WORKERS = int(os.getenv("BACKTEST_WORKERS", "2")) # Background backtest jobs run at once
+    
+    # WebSocket: threads running strategy analysis on candle close
+    CANDLE_CALLBACK_WORKERS = int(os.getenv("CANDLE_CALLBACK_WORKERS", "4"))
+    # Tick-level SL/TP checks for symbols with open trades: bookTicker,
+    # markPrice or aggTrade (empty = check on the main loop only)
+    TICK_EXIT_STREAM = os.getenv("TICK_EXIT_STREAM", "")
+    
     # Bot State
     DRY_RUN = os.getenv("DRY_RUN", "True").lower() in ("true", "1", "t")
     
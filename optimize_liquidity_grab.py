@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Grid / random search over LiquidityGrab parameters on Binance klines.
+
+  python optimize_liquidity_grab.py --interval 5m --days 5
+  python optimize_liquidity_grab.py --symbols BTCUSDT ETHUSDT --random 100 --metric return_pct
+  python optimize_liquidity_grab.py --days 120 --train-days 30 --test-days 7 --random 50
+"""
+import argparse
+
+from src.core.backtest_runner import BacktestRunner
+from src.core.optimizer import ParameterOptimizer, RESULT_METRICS
+from src.core.walk_forward import WalkForwardOptimizer
+from src.exchange.binance_client import BinanceClient
+from config.settings import Config
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Optimize LiquidityGrab parameters")
+    parser.add_argument('--symbols', nargs='+', default=None, help="Default: Config.SYMBOLS")
+    parser.add_argument('--interval', default=Config.TIMEFRAME)
+    parser.add_argument('--days', type=int, default=30)
+    parser.add_argument('--random', type=int, default=0, help="Sample N combinations instead of the full grid")
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--metric', default='total_pnl', choices=RESULT_METRICS)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--train-days', type=float, default=0, help="Walk-forward: training window (0 = single search)")
+    parser.add_argument('--test-days', type=float, default=7, help="Walk-forward: test window and step")
+    parser.add_argument('--anchored', action='store_true', help="Walk-forward: train from the start of the history")
+    parser.add_argument('--output', default='liquidity_grab_optimization.csv')
+    args = parser.parse_args()
+
+    exchange = BinanceClient(Config.BINANCE_API_KEY, Config.BINANCE_API_SECRET, testnet=Config.TESTNET)
+    symbols = args.symbols or Config.SYMBOLS
+    frames = BacktestRunner(exchange, Config).fetch_all(symbols, args.interval, args.days)
+    if not frames:
+        print("No candle data fetched.")
+        return
+
+    if args.train_days > 0:
+        optimizer = WalkForwardOptimizer(
+            Config, train_days=args.train_days, test_days=args.test_days, anchored=args.anchored,
+            max_workers=args.workers, metric=args.metric
+        )
+        if args.random > 0:
+            result = optimizer.random_search(frames, args.random, seed=args.seed, output_path=args.output)
+        else:
+            result = optimizer.grid_search(frames, output_path=args.output)
+        print(result['folds'].to_string(index=False))
+        print(f"\nOut-of-sample: {result['stats']}")
+        return
+
+    optimizer = ParameterOptimizer(Config, max_workers=args.workers, metric=args.metric)
+    if args.random > 0:
+        table = optimizer.random_search(frames, args.random, seed=args.seed, output_path=args.output)
+    else:
+        table = optimizer.grid_search(frames, output_path=args.output)
+
+    print(table.head(10).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,225 +1,566 @@
 """
-Backtest Engine for the Scalping Strategy
+Backtest Engine
 Simulates trades on historical data and saves results to database.
+
+Runs either the built-in EMA-crossover logic (strategy=None) or any live
+strategy class from src/strategy/ through its generate_signals().
 """
+import json
+import time
+import numpy as np
 import pandas as pd
-from datetime import datetime, timedelta
-from ..utils.indicators import calculate_indicators
-from ..database.models import db, Trade
+from sqlalchemy import insert
+from ..utils.indicator_registry import resolve_indicators
+from ..database.models import db, BacktestRun, BacktestTrade
+from ..exchange.kline_store import KlineStore, interval_ms
+from ..core.risk_manager import RiskManager
+from ..strategy.liquidity_grab_strategy import LiquidityGrabStrategy
+from ..strategy.range_sweep_strategy import RangeSweepStrategy
+from ..strategy.scalping_strategy import ScalpingStrategy
+from ..strategy.smart_scalping_strategy import SmartScalpingStrategy
+from ..strategy.trend_pullback_strategy import TrendPullbackStrategy
+
+# Candles skipped for indicator warm-up
+WARMUP_CANDLES = 205
+
+# Indicator columns read by the built-in signal logic
+BUILTIN_INDICATORS = ('ema_fast', 'ema_slow', 'ema_trend', 'vwap', 'rsi', 'vol_ma', 'atr')
+
+# Strategies selectable by name (same names the bot records on live trades)
+STRATEGY_CLASSES = {
+    'LiquidityGrab': LiquidityGrabStrategy,
+    'RangeSweep': RangeSweepStrategy,
+    'Scalping': ScalpingStrategy,
+    'SmartScalping': SmartScalpingStrategy,
+    'TrendPullback': TrendPullbackStrategy,
+}
+
+# Simulated trades are returned as a structured array with these fields
+TRADE_DTYPE = np.dtype([
+    ('symbol', 'U20'),
+    ('side', 'U10'),
+    ('entry_price', 'f8'),
+    ('exit_price', 'f8'),
+    ('stop_loss', 'f8'),
+    ('take_profit', 'f8'),
+    ('quantity', 'f8'),
+    ('pnl', 'f8'),
+    ('fee', 'f8'),
+    ('entry_time', 'M8[ns]'),
+    ('exit_time', 'M8[ns]'),
+    ('exit_reason', 'U20'),
+    ('strategy', 'U50'),
+])
+
+
+def create_strategy(name, config, risk_manager=None):
+    """Instantiate a strategy by name, configured as the bot would."""
+    if name not in STRATEGY_CLASSES:
+        raise ValueError(f"Unknown strategy: {name}. Available: {', '.join(STRATEGY_CLASSES)}")
+    if risk_manager is None:
+        risk_manager = RiskManager(config, None)
+    if name == 'LiquidityGrab':
+        return LiquidityGrabStrategy(risk_manager, level_lookback=getattr(config, 'LEVEL_LOOKBACK', 50))
+    return STRATEGY_CLASSES[name](risk_manager)
+
+
+def strategy_name(strategy):
+    """Name a strategy is recorded under (e.g. 'LiquidityGrab')."""
+    name = getattr(strategy, 'name', None)
+    if name:
+        return name
+    name = type(strategy).__name__
+    return name[:-len('Strategy')] if name.endswith('Strategy') else name
+
+
+def max_drawdown_pct(trades, initial_balance):
+    """Largest peak-to-trough drop of the equity curve, ordered by exit time."""
+    if len(trades) == 0:
+        return 0.0
+    pnl = trades['pnl'][np.argsort(trades['exit_time'], kind='stable')]
+    equity = initial_balance + np.concatenate([[0.0], np.cumsum(pnl)])
+    peak = np.maximum.accumulate(equity)
+    return float(((peak - equity) / peak).max() * 100)
+
+
+def summarize(trades, initial_balance, final_balance):
+    """Summary stats for one trade array."""
+    winning = int((trades['pnl'] > 0).sum())
+    total = len(trades)
+    return {
+        'total_trades': total,
+        'winning_trades': winning,
+        'losing_trades': total - winning,
+        'win_rate': (winning / total * 100) if total > 0 else 0.0,
+        'total_pnl': float(trades['pnl'].sum()),
+        'total_fees': float(trades['fee'].sum()),
+        'initial_balance': initial_balance,
+        'final_balance': final_balance,
+        'return_pct': (final_balance - initial_balance) / initial_balance * 100 if initial_balance > 0 else 0.0,
+        'max_drawdown_pct': max_drawdown_pct(trades, initial_balance),
+    }
+
+
+def candle_times(df):
+    """Candle open times as datetime64[ns] (NaT if the frame has none)."""
+    if isinstance(df.index, pd.DatetimeIndex):
+        return df.index.to_numpy(dtype='datetime64[ns]')
+    if 'timestamp' in df.columns:
+        return pd.to_datetime(df['timestamp']).to_numpy(dtype='datetime64[ns]')
+    return np.full(len(df), np.datetime64('NaT'), dtype='datetime64[ns]')
+
+
+def _first_touch(side, low, high, start, stop_loss, take_profit, block=256, resolve=None):
+    """
+    First bar at or after `start` where SL or TP is touched, searched in
+    growing vectorized blocks. SL wins when both are inside the same bar,
+    unless resolve(bar) says the take profit was reached first.
+    
+    Returns (bar, exit_reason, exit_price) or (None, None, None).
+    """
+    n = len(low)
+    pos = start
+    while pos < n:
+        end = min(n, pos + block)
+        if side == 'LONG':
+            sl_hit = low[pos:end] <= stop_loss
+            tp_hit = high[pos:end] >= take_profit
+        else:
+            sl_hit = high[pos:end] >= stop_loss
+            tp_hit = low[pos:end] <= take_profit
+        hit = sl_hit | tp_hit
+        if hit.any():
+            offset = int(np.argmax(hit))
+            if sl_hit[offset] and tp_hit[offset] and resolve is not None:
+                if resolve(pos + offset) == 'TP Hit':
+                    return pos + offset, 'TP Hit', take_profit
+                return pos + offset, 'SL Hit', stop_loss
+            if sl_hit[offset]:
+                return pos + offset, 'SL Hit', stop_loss
+            return pos + offset, 'TP Hit', take_profit
+        pos = end
+        block *= 2
+    return None, None, None
+
+class IntrabarResolver:
+    """
+    Decides which of SL/TP was touched first inside a bar that contains
+    both, by replaying that bar's lower-timeframe candles from the kline
+    store. Sub-bar history is backfilled lazily, one REST page around an
+    ambiguous bar at a time, so only ambiguous bars ever cost anything.
+    """
+    
+    def __init__(self, store, symbol, bar_ms, sub_interval='1m'):
+        self.store = store
+        self.symbol = symbol
+        self.bar_ms = bar_ms
+        self.sub_interval = sub_interval
+        self.sub_ms = interval_ms(sub_interval)
+        self.chunk_ms = store.page_limit * self.sub_ms
+        self.loaded_chunks = set()
+        self.data = None
+        self.ambiguous = 0
+        self.take_profit_first = 0
+    
+    def _sub_bars(self, bar_start):
+        bar_end = bar_start + self.bar_ms - self.sub_ms
+        for chunk in range(bar_start // self.chunk_ms, bar_end // self.chunk_ms + 1):
+            if chunk not in self.loaded_chunks:
+                self.loaded_chunks.add(chunk)
+                chunk_start = chunk * self.chunk_ms
+                if self.store.backfill(self.symbol, self.sub_interval, chunk_start,
+                                       chunk_start + self.chunk_ms - self.sub_ms) or self.data is None:
+                    self.data = self.store.arrays(self.symbol, self.sub_interval)
+        open_time = self.data['open_time']
+        lo = np.searchsorted(open_time, bar_start, side='left')
+        hi = np.searchsorted(open_time, bar_end, side='right')
+        return self.data['low'][lo:hi], self.data['high'][lo:hi]
+    
+    def resolve(self, bar_time, side, stop_loss, take_profit):
+        """
+        'TP Hit' or 'SL Hit' for a bar (datetime64 open time) touching both
+        levels. Stays 'SL Hit' when sub-bars are missing or still ambiguous.
+        """
+        self.ambiguous += 1
+        if np.isnat(bar_time):
+            return 'SL Hit'
+        low, high = self._sub_bars(int(bar_time.astype('datetime64[ms]').astype(np.int64)))
+        _, reason, _ = _first_touch(side, low, high, 0, stop_loss, take_profit)
+        if reason == 'TP Hit':
+            self.take_profit_first += 1
+            return reason
+        return 'SL Hit'
 
 class BacktestEngine:
-    def __init__(self, exchange_client, config):
+    def __init__(self, exchange_client, config, strategy=None, store=None, intrabar_interval=None):
+        """
+        Args:
+            exchange_client: BinanceClient used to fetch klines
+            config: Config
+            strategy: Strategy instance (or name from STRATEGY_CLASSES) to
+                backtest; None runs the built-in EMA-crossover logic.
+            store: KlineStore for historical data (default: one at
+                config.KLINE_STORE_DIR backed by exchange_client)
+            intrabar_interval: Lower timeframe (e.g. '1m') used to decide
+                bars where both SL and TP are touched; None = SL first.
+        """
         self.exchange = exchange_client
         self.config = config
         self.sl_multiplier = config.STOP_LOSS_ATR_MULTIPLIER
         self.tp_rr = config.TAKE_PROFIT_RR
         self.risk_per_trade = config.RISK_PER_TRADE
+        self.fee_rate = getattr(config, 'TRADING_FEE_RATE', 0.0)
         self.initial_balance = 10000  # Simulated starting balance
+        if store is None:
+            store = KlineStore(getattr(config, 'KLINE_STORE_DIR', 'data/klines'), exchange_client)
+        self.store = store
+        self.intrabar_interval = intrabar_interval
+        self.last_resolver = None
         
-    def fetch_historical_data(self, symbol, interval, days=30):
-        """Fetch historical klines for backtesting."""
-        # Calculate limit based on days and interval
-        interval_minutes = {
-            '1m': 1, '3m': 3, '5m': 5, '15m': 15, '30m': 30,
-            '1h': 60, '2h': 120, '4h': 240, '1d': 1440
-        }
-        minutes_per_day = 1440
-        candles_per_day = minutes_per_day // interval_minutes.get(interval, 1)
-        limit = min(candles_per_day * days, 1500)  # Binance max is 1500
+        if isinstance(strategy, str):
+            strategy = create_strategy(strategy, config)
+        self.strategy = strategy
+        self.risk_manager = RiskManager(config, None) if strategy is not None else None
+        self.strategy_name = strategy_name(strategy) if strategy is not None else 'Scalping'
+        self.strategy_label = f"Backtest-{self.strategy_name}"
         
-        df = self.exchange.get_historical_klines(symbol, interval, limit=limit)
-        return df
+    def fetch_historical_data(self, symbol, interval, days=30):
+        """
+        Historical klines for the last `days` days from the local kline
+        store; only candles not already on disk are fetched (paginated).
+        """
+        end = int(time.time() * 1000)
+        start = end - int(days * 86_400_000)
+        return self.fetch_range(symbol, interval, start, end)
+    
+    def fetch_range(self, symbol, interval, start, end, progress=None, should_stop=None):
+        """Klines with open time in [start, end] (ms) from the local kline store."""
+        return self.store.get_frame(symbol, interval, start, end,
+                                    progress=progress, should_stop=should_stop)
     
     def run_backtest(self, symbol, interval='1m', days=30):
         """
         Run backtest on historical data.
-        Returns list of simulated trades.
+        Returns (trades, final_balance); trades is a TRADE_DTYPE structured array.
         """
-        print(f"Starting backtest for {symbol} on {interval} for {days} days...")
+        print(f"Starting {self.strategy_label} backtest for {symbol} on {interval} for {days} days...")
         
         # Fetch data
         df = self.fetch_historical_data(symbol, interval, days)
         if df.empty or len(df) < 205:
             print(f"Not enough data for backtest. Got {len(df)} candles.")
-            return []
+            return np.zeros(0, dtype=TRADE_DTYPE), self.initial_balance
         
-        # Calculate indicators for full dataset
-        df = calculate_indicators(df)
+        trades, balance = self.simulate(df, symbol)
+        print(f"Backtest complete. {len(trades)} trades executed.")
+        return trades, balance
+    
+    def simulate(self, df, symbol):
+        """
+        Simulate the strategy over a candle frame.
+        
+        Works on contiguous NumPy column arrays: signals are computed for all
+        candles at once, and for each open position the exit bar is found
+        with a vectorized first-touch search against SL/TP, so Python-level
+        work is per trade rather than per candle.
+        
+        Fees follow TradingBot.manage_open_trades_for_symbol:
+        (entry value + exit value) * TRADING_FEE_RATE, deducted from PnL.
+        """
+        data = self.signal_arrays(df, symbol)
+        return self.simulate_signals(
+            symbol, **data, resolver=self._intrabar_resolver(symbol, data['times'])
+        )
+    
+    def signal_arrays(self, df, symbol):
+        """
+        Per-candle arrays simulate_signals() runs on: signals, entry,
+        stop_loss, take_profit, high, low, close and times.
+        """
+        if self.strategy is None:
+            signals, entry, stop_loss, take_profit, df = self._builtin_signals(df)
+        else:
+            signals, entry, stop_loss, take_profit, df = self._strategy_signals(df, symbol)
+        
+        return {
+            'signals': signals,
+            'entry': entry,
+            'stop_loss': stop_loss,
+            'take_profit': take_profit,
+            'high': df['high'].to_numpy(dtype=float),
+            'low': df['low'].to_numpy(dtype=float),
+            'close': df['close'].to_numpy(dtype=float),
+            'times': candle_times(df),
+        }
+    
+    def _intrabar_resolver(self, symbol, times):
+        """IntrabarResolver for this run, or None if the mode is off or useless."""
+        self.last_resolver = None
+        if self.intrabar_interval is None or len(times) < 2 or np.isnat(times).any():
+            return None
+        bar_ms = int(np.median(np.diff(times)).astype('timedelta64[ms]').astype(np.int64))
+        if bar_ms <= interval_ms(self.intrabar_interval):
+            return None
+        self.last_resolver = IntrabarResolver(self.store, symbol, bar_ms, self.intrabar_interval)
+        return self.last_resolver
+    
+    def simulate_signals(self, symbol, signals, entry, stop_loss, take_profit,
+                         high, low, close, times, resolver=None, start=WARMUP_CANDLES, balance=None):
+        """
+        Trade loop over precomputed per-candle arrays: signals (1 / -1 / 0),
+        entry/SL/TP per candle, candle high/low/close and times. Signals
+        before bar `start` (default: the first WARMUP_CANDLES) are ignored;
+        pass start=0 for slices of arrays that are already warmed up. The
+        loop starts from `balance` (default: initial_balance). With an
+        IntrabarResolver, bars touching both SL and TP are decided from
+        sub-bar candles.
+        """
+        signal_bars = np.flatnonzero(signals)
         
         trades = []
-        balance = self.initial_balance
-        position = None  # Current open position
-        
-        # Iterate through candles (start after indicator warmup)
-        for i in range(205, len(df)):
-            current_candle = df.iloc[i]
-            prev_candle = df.iloc[i-1]
-            current_price = current_candle['close']
-            current_time = current_candle.name if isinstance(df.index, pd.DatetimeIndex) else df.iloc[i].get('timestamp', datetime.now())
-            
-            # Check if we have open position - manage exits first
-            if position:
-                should_close = False
-                exit_reason = ""
-                
-                if position['side'] == 'LONG':
-                    if current_candle['low'] <= position['stop_loss']:
-                        should_close = True
-                        exit_reason = "SL Hit"
-                        exit_price = position['stop_loss']
-                    elif current_candle['high'] >= position['take_profit']:
-                        should_close = True
-                        exit_reason = "TP Hit"
-                        exit_price = position['take_profit']
-                else:  # SHORT
-                    if current_candle['high'] >= position['stop_loss']:
-                        should_close = True
-                        exit_reason = "SL Hit"
-                        exit_price = position['stop_loss']
-                    elif current_candle['low'] <= position['take_profit']:
-                        should_close = True
-                        exit_reason = "TP Hit"
-                        exit_price = position['take_profit']
-                
-                if should_close:
-                    # Calculate PnL
-                    if position['side'] == 'LONG':
-                        pnl = (exit_price - position['entry_price']) * position['quantity']
-                    else:
-                        pnl = (position['entry_price'] - exit_price) * position['quantity']
-                    
-                    balance += pnl
-                    
-                    # Record trade
-                    trade = {
-                        'symbol': symbol,
-                        'side': position['side'],
-                        'entry_price': position['entry_price'],
-                        'exit_price': exit_price,
-                        'stop_loss': position['stop_loss'],
-                        'take_profit': position['take_profit'],
-                        'quantity': position['quantity'],
-                        'pnl': pnl,
-                        'entry_time': position['entry_time'],
-                        'exit_time': current_time,
-                        'exit_reason': exit_reason,
-                        'strategy': 'Backtest-Scalping'
-                    }
-                    trades.append(trade)
-                    position = None
-                    continue
-            
-            # Check for new entry signals (only if no position)
-            if position is None:
-                signal = self._check_signal(current_candle, prev_candle)
-                
-                if signal != 'NONE':
-                    entry_price = current_price
-                    atr = current_candle['atr']
-                    sl_dist = atr * self.sl_multiplier
-                    
-                    if signal == 'LONG':
-                        stop_loss = entry_price - sl_dist
-                        take_profit = entry_price + (sl_dist * self.tp_rr)
-                    else:
-                        stop_loss = entry_price + sl_dist
-                        take_profit = entry_price - (sl_dist * self.tp_rr)
-                    
-                    # Calculate position size
-                    risk_amount = balance * self.risk_per_trade
-                    price_diff = abs(entry_price - stop_loss)
-                    quantity = risk_amount / price_diff if price_diff > 0 else 0
-                    
-                    if quantity > 0:
-                        position = {
-                            'side': signal,
-                            'entry_price': entry_price,
-                            'stop_loss': stop_loss,
-                            'take_profit': take_profit,
-                            'quantity': quantity,
-                            'entry_time': current_time
-                        }
-        
-        # Close any remaining open position at last price
-        if position:
-            last_price = df.iloc[-1]['close']
-            last_time = df.iloc[-1].name if isinstance(df.index, pd.DatetimeIndex) else datetime.now()
+        if balance is None:
+            balance = self.initial_balance
+        n = len(close)
+        i = start
+        
+        while i < n:
+            # Next entry signal at or after bar i
+            k = np.searchsorted(signal_bars, i)
+            if k == len(signal_bars):
+                break
+            entry_bar = signal_bars[k]
+            side = 'LONG' if signals[entry_bar] > 0 else 'SHORT'
+            entry_price = entry[entry_bar]
+            sl = stop_loss[entry_bar]
+            tp = take_profit[entry_bar]
             
-            if position['side'] == 'LONG':
-                pnl = (last_price - position['entry_price']) * position['quantity']
-            else:
-                pnl = (position['entry_price'] - last_price) * position['quantity']
+            quantity = self._position_size(balance, entry_price, sl)
+            if not quantity > 0:
+                i = entry_bar + 1
+                continue
             
+            exit_bar, exit_reason, exit_price = self.find_exit(
+                side, entry_bar, sl, tp, high, low, close, times, resolver
+            )
+            pnl, fee = self.settle(side, entry_price, exit_price, quantity)
             balance += pnl
-            trades.append({
-                'symbol': symbol,
-                'side': position['side'],
-                'entry_price': position['entry_price'],
-                'exit_price': last_price,
-                'stop_loss': position['stop_loss'],
-                'take_profit': position['take_profit'],
-                'quantity': position['quantity'],
-                'pnl': pnl,
-                'entry_time': position['entry_time'],
-                'exit_time': last_time,
-                'exit_reason': 'End of Backtest',
-                'strategy': 'Backtest-Scalping'
-            })
+            
+            trades.append((
+                symbol, side, entry_price, exit_price, sl, tp,
+                quantity, pnl, fee, times[entry_bar], times[exit_bar], exit_reason,
+                self.strategy_label
+            ))
+            # No new entry on the exit bar
+            i = exit_bar + 1
         
-        print(f"Backtest complete. {len(trades)} trades executed.")
-        return trades, balance
+        return np.array(trades, dtype=TRADE_DTYPE), balance
+    
+    def find_exit(self, side, entry_bar, stop_loss, take_profit, high, low, close, times, resolver=None):
+        """
+        (exit_bar, exit_reason, exit_price) of a trade entered on entry_bar's
+        close; a trade still open at the end closes at the last price.
+        """
+        resolve = None
+        if resolver is not None:
+            resolve = lambda bar: resolver.resolve(times[bar], side, stop_loss, take_profit)
+        exit_bar, exit_reason, exit_price = _first_touch(
+            side, low, high, entry_bar + 1, stop_loss, take_profit, resolve=resolve
+        )
+        if exit_bar is None:
+            # Close any remaining open position at last price
+            return len(close) - 1, 'End of Backtest', close[-1]
+        return exit_bar, exit_reason, exit_price
     
-    def _check_signal(self, current, prev):
-        """Check for entry signals based on strategy."""
+    def settle(self, side, entry_price, exit_price, quantity):
+        """(pnl, fee) of a closed trade; pnl is net of the fee."""
+        if side == 'LONG':
+            gross_pnl = (exit_price - entry_price) * quantity
+        else:
+            gross_pnl = (entry_price - exit_price) * quantity
+        fee = (entry_price * quantity + exit_price * quantity) * self.fee_rate
+        return gross_pnl - fee, fee
+    
+    def _position_size(self, balance, entry_price, stop_loss):
+        """Built-in logic sizes by risk %; strategies are sized exactly like live trades."""
+        if self.strategy is None:
+            risk_amount = balance * self.risk_per_trade
+            price_diff = abs(entry_price - stop_loss)
+            return risk_amount / price_diff if price_diff > 0 else 0
+        quantity = self.risk_manager.calculate_position_size(balance, entry_price, stop_loss)
+        return self.risk_manager.round_position_size(quantity, entry_price)
+    
+    def _builtin_signals(self, df):
+        """Signal direction and entry/SL/TP arrays for the built-in logic."""
+        df = resolve_indicators(df, BUILTIN_INDICATORS)
+        close = df['close'].to_numpy(dtype=float)
+        sl_dist = df['atr'].to_numpy(dtype=float) * self.sl_multiplier
+        signals = self._signal_array(df)
+        long_side = signals > 0
+        stop_loss = np.where(long_side, close - sl_dist, close + sl_dist)
+        take_profit = np.where(long_side, close + sl_dist * self.tp_rr, close - sl_dist * self.tp_rr)
+        return signals, close, stop_loss, take_profit, df
+    
+    def _strategy_signals(self, df, symbol):
+        """
+        Walk-forward signals from the strategy class. generate_signals() is
+        causal (row i equals analyze() on the frame truncated at row i), so
+        one pass over the history replaces re-running analyze() per candle.
+        """
+        if isinstance(self.strategy, ScalpingStrategy):
+            frame = self.strategy.generate_signals(df, symbol=symbol)
+        else:
+            frame = self.strategy.generate_signals(df)
+        
+        signal = frame['signal'].to_numpy()
+        signals = np.zeros(len(frame), dtype=np.int8)
+        signals[signal == 'LONG'] = 1
+        signals[signal == 'SHORT'] = -1
+        
+        candles = df.set_index('timestamp') if 'timestamp' in df.columns else df
+        return (
+            signals,
+            frame['entry_price'].to_numpy(dtype=float),
+            frame['stop_loss'].to_numpy(dtype=float),
+            frame['take_profit'].to_numpy(dtype=float),
+            candles,
+        )
+    
+    def _signal_array(self, df):
+        """Entry signals for every candle: 1 = LONG, -1 = SHORT, 0 = none."""
+        close = df['close'].to_numpy(dtype=float)
+        ema_fast = df['ema_fast'].to_numpy(dtype=float)
+        ema_slow = df['ema_slow'].to_numpy(dtype=float)
+        ema_trend = df['ema_trend'].to_numpy(dtype=float)
+        vwap = df['vwap'].to_numpy(dtype=float)
+        rsi = df['rsi'].to_numpy(dtype=float)
+        volume = df['volume'].to_numpy(dtype=float)
+        vol_ma = df['vol_ma'].to_numpy(dtype=float)
+        
+        prev_close = np.roll(close, 1)
+        prev_fast = np.roll(ema_fast, 1)
+        prev_slow = np.roll(ema_slow, 1)
+        
         # LONG Condition
-        if (
-            current['close'] > current['ema_trend'] and
-            current['close'] > current['vwap'] and
-            current['ema_fast'] > current['ema_slow'] and
-            current['rsi'] > 50 and
-            current['volume'] > current['vol_ma']
-        ):
-            cross_up = (prev['ema_fast'] <= prev['ema_slow']) and (current['ema_fast'] > current['ema_slow'])
-            price_cross_up = (prev['close'] <= prev['ema_fast']) and (current['close'] > current['ema_fast'])
-            if cross_up or price_cross_up:
-                return 'LONG'
-        
-        # SHORT Condition
-        elif (
-            current['close'] < current['ema_trend'] and
-            current['close'] < current['vwap'] and
-            current['ema_fast'] < current['ema_slow'] and
-            current['rsi'] < 50 and
-            current['volume'] > current['vol_ma']
-        ):
-            cross_down = (prev['ema_fast'] >= prev['ema_slow']) and (current['ema_fast'] < current['ema_slow'])
-            price_cross_down = (prev['close'] >= prev['ema_fast']) and (current['close'] < current['ema_fast'])
-            if cross_down or price_cross_down:
-                return 'SHORT'
-        
-        return 'NONE'
-    
-    def save_to_database(self, trades):
-        """Save backtest trades to database."""
-        saved_count = 0
-        for t in trades:
-            trade = Trade(
-                symbol=t['symbol'],
-                side=t['side'],
-                entry_price=t['entry_price'],
-                exit_price=t['exit_price'],
-                stop_loss=t['stop_loss'],
-                take_profit=t['take_profit'],
-                quantity=t['quantity'],
-                pnl=t['pnl'],
-                status='CLOSED',
-                entry_time=t['entry_time'] if isinstance(t['entry_time'], datetime) else datetime.now(),
-                exit_time=t['exit_time'] if isinstance(t['exit_time'], datetime) else datetime.now(),
-                strategy=t['strategy']
-            )
-            db.session.add(trade)
-            saved_count += 1
+        long_base = (
+            (close > ema_trend) & (close > vwap) & (ema_fast > ema_slow) &
+            (rsi > 50) & (volume > vol_ma)
+        )
+        cross_up = (prev_fast <= prev_slow) & (ema_fast > ema_slow)
+        price_cross_up = (prev_close <= prev_fast) & (close > ema_fast)
+        
+        # SHORT Condition (only evaluated when the LONG base fails)
+        short_base = (
+            (close < ema_trend) & (close < vwap) & (ema_fast < ema_slow) &
+            (rsi < 50) & (volume > vol_ma)
+        )
+        cross_down = (prev_fast >= prev_slow) & (ema_fast < ema_slow)
+        price_cross_down = (prev_close >= prev_fast) & (close < ema_fast)
+        
+        signals = np.zeros(len(close), dtype=np.int8)
+        signals[long_base & (cross_up | price_cross_up)] = 1
+        signals[~long_base & short_base & (cross_down | price_cross_down)] = -1
+        signals[0] = 0
+        return signals
+    
+    def save_to_database(self, trades, final_balance, symbol, interval,
+                         start_time=None, end_time=None, cache_key=None, params=None,
+                         monte_carlo=None):
+        """
+        Save a backtest run: one backtest_runs row with the summary computed
+        here, and all trades in a single executemany insert into
+        backtest_trades (see _insert_trades). Nothing is written to the live
+        trades table. `monte_carlo` is an optional monte_carlo() summary
+        stored with the run.
         
-        db.session.commit()
-        print(f"Saved {saved_count} trades to database.")
-        return saved_count
+        Returns:
+            The BacktestRun (committed).
+        """
+        stats = summarize(trades, self.initial_balance, final_balance)
+        if start_time is None:
+            start_time = trades['entry_time'].min() if len(trades) else np.datetime64('now')
+        if end_time is None:
+            end_time = trades['exit_time'].max() if len(trades) else np.datetime64('now')
+        
+        run = BacktestRun(
+            cache_key=cache_key,
+            strategy=self.strategy_name,
+            params=json.dumps(params) if params is not None else None,
+            symbol=symbol,
+            interval=interval,
+            start_time=pd.Timestamp(start_time).to_pydatetime(),
+            end_time=pd.Timestamp(end_time).to_pydatetime(),
+            initial_balance=stats['initial_balance'],
+            final_balance=stats['final_balance'],
+            total_trades=stats['total_trades'],
+            winning_trades=stats['winning_trades'],
+            losing_trades=stats['losing_trades'],
+            win_rate=stats['win_rate'],
+            total_pnl=stats['total_pnl'],
+            total_fees=stats['total_fees'],
+            return_pct=stats['return_pct'],
+            max_drawdown_pct=stats['max_drawdown_pct'],
+            monte_carlo=json.dumps(monte_carlo) if monte_carlo is not None else None
+        )
+        try:
+            db.session.add(run)
+            db.session.flush()
+            if len(trades):
+                _insert_trades(run.id, trades)
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+        
+        print(f"Saved backtest run {run.id} with {len(trades)} trades.")
+        return run
+
+
+def _sqlite_times(times):
+    """
+    Timestamps as SQLite DateTime text ('YYYY-MM-DD HH:MM:SS.ffffff', the
+    format SQLAlchemy stores and parses), formatted column-wise.
+    """
+    times = times.astype('datetime64[us]')
+    text = np.char.replace(np.datetime_as_string(times, unit='us'), 'T', ' ').tolist()
+    for i in np.flatnonzero(np.isnat(times)):
+        text[i] = None
+    return text
+
+
+def _insert_trades(run_id, trades):
+    """
+    Insert trades into backtest_trades with one executemany, building the
+    parameters column-wise instead of one ORM object per trade.
+
+    On SQLite the rows go straight to the driver with pre-formatted
+    datetimes (SQLAlchemy's per-row type processing dominates otherwise);
+    other dialects use the portable Core insert.
+    """
+    connection = db.session.connection()
+    sqlite = connection.dialect.name == 'sqlite'
+    times = _sqlite_times if sqlite else lambda t: t.astype('datetime64[us]').tolist()  # NaT -> None
+    columns = {
+        'run_id': [run_id] * len(trades),
+        'symbol': trades['symbol'].tolist(),
+        'side': trades['side'].tolist(),
+        'entry_price': trades['entry_price'].tolist(),
+        'exit_price': trades['exit_price'].tolist(),
+        'stop_loss': trades['stop_loss'].tolist(),
+        'take_profit': trades['take_profit'].tolist(),
+        'quantity': trades['quantity'].tolist(),
+        'pnl': trades['pnl'].tolist(),
+        'fee': trades['fee'].tolist(),
+        'entry_time': times(trades['entry_time']),
+        'exit_time': times(trades['exit_time']),
+        'exit_reason': trades['exit_reason'].tolist(),
+    }
+    
+    if sqlite:
+        sql = (f"INSERT INTO {BacktestTrade.__tablename__} ({', '.join(columns)}) "
+               f"VALUES ({', '.join('?' * len(columns))})")
+        connection.exec_driver_sql(sql, list(zip(*columns.values())))
+        return
+    
+    names = list(columns)
+    rows = [dict(zip(names, values)) for values in zip(*columns.values())]
+    connection.execute(insert(BacktestTrade.__table__), rows)
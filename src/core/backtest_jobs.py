@@ -0,0 +1,432 @@
+"""
+Backtest Job Queue
+==================
+Runs /api/backtest and /api/backtest/multi requests in background threads
+so no Flask worker is blocked by the download + simulation.
+
+Every request is normalized to (strategy, params, symbol, interval, date
+range, intrabar mode, Monte Carlo settings) plus the risk/fee settings
+that affect results, and hashed into a cache key. A finished run is saved under that key by
+BacktestEngine.save_to_database, so an identical request is answered from
+the database without running again. Runs over a partial download (a
+failed page) are saved without a key, so the next request runs again.
+
+Multi-symbol jobs (BacktestRunner) are not cached; they save one run per
+symbol, each with its own Monte Carlo summary, since every symbol is
+simulated as an independent account.
+"""
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+import hashlib
+import json
+import threading
+import time
+import uuid
+import pandas as pd
+
+from .backtest import BacktestEngine, STRATEGY_CLASSES, WARMUP_CANDLES, create_strategy
+from .backtest_runner import BacktestRunner
+from .monte_carlo import MAX_PATHS, METHODS, MONTE_CARLO_PATHS, monte_carlo
+from ..database.models import db, BacktestRun
+from ..exchange.kline_store import interval_ms
+
+# Config values that change simulated results (part of the cache key)
+RESULT_SETTINGS = [
+    'RISK_PER_TRADE', 'POSITION_SIZE_USDT', 'LEVERAGE', 'STOP_LOSS_ATR_MULTIPLIER',
+    'TAKE_PROFIT_RR', 'TRADING_FEE_RATE', 'LEVEL_LOOKBACK'
+]
+
+# Share of the progress bar spent downloading candles
+DOWNLOAD_PROGRESS = 0.8
+
+
+class BacktestCancelled(Exception):
+    pass
+
+
+def _to_ms(value):
+    """Epoch ms from an int (ms) or anything pd.Timestamp accepts (UTC)."""
+    if isinstance(value, (int, float)):
+        return int(value)
+    return int(pd.Timestamp(value).value // 1_000_000)
+
+
+def normalize_request(data, config):
+    """
+    Validated backtest request. Without explicit start/end the range is the
+    last `days` days ending at the last closed candle, so repeated requests
+    within one candle map to the same cache key. An explicit end is clamped
+    to the last closed candle for the same reason.
+    """
+    symbol = str(data.get('symbol', config.SYMBOL)).upper()
+    interval = data.get('interval', config.TIMEFRAME)
+    step = interval_ms(interval)
+
+    strategy = data.get('strategy')
+    if strategy is not None and strategy not in STRATEGY_CLASSES:
+        raise ValueError(f"Unknown strategy '{strategy}'. Available: {', '.join(STRATEGY_CLASSES)}")
+
+    params = data.get('params') or {}
+    if not isinstance(params, dict):
+        raise ValueError("params must be an object")
+    if params:
+        if strategy is None:
+            raise ValueError("params require a strategy")
+        defaults = create_strategy(strategy, config)
+        for name in params:
+            if not name.isupper() or not hasattr(defaults, name):
+                raise ValueError(f"Unknown {strategy} parameter: {name}")
+
+    intrabar_interval = data.get('intrabar_interval')
+    if intrabar_interval is not None:
+        interval_ms(intrabar_interval)
+
+    try:
+        monte_carlo_paths = int(data.get('monte_carlo_paths', MONTE_CARLO_PATHS))
+    except (TypeError, ValueError):
+        raise ValueError("monte_carlo_paths must be an integer")
+    if not 0 <= monte_carlo_paths <= MAX_PATHS:
+        raise ValueError(f"monte_carlo_paths must be between 0 and {MAX_PATHS}")
+    monte_carlo_method = data.get('monte_carlo_method', 'bootstrap')
+    if monte_carlo_method not in METHODS:
+        raise ValueError(f"monte_carlo_method must be one of: {', '.join(METHODS)}")
+
+    last_closed = int(time.time() * 1000) // step * step - step
+    if data.get('start') is not None and data.get('end') is not None:
+        start = _to_ms(data['start']) // step * step
+        end = min(_to_ms(data['end']) // step * step, last_closed)
+    else:
+        days = float(data.get('days', 30))
+        end = last_closed
+        start = end - int(days * 86_400_000) + step
+    if end < start:
+        raise ValueError("end must be after start")
+
+    return {
+        'strategy': strategy,
+        'params': params,
+        'symbol': symbol,
+        'interval': interval,
+        'start': start,
+        'end': end,
+        'intrabar_interval': intrabar_interval,
+        'monte_carlo_paths': monte_carlo_paths,
+        'monte_carlo_method': monte_carlo_method,
+    }
+
+
+def normalize_multi_request(data, config):
+    """Validated multi-symbol request (symbols default to Config.SYMBOLS)."""
+    symbols = data.get('symbols') or getattr(config, 'SYMBOLS', [config.SYMBOL])
+    if isinstance(symbols, str) or not all(isinstance(symbol, str) for symbol in symbols):
+        raise ValueError("symbols must be a list of symbol names")
+    symbols = list(dict.fromkeys(symbol.upper() for symbol in symbols))
+
+    interval = data.get('interval', config.TIMEFRAME)
+    interval_ms(interval)
+
+    strategy = data.get('strategy')
+    if strategy is not None and strategy not in STRATEGY_CLASSES:
+        raise ValueError(f"Unknown strategy '{strategy}'. Available: {', '.join(STRATEGY_CLASSES)}")
+
+    try:
+        days = float(data.get('days', 30))
+    except (TypeError, ValueError):
+        raise ValueError("days must be a number")
+    if days <= 0:
+        raise ValueError("days must be positive")
+
+    workers = data.get('workers')
+    if workers is not None:
+        try:
+            workers = int(workers)
+        except (TypeError, ValueError):
+            raise ValueError("workers must be an integer")
+        if workers < 1:
+            raise ValueError("workers must be at least 1")
+
+    try:
+        monte_carlo_paths = int(data.get('monte_carlo_paths', MONTE_CARLO_PATHS))
+    except (TypeError, ValueError):
+        raise ValueError("monte_carlo_paths must be an integer")
+    if not 0 <= monte_carlo_paths <= MAX_PATHS:
+        raise ValueError(f"monte_carlo_paths must be between 0 and {MAX_PATHS}")
+    monte_carlo_method = data.get('monte_carlo_method', 'bootstrap')
+    if monte_carlo_method not in METHODS:
+        raise ValueError(f"monte_carlo_method must be one of: {', '.join(METHODS)}")
+
+    return {
+        'strategy': strategy,
+        'symbols': symbols,
+        'interval': interval,
+        'days': days,
+        'workers': workers,
+        'monte_carlo_paths': monte_carlo_paths,
+        'monte_carlo_method': monte_carlo_method,
+    }
+
+
+def cache_key(request, config):
+    """sha256 over the request and the result-affecting settings."""
+    payload = dict(request)
+    payload['settings'] = {name: getattr(config, name, None) for name in RESULT_SETTINGS}
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode()).hexdigest()
+
+
+class BacktestJob:
+    def __init__(self, request, key):
+        self.id = uuid.uuid4().hex
+        self.request = request
+        self.cache_key = key
+        self.status = 'QUEUED'  # QUEUED, RUNNING, COMPLETED, FAILED, CANCELLED
+        self.progress = 0.0
+        self.message = 'Queued'
+        self.cached = False
+        self.run_id = None
+        self.result = None
+        self.error = None
+        self.cancel_event = threading.Event()
+        self.future = None
+        self.created_at = datetime.utcnow()
+        self.finished_at = None
+
+    @property
+    def done(self):
+        return self.status in ('COMPLETED', 'FAILED', 'CANCELLED')
+
+    def update(self, progress, message):
+        self.progress = progress
+        self.message = message
+
+    def finish(self, status, message):
+        self.status = status
+        self.message = message
+        if status == 'COMPLETED':
+            self.progress = 1.0
+        self.finished_at = datetime.utcnow()
+
+    def check_cancelled(self):
+        if self.cancel_event.is_set():
+            raise BacktestCancelled()
+
+    def to_dict(self):
+        return {
+            'job_id': self.id,
+            'status': self.status,
+            'progress': round(self.progress * 100, 1),
+            'message': self.message,
+            'cached': self.cached,
+            'cache_key': self.cache_key,
+            'run_id': self.run_id,
+            'request': self.request,
+            'result': self.result,
+            'error': self.error,
+            'created_at': self.created_at.isoformat(),
+            'finished_at': self.finished_at.isoformat() if self.finished_at else None
+        }
+
+
+class BacktestJobQueue:
+    def __init__(self, app, config, exchange_factory, max_workers=2, max_jobs=200):
+        """
+        Args:
+            app: Flask app (jobs run inside its app context)
+            config: Config
+            exchange_factory: Callable returning a BinanceClient (called per job)
+            max_workers: Backtests running at the same time
+            max_jobs: Finished jobs kept in memory for status queries
+        """
+        self.app = app
+        self.config = config
+        self.exchange_factory = exchange_factory
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='backtest')
+        self.max_jobs = max_jobs
+        self.jobs = OrderedDict()
+        self.lock = threading.Lock()
+
+    def submit(self, data):
+        """
+        Queue a backtest (raises ValueError for invalid requests). Served
+        from the stored run when an identical one exists, and joined to the
+        in-flight job when the same request is already running.
+        """
+        request = normalize_request(data, self.config)
+        key = cache_key(request, self.config)
+
+        with self.lock:
+            for job in self.jobs.values():
+                if job.cache_key == key and not job.done:
+                    return job
+
+            job = BacktestJob(request, key)
+            with self.app.app_context():
+                run = BacktestRun.query.filter_by(cache_key=key).first()
+                if run is not None:
+                    job.cached = True
+                    job.run_id = run.id
+                    job.result = run.to_dict()
+                    job.finish('COMPLETED', 'Served from cache')
+            if not job.done:
+                job.future = self.executor.submit(self._run, job)
+            self._remember(job)
+        return job
+
+    def submit_multi(self, data):
+        """
+        Queue a multi-symbol backtest (raises ValueError for invalid
+        requests). Always runs; results are saved as one run per symbol.
+        """
+        request = normalize_multi_request(data, self.config)
+        job = BacktestJob(request, None)
+        with self.lock:
+            job.future = self.executor.submit(self._run, job)
+            self._remember(job)
+        return job
+
+    def _remember(self, job):
+        self.jobs[job.id] = job
+        while len(self.jobs) > self.max_jobs:
+            oldest_id = next(iter(self.jobs))
+            if not self.jobs[oldest_id].done:
+                break
+            self.jobs.pop(oldest_id)
+
+    def get(self, job_id):
+        return self.jobs.get(job_id)
+
+    def cancel(self, job_id):
+        """Request cancellation; returns False for unknown or finished jobs."""
+        job = self.jobs.get(job_id)
+        if job is None or job.done:
+            return False
+        job.cancel_event.set()
+        if job.future is not None and job.future.cancel():
+            job.finish('CANCELLED', 'Cancelled before start')
+        return True
+
+    def _run(self, job):
+        try:
+            job.check_cancelled()
+            job.status = 'RUNNING'
+            job.update(0.0, 'Downloading candles')
+            with self.app.app_context():
+                if 'symbols' in job.request:
+                    self._run_multi(job)
+                else:
+                    self._run_single(job)
+        except BacktestCancelled:
+            job.finish('CANCELLED', 'Cancelled')
+        except Exception as e:
+            with self.app.app_context():
+                db.session.rollback()
+            job.error = str(e)
+            job.finish('FAILED', f"Backtest failed: {e}")
+
+    def _run_single(self, job):
+        request = job.request
+        strategy = None
+        if request['strategy'] is not None:
+            strategy = create_strategy(request['strategy'], self.config)
+            for name, value in request['params'].items():
+                setattr(strategy, name, value)
+        engine = BacktestEngine(
+            self.exchange_factory(), self.config, strategy=strategy,
+            intrabar_interval=request['intrabar_interval']
+        )
+
+        def on_download(done, expected):
+            job.update(DOWNLOAD_PROGRESS * done / max(expected, 1),
+                       f"Downloading candles ({done}/{expected})")
+
+        df = engine.fetch_range(
+            request['symbol'], request['interval'], request['start'], request['end'],
+            progress=on_download, should_stop=job.cancel_event.is_set
+        )
+        job.check_cancelled()
+        complete = engine.store.covers(
+            request['symbol'], request['interval'], request['start'], request['end']
+        )
+        if len(df) < WARMUP_CANDLES:
+            job.error = f"Not enough data for backtest. Got {len(df)} candles."
+            job.finish('FAILED', job.error)
+            return
+
+        job.update(DOWNLOAD_PROGRESS, f"Simulating {len(df)} candles")
+        trades, final_balance = engine.simulate(df, request['symbol'])
+        job.check_cancelled()
+
+        job.update(0.9, f"Monte Carlo ({request['monte_carlo_paths']} paths)")
+        analysis = monte_carlo(
+            trades['pnl'], engine.initial_balance,
+            n_paths=request['monte_carlo_paths'], method=request['monte_carlo_method']
+        )
+        job.check_cancelled()
+
+        job.update(0.95, f"Saving {len(trades)} trades")
+        run = engine.save_to_database(
+            trades, final_balance, request['symbol'], request['interval'],
+            start_time=pd.Timestamp(request['start'], unit='ms'),
+            end_time=pd.Timestamp(request['end'], unit='ms'),
+            cache_key=job.cache_key if complete else None,
+            params={
+                'strategy_params': request['params'],
+                'intrabar_interval': request['intrabar_interval'],
+                'settings': {name: getattr(self.config, name, None) for name in RESULT_SETTINGS}
+            },
+            monte_carlo=analysis
+        )
+        job.run_id = run.id
+        job.result = run.to_dict()
+        if complete:
+            job.finish('COMPLETED', f"Backtest completed. {len(trades)} trades.")
+        else:
+            job.finish('COMPLETED', f"Backtest completed on partial data (not cached). {len(trades)} trades.")
+
+    def _run_multi(self, job):
+        request = job.request
+        runner = BacktestRunner(
+            self.exchange_factory(), self.config,
+            strategy=request['strategy'], max_workers=request['workers']
+        )
+
+        def on_download(done, expected):
+            job.update(DOWNLOAD_PROGRESS * done / max(expected, 1),
+                       f"Downloading candles ({done}/{expected} symbols)")
+
+        frames = runner.fetch_all(
+            request['symbols'], request['interval'], request['days'],
+            progress=on_download, should_stop=job.cancel_event.is_set
+        )
+        job.check_cancelled()
+        if not frames:
+            job.error = "Not enough data for any symbol."
+            job.finish('FAILED', job.error)
+            return
+
+        job.update(DOWNLOAD_PROGRESS, f"Simulating {len(frames)} symbols")
+        report = runner.run_frames(frames)
+        job.check_cancelled()
+        trades = report['trades']
+        if len(trades) == 0:
+            job.error = "No trades generated. Not enough data or no signals found."
+            job.finish('FAILED', job.error)
+            return
+
+        # Every symbol is its own account, so Monte Carlo runs per symbol
+        engine = BacktestEngine(None, self.config, strategy=request['strategy'])
+        runs = {}
+        for i, (symbol, stats) in enumerate(report['symbols'].items()):
+            job.update(0.9 + 0.1 * i / len(report['symbols']), f"Monte Carlo + saving {symbol}")
+            symbol_trades = trades[trades['symbol'] == symbol]
+            analysis = monte_carlo(
+                symbol_trades['pnl'], engine.initial_balance,
+                n_paths=request['monte_carlo_paths'], method=request['monte_carlo_method']
+            )
+            run = engine.save_to_database(
+                symbol_trades, stats['final_balance'], symbol, request['interval'],
+                monte_carlo=analysis
+            )
+            runs[symbol] = run.to_dict()
+        job.result = {'total': report['total'], 'runs': runs}
+        job.finish('COMPLETED', f"Backtest completed for {len(runs)} symbols. {len(trades)} trades.")
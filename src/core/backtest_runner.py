@@ -0,0 +1,195 @@
+"""
+Multi-Symbol Backtest Runner
+============================
+Fans per-symbol backtests out over a ProcessPoolExecutor.
+
+Candles for all symbols are packed once into a shared memory block
+(float64 OHLCV + int64 timestamps). Workers attach to it when they start,
+so a task only carries the symbol name and its row range instead of a
+pickled DataFrame.
+"""
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import shared_memory
+import os
+import numpy as np
+import pandas as pd
+
+from .backtest import BacktestEngine, TRADE_DTYPE, summarize
+
+CANDLE_COLUMNS = ['open', 'high', 'low', 'close', 'volume']
+
+
+class SharedCandles:
+    """
+    Read-only candle frames for many symbols in one shared memory block.
+
+    Layout: a (rows x 5) float64 OHLCV matrix followed by a (rows,) int64
+    timestamp vector (ns since epoch); each symbol owns a contiguous row
+    range. `spec` is the small picklable description workers attach with.
+    """
+
+    def __init__(self, shm, spec, owner):
+        self.shm = shm
+        self.spec = spec
+        self.owner = owner
+        rows = spec['rows']
+        self.values = np.ndarray((rows, len(CANDLE_COLUMNS)), dtype=np.float64, buffer=shm.buf)
+        self.timestamps = np.ndarray(
+            (rows,), dtype=np.int64, buffer=shm.buf, offset=self.values.nbytes
+        )
+
+    @classmethod
+    def create(cls, frames):
+        """Pack {symbol: candle frame} into a new shared memory block."""
+        frames = {s: df for s, df in frames.items() if not df.empty}
+        rows = sum(len(df) for df in frames.values())
+        size = max(rows * (len(CANDLE_COLUMNS) + 1) * 8, 1)
+        shm = shared_memory.SharedMemory(create=True, size=size)
+
+        ranges = {}
+        start = 0
+        for symbol, df in frames.items():
+            ranges[symbol] = (start, start + len(df))
+            start += len(df)
+        candles = cls(shm, {'name': shm.name, 'rows': rows, 'ranges': ranges}, owner=True)
+
+        for symbol, df in frames.items():
+            lo, hi = ranges[symbol]
+            candles.values[lo:hi] = df[CANDLE_COLUMNS].to_numpy(dtype=np.float64)
+            timestamps = df['timestamp'] if 'timestamp' in df.columns else df.index
+            candles.timestamps[lo:hi] = pd.to_datetime(timestamps).to_numpy(dtype='datetime64[ns]').view(np.int64)
+        return candles
+
+    @classmethod
+    def attach(cls, spec):
+        return cls(shared_memory.SharedMemory(name=spec['name']), spec, owner=False)
+
+    @property
+    def symbols(self):
+        return list(self.spec['ranges'])
+
+    def frame(self, symbol):
+        """Candle frame (timestamp column + OHLCV) for one symbol."""
+        lo, hi = self.spec['ranges'][symbol]
+        df = pd.DataFrame(self.values[lo:hi], columns=CANDLE_COLUMNS)
+        df.insert(0, 'timestamp', pd.to_datetime(self.timestamps[lo:hi]))
+        return df
+
+    def close(self):
+        """Release the mapping (and the block itself if this process created it)."""
+        self.values = None
+        self.timestamps = None
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+
+
+# Per-worker state set by _init_worker
+_worker_candles = None
+
+
+def _init_worker(spec):
+    global _worker_candles
+    _worker_candles = SharedCandles.attach(spec)
+
+
+def _run_symbol(symbol, config, strategy):
+    """Worker task: simulate one symbol from the shared candles."""
+    engine = BacktestEngine(None, config, strategy=strategy)
+    trades, balance = engine.simulate(_worker_candles.frame(symbol), symbol)
+    return symbol, trades, balance
+
+
+class BacktestRunner:
+    def __init__(self, exchange_client, config, strategy=None, max_workers=None):
+        """
+        Args:
+            exchange_client: BinanceClient used to fetch klines
+            config: Config (must be importable by worker processes)
+            strategy: Strategy name from STRATEGY_CLASSES, or None for the
+                built-in logic. Workers build their own instance.
+            max_workers: Process count (default: CPU count)
+        """
+        self.exchange = exchange_client
+        self.config = config
+        self.strategy = strategy
+        self.max_workers = max_workers or os.cpu_count() or 1
+
+    def fetch_all(self, symbols, interval, days, progress=None, should_stop=None):
+        """
+        Fetch candles for every symbol (sequential REST calls).
+
+        Args:
+            progress: Optional callback(done, total) after each symbol
+            should_stop: Optional callable; no further symbols are fetched
+                once it returns True
+        """
+        engine = BacktestEngine(self.exchange, self.config)
+        frames = {}
+        for i, symbol in enumerate(symbols):
+            if should_stop is not None and should_stop():
+                break
+            df = engine.fetch_historical_data(symbol, interval, days)
+            if progress is not None:
+                progress(i + 1, len(symbols))
+            if df.empty or len(df) < 205:
+                print(f"Skipping {symbol}: not enough data ({len(df)} candles).")
+                continue
+            frames[symbol] = df
+        return frames
+
+    def run(self, symbols=None, interval='1m', days=30):
+        """Fetch and backtest every symbol; returns the merged report."""
+        symbols = symbols or getattr(self.config, 'SYMBOLS', [self.config.SYMBOL])
+        print(f"Starting backtest for {len(symbols)} symbols on {interval} for {days} days...")
+        return self.run_frames(self.fetch_all(symbols, interval, days))
+
+    def run_frames(self, frames):
+        """
+        Backtest {symbol: candle frame} in parallel.
+
+        Returns:
+            dict with 'trades' (all symbols, TRADE_DTYPE, ordered by entry
+            time), 'symbols' (per-symbol summary) and 'total' (summary of
+            the combined trades; every symbol starts from the same balance).
+        """
+        results = {}
+        if frames:
+            candles = SharedCandles.create(frames)
+            try:
+                with ProcessPoolExecutor(
+                    max_workers=min(self.max_workers, len(frames)),
+                    initializer=_init_worker,
+                    initargs=(candles.spec,)
+                ) as pool:
+                    futures = [
+                        pool.submit(_run_symbol, symbol, self.config, self.strategy)
+                        for symbol in candles.symbols
+                    ]
+                    for future in as_completed(futures):
+                        try:
+                            symbol, trades, balance = future.result()
+                            results[symbol] = (trades, balance)
+                        except Exception as e:
+                            print(f"Backtest worker failed: {e}")
+            finally:
+                candles.close()
+        return self._merge(results)
+
+    def _merge(self, results):
+        initial = BacktestEngine(None, self.config).initial_balance
+        per_symbol = {
+            symbol: summarize(trades, initial, balance)
+            for symbol, (trades, balance) in sorted(results.items())
+        }
+        if results:
+            trades = np.concatenate([trades for trades, _ in results.values()])
+            trades = trades[np.argsort(trades['entry_time'], kind='stable')]
+        else:
+            trades = np.zeros(0, dtype=TRADE_DTYPE)
+
+        total_initial = initial * len(results)
+        total_final = sum(balance for _, balance in results.values())
+        total = summarize(trades, total_initial, total_final) if results else summarize(trades, initial, initial)
+        print(f"Backtest complete. {len(trades)} trades across {len(results)} symbols.")
+        return {'trades': trades, 'symbols': per_symbol, 'total': total}
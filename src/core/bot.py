@@ -1,11 +1,16 @@
 import time
 import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from flask import current_app, has_app_context
 from ..exchange.binance_client import BinanceClient
-from ..exchange.websocket_manager import BinanceWebSocket, WebSocketDataProvider
+from ..exchange.websocket_manager import BinanceWebSocket, WebSocketDataProvider, TICK_STREAMS
 from ..strategy.liquidity_grab_strategy import LiquidityGrabStrategy
 from ..core.risk_manager import RiskManager
+from ..core.tick_exits import TickExitMonitor, exit_reason
 from ..database.db_manager import DBManager
+from ..utils.indicator_engine import IndicatorEngine
+from ..utils.indicator_cache import IndicatorCache
 
 class TradingBot:
     def __init__(self, config, db_manager):
@@ -15,10 +20,15 @@ class TradingBot:
         self.risk_manager = RiskManager(config, db_manager)
         
         # Active strategies
+        level_lookback = getattr(config, 'LEVEL_LOOKBACK', 50)
         self.strategies = [
-            ("LiquidityGrab", LiquidityGrabStrategy(self.risk_manager))
+            ("LiquidityGrab", LiquidityGrabStrategy(self.risk_manager, level_lookback=level_lookback))
         ]
         
+        # Candles handed to strategies: 200 for indicator warm-up, more if
+        # the level lookback is longer
+        self.candle_limit = max(205, level_lookback + 5)
+        
         self.symbols = getattr(config, 'SYMBOLS', [config.SYMBOL])
         self.timeframe = config.TIMEFRAME
         self.is_running = False
@@ -28,6 +38,92 @@ class TradingBot:
         self.ws_manager = None
         self.data_provider = None
         self.use_websocket = getattr(config, 'USE_WEBSOCKET', True)
+        self.callback_workers = getattr(config, 'CANDLE_CALLBACK_WORKERS', 4)
+        self.metrics_interval = 60  # Seconds between candle dispatch reports
+        self.app = None  # Flask app, for DB access from callback workers
+        
+        # Tick-level exits: SL/TP checked on every tick of symbols with
+        # open trades, closes run on their own thread
+        self.tick_stream = getattr(config, 'TICK_EXIT_STREAM', '')
+        if self.tick_stream and self.tick_stream not in TICK_STREAMS:
+            # Checked here: start() would fall back to HTTP polling instead
+            raise ValueError(f"Unknown TICK_EXIT_STREAM: {self.tick_stream}. "
+                             f"Available: {', '.join(TICK_STREAMS)} (or empty to disable)")
+        self.tick_exits = TickExitMonitor(self._on_tick_exit) if self.tick_stream else None
+        self.tick_executor = None
+        # Serializes exit checks and closes from the loop, callbacks and ticks
+        self.exit_lock = threading.RLock()
+        # Serializes entries (risk checks and sizing) across callback workers
+        self.entry_lock = threading.Lock()
+        
+        # Streaming indicators: only new candles are processed per symbol
+        self.indicator_engine = IndicatorEngine(history=max(500, self.candle_limit))
+        # One indicator frame per closed candle, shared by all strategies
+        self.indicator_cache = IndicatorCache()
+
+    def _get_indicator_frame(self, symbol, df):
+        """Indicator frame for a frame of closed candles (cached per candle)."""
+        if df.empty:
+            return df
+        key = self.indicator_cache.make_key(symbol, self.timeframe, df)
+        return self.indicator_cache.get_or_compute(
+            key, lambda: self.indicator_engine.compute(symbol, df, closed=True)
+        )
+
+    def _in_app_context(self, func, *args):
+        """Run func from a worker thread; DB access needs the bot's app context."""
+        if self.app is None:
+            return func(*args)
+        with self.app.app_context():
+            return func(*args)
+
+    def _dispatch_candle_close(self, symbol, df):
+        """Callback worker entry."""
+        self._in_app_context(self._on_candle_close, symbol, df)
+
+    def _sync_tick_exits(self):
+        """Watch ticks for exactly the symbols with open trades."""
+        if not self.tick_exits or not self.ws_manager:
+            return
+        symbols = self.tick_exits.sync(self.db_manager.get_open_trades())
+        self.ws_manager.set_tick_symbols(symbols)
+
+    def _on_tick_exit(self, trade_id, symbol, price, reason):
+        """A tick hit a trade's SL/TP (receive thread): close it off-thread."""
+        if self.tick_executor:
+            self.tick_executor.submit(self._in_app_context, self._close_on_tick, trade_id, symbol, price, reason)
+
+    def _close_on_tick(self, trade_id, symbol, price, reason):
+        closed = False
+        try:
+            with self.exit_lock:
+                trade = next((t for t in self.db_manager.get_open_trades() if t.id == trade_id), None)
+                if trade is not None:
+                    closed = self._close_trade(trade, price, f"{reason} (tick)")
+            if trade is not None and not closed:
+                self.tick_exits.release(trade_id)
+            self._sync_tick_exits()
+        except Exception as e:
+            self.tick_exits.release(trade_id)
+            print(f"Error closing trade {trade_id} on tick: {e}")
+
+    def _report_dispatch_metrics(self):
+        """Print candle-close queue depth and lag since the last report."""
+        metrics = self.ws_manager.dispatch_metrics(reset=True) if self.ws_manager else None
+        if not metrics or not metrics['dispatched']:
+            return
+        print(f"📊 Candle dispatch: {metrics['dispatched']} callbacks, "
+              f"queue {metrics['queue_depth']} (max {metrics['max_queue_depth']}), "
+              f"lag avg {metrics['avg_lag'] * 1000:.0f}ms / max {metrics['max_lag'] * 1000:.0f}ms, "
+              f"errors {metrics['errors']}")
+
+    def _report_indicator_cache(self):
+        """Print indicator cache hit rate (cumulative)."""
+        stats = self.indicator_cache.stats()
+        if not stats['hits'] + stats['misses']:
+            return
+        print(f"📊 Indicator cache: {stats['hits']} hits / {stats['misses']} misses "
+              f"({stats['hit_rate']:.1f}%), {stats['size']}/{stats['max_entries']} frames")
 
     def _on_candle_close(self, symbol, df):
         """Callback when a candle closes - run strategy analysis immediately."""
@@ -40,6 +136,9 @@ class TradingBot:
             # Check for exits
             self.manage_open_trades_for_symbol(symbol, current_price)
             
+            # Advance indicator state with the closed candle
+            df = self._get_indicator_frame(symbol, df)
+            
             # Run strategies
             for strategy_name, strategy in self.strategies:
                 signal, entry_price, stop_loss, take_profit = strategy.analyze(df, symbol=symbol)
@@ -57,14 +156,24 @@ class TradingBot:
         
         # Initialize WebSocket
         if self.use_websocket:
+            if has_app_context():
+                self.app = current_app._get_current_object()
+            if self.tick_exits:
+                self.tick_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='tick-exit')
             try:
                 self.ws_manager = BinanceWebSocket(
                     symbols=self.symbols,
                     timeframe=self.timeframe,
                     testnet=self.config.TESTNET,
-                    on_candle_close=self._on_candle_close
+                    on_candle_close=self._dispatch_candle_close,
+                    candle_limit=self.candle_limit,
+                    http_client=self.exchange,
+                    callback_workers=self.callback_workers,
+                    on_tick=self.tick_exits.on_tick if self.tick_exits else None,
+                    tick_stream=self.tick_stream or 'bookTicker'
                 )
                 self.ws_manager.start()
+                self._sync_tick_exits()
                 self.data_provider = WebSocketDataProvider(self.exchange, self.ws_manager)
                 print("🚀 WebSocket mode enabled - real-time data streaming")
             except Exception as e:
@@ -81,11 +190,14 @@ class TradingBot:
         # Stop WebSocket
         if self.ws_manager:
             self.ws_manager.stop()
+        if self.tick_executor:
+            self.tick_executor.shutdown(wait=False)
         
         self.db_manager.update_bot_state(is_running=False)
 
     def run_loop(self):
         """Main loop - with WebSocket, this mainly handles exits and health checks."""
+        last_report = time.time()
         while not self._stop_event.is_set():
             state = self.db_manager.get_bot_state()
             if state and not state.is_running:
@@ -108,9 +220,16 @@ class TradingBot:
                         # Fallback to HTTP if WebSocket data not ready
                         self.process_symbol(symbol)
                         
+                # Pick up trades opened or closed elsewhere (web UI, sync)
+                self._sync_tick_exits()
             except Exception as e:
                 print(f"Error in main loop: {e}")
             
+            if time.time() - last_report >= self.metrics_interval:
+                self._report_dispatch_metrics()
+                self._report_indicator_cache()
+                last_report = time.time()
+            
             # Sleep less in WebSocket mode since callbacks handle most work
             time.sleep(5 if self.use_websocket else 10)
 
@@ -119,9 +238,9 @@ class TradingBot:
         try:
             # Get data from provider (WebSocket cache or HTTP)
             if self.data_provider:
-                df = self.data_provider.get_candles(symbol, self.timeframe, limit=205)
+                df = self.data_provider.get_candles(symbol, self.timeframe, limit=self.candle_limit)
             else:
-                df = self.exchange.get_historical_klines(symbol, self.timeframe, limit=205)
+                df = self.exchange.get_historical_klines(symbol, self.timeframe, limit=self.candle_limit)
             if df.empty:
                 return
 
@@ -129,10 +248,13 @@ class TradingBot:
             
             # 2. Check for Exits (Manage Open Trades for this symbol)
             self.manage_open_trades_for_symbol(symbol, current_price)
+            
+            # Last kline is still forming: evaluate it provisionally
+            df = self.indicator_engine.compute(symbol, df, closed=False)
 
             # 3. Run EACH strategy
             for strategy_name, strategy in self.strategies:
-                signal, entry_price, stop_loss, take_profit = strategy.analyze(df)
+                signal, entry_price, stop_loss, take_profit = strategy.analyze(df, symbol=symbol)
                 
                 # 4. Execute New Trade
                 if signal != 'NONE':
@@ -141,6 +263,13 @@ class TradingBot:
             print(f"Error processing {symbol}: {e}")
 
     def execute_trade(self, symbol, signal, entry_price, stop_loss, take_profit, strategy_name):
+        # Candle-close callbacks run for several symbols at once: entries go
+        # one at a time, so each sees the balance and open trades left by
+        # the previous one
+        with self.entry_lock:
+            self._open_trade(symbol, signal, entry_price, stop_loss, take_profit, strategy_name)
+
+    def _open_trade(self, symbol, signal, entry_price, stop_loss, take_profit, strategy_name):
         open_trades = self.db_manager.get_open_trades()
         # Ensure only one trade per symbol PER STRATEGY
         if any(t.symbol == symbol and t.strategy == strategy_name for t in open_trades):
@@ -153,15 +282,7 @@ class TradingBot:
 
         position_size = self.risk_manager.calculate_position_size(account_balance, entry_price, stop_loss)
         
-        # Round position size based on asset price (precision adjustment)
-        if entry_price > 1000:  # BTC, etc.
-            position_size = round(position_size, 3)
-        elif entry_price > 10:  # ETH, BNB, etc.
-            position_size = round(position_size, 2)
-        elif entry_price > 1:   # SOL, LINK, etc.
-            position_size = round(position_size, 1)
-        else:                   # DOGE, XRP, etc.
-            position_size = round(position_size, 0)
+        position_size = self.risk_manager.round_position_size(position_size, entry_price)
         
         if position_size <= 0:
             return
@@ -179,6 +300,7 @@ class TradingBot:
                 take_profit=take_profit,
                 strategy=strategy_name
             )
+            self._sync_tick_exits()
         else:
             # Live execution logic
             try:
@@ -194,61 +316,54 @@ class TradingBot:
                         take_profit=take_profit,
                         strategy=strategy_name
                     )
+                    self._sync_tick_exits()
             except Exception as e:
                 print(f"Error placing order for {symbol}: {e}")
 
     def manage_open_trades_for_symbol(self, symbol, current_price):
         """Manage open trades for a specific symbol."""
-        open_trades = self.db_manager.get_open_trades()
-        for trade in open_trades:
-            if trade.symbol != symbol:
-                continue
-            if not trade.stop_loss or not trade.take_profit:
-                continue
-
-            should_close = False
-            exit_reason = ""
-            
-            if trade.side == 'LONG':
-                if current_price <= trade.stop_loss:
-                    should_close = True
-                    exit_reason = "SL Hit"
-                elif current_price >= trade.take_profit:
-                    should_close = True
-                    exit_reason = "TP Hit"
-            elif trade.side == 'SHORT':
-                if current_price >= trade.stop_loss:
-                    should_close = True
-                    exit_reason = "SL Hit"
-                elif current_price <= trade.take_profit:
-                    should_close = True
-                    exit_reason = "TP Hit"
-            
-            if should_close:
-                # Calculate Gross PnL
-                if trade.side == 'LONG':
-                    gross_pnl = (current_price - trade.entry_price) * trade.quantity
-                else:
-                    gross_pnl = (trade.entry_price - current_price) * trade.quantity
-                
-                # Calculate Fees (Entry + Exit)
-                # Fee = (Entry Value + Exit Value) * Fee Rate
-                entry_value = trade.entry_price * trade.quantity
-                exit_value = current_price * trade.quantity
-                fee = (entry_value + exit_value) * self.config.TRADING_FEE_RATE
-                
-                net_pnl = gross_pnl - fee
-                
-                print(f"📉 Closing {trade.symbol} {trade.side}: {exit_reason} at {current_price:.2f} | Gross PnL: {gross_pnl:.4f} | Fee: {fee:.4f} | Net PnL: {net_pnl:.4f}")
-                
-                if self.config.DRY_RUN:
-                    self.db_manager.close_trade(trade.id, current_price, net_pnl)
-                else:
-                    # Live Close Logic
-                    try:
-                        close_side = 'SELL' if trade.side == 'LONG' else 'BUY'
-                        order = self.exchange.place_order(trade.symbol, close_side, trade.quantity, 'MARKET')
-                        if order:
-                            self.db_manager.close_trade(trade.id, current_price, net_pnl)
-                    except Exception as e:
-                        print(f"Error closing trade {trade.id}: {e}")
+        closed = False
+        with self.exit_lock:
+            open_trades = self.db_manager.get_open_trades()
+            for trade in open_trades:
+                if trade.symbol != symbol:
+                    continue
+                if not trade.stop_loss or not trade.take_profit:
+                    continue
+
+                reason = exit_reason(trade.side, current_price, trade.stop_loss, trade.take_profit)
+                if reason:
+                    closed |= self._close_trade(trade, current_price, reason)
+        if closed:
+            self._sync_tick_exits()
+
+    def _close_trade(self, trade, current_price, exit_reason):
+        """Close a trade at current_price; True if it was closed."""
+        # Calculate Gross PnL
+        if trade.side == 'LONG':
+            gross_pnl = (current_price - trade.entry_price) * trade.quantity
+        else:
+            gross_pnl = (trade.entry_price - current_price) * trade.quantity
+        
+        # Calculate Fees (Entry + Exit)
+        # Fee = (Entry Value + Exit Value) * Fee Rate
+        entry_value = trade.entry_price * trade.quantity
+        exit_value = current_price * trade.quantity
+        fee = (entry_value + exit_value) * self.config.TRADING_FEE_RATE
+        
+        net_pnl = gross_pnl - fee
+        
+        print(f"📉 Closing {trade.symbol} {trade.side}: {exit_reason} at {current_price:.2f} | Gross PnL: {gross_pnl:.4f} | Fee: {fee:.4f} | Net PnL: {net_pnl:.4f}")
+        
+        if self.config.DRY_RUN:
+            return self.db_manager.close_trade(trade.id, current_price, net_pnl) is not None
+        
+        # Live Close Logic
+        try:
+            close_side = 'SELL' if trade.side == 'LONG' else 'BUY'
+            order = self.exchange.place_order(trade.symbol, close_side, trade.quantity, 'MARKET')
+            if order:
+                return self.db_manager.close_trade(trade.id, current_price, net_pnl) is not None
+        except Exception as e:
+            print(f"Error closing trade {trade.id}: {e}")
+        return False
@@ -0,0 +1,98 @@
+"""
+Monte Carlo Trade Analysis
+==========================
+Resamples a backtest's trade PnL sequence into many equity paths to show
+how much of the result depends on trade order and luck.
+
+Paths are built as one (paths x trades) matrix per block: PnL is drawn for
+every cell at once (bootstrap = with replacement, shuffle = permutation of
+the actual trades), then cumsum / maximum.accumulate along the trade axis
+give every path's equity curve, final equity and max drawdown. Blocks only
+bound memory for long trade lists; there is no per-path Python loop.
+
+PnL is treated as fixed dollar amounts (no compounding), matching how the
+backtest reports total_pnl and max_drawdown_pct.
+"""
+import numpy as np
+
+MONTE_CARLO_PATHS = 10_000
+MAX_PATHS = 100_000
+METHODS = ('bootstrap', 'shuffle')
+PERCENTILES = [5, 25, 50, 75, 95]
+
+# A path is "ruined" once its drawdown reaches this
+RUIN_DRAWDOWN_PCT = 50.0
+
+# Cells (paths x trades) per block, ~16 MB per float64 matrix
+BLOCK_CELLS = 2_000_000
+
+
+def _resample(pnl, n_paths, method, rng):
+    if method == 'bootstrap':
+        return pnl[rng.integers(0, len(pnl), size=(n_paths, len(pnl)), dtype=np.int32)]
+    return rng.permuted(np.broadcast_to(pnl, (n_paths, len(pnl))), axis=1)
+
+
+def simulate_paths(pnl, initial_balance, n_paths, method='bootstrap', rng=None):
+    """
+    Final equity and max drawdown (%) of n_paths resampled equity paths.
+
+    Returns:
+        (final_equity, max_drawdown_pct) arrays of length n_paths.
+    """
+    if method not in METHODS:
+        raise ValueError(f"Unknown method: {method}. Available: {', '.join(METHODS)}")
+    pnl = np.asarray(pnl, dtype=np.float64)
+    rng = rng if rng is not None else np.random.default_rng()
+
+    final = np.empty(n_paths)
+    drawdown = np.empty(n_paths)
+    block = max(1, BLOCK_CELLS // max(len(pnl), 1))
+    for lo in range(0, n_paths, block):
+        hi = min(lo + block, n_paths)
+        equity = _resample(pnl, hi - lo, method, rng)
+        np.cumsum(equity, axis=1, out=equity)
+        equity += initial_balance
+        final[lo:hi] = equity[:, -1]
+
+        # The starting balance counts as the first peak
+        peak = np.maximum.accumulate(equity, axis=1)
+        np.maximum(peak, initial_balance, out=peak)
+        np.divide(equity, peak, out=equity)
+        drawdown[lo:hi] = (1.0 - equity.min(axis=1)) * 100
+    return final, np.maximum(drawdown, 0.0)
+
+
+def monte_carlo(pnl, initial_balance, n_paths=MONTE_CARLO_PATHS, method='bootstrap',
+                seed=0, ruin_drawdown_pct=RUIN_DRAWDOWN_PCT):
+    """
+    Percentile summary of resampled equity paths for a trade PnL array.
+    A fixed seed (default) makes the result repeatable for the same trades.
+
+    Returns:
+        dict (JSON-serializable), or None if there are no trades.
+    """
+    pnl = np.asarray(pnl, dtype=np.float64)
+    if len(pnl) == 0 or n_paths <= 0:
+        return None
+
+    final, drawdown = simulate_paths(
+        pnl, initial_balance, n_paths, method, np.random.default_rng(seed)
+    )
+    return_pct = (final - initial_balance) / initial_balance * 100
+
+    def percentiles(values):
+        return {f"p{p}": float(v) for p, v in zip(PERCENTILES, np.percentile(values, PERCENTILES))}
+
+    return {
+        'method': method,
+        'paths': int(n_paths),
+        'trades': len(pnl),
+        'initial_balance': initial_balance,
+        'final_equity': percentiles(final),
+        'return_pct': percentiles(return_pct),
+        'max_drawdown_pct': percentiles(drawdown),
+        'probability_of_loss': float((final < initial_balance).mean() * 100),
+        'ruin_drawdown_pct': ruin_drawdown_pct,
+        'risk_of_ruin': float((drawdown >= ruin_drawdown_pct).mean() * 100),
+    }
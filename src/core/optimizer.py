@@ -0,0 +1,218 @@
+"""
+LiquidityGrab Parameter Optimizer
+=================================
+Grid / random search over LiquidityGrabStrategy parameters.
+
+Everything that does not depend on the swept parameters is computed once
+per symbol before the search starts: the indicator frame (atr, vol_ma) and
+the support/resistance level arrays for every LEVEL_TOLERANCE_PERCENT value
+in the search space. Each combination then only re-evaluates the cheap
+vectorized entry conditions and runs the trade loop.
+
+Combinations are evaluated in chunks over a ProcessPoolExecutor; the
+precomputed data is handed to each worker once through the pool
+initializer, never per combination.
+"""
+from concurrent.futures import ProcessPoolExecutor
+import itertools
+import math
+import os
+import numpy as np
+import pandas as pd
+
+from .backtest import BacktestEngine, candle_times, create_strategy, max_drawdown_pct
+from ..strategy.signals import signal_vectors
+from ..utils.indicator_registry import resolve_indicators
+
+# Default search space (LiquidityGrabStrategy attribute -> candidate values)
+PARAM_SPACE = {
+    'LEVEL_TOLERANCE_PERCENT': [0.001, 0.0015, 0.002, 0.003],
+    'SWEEP_THRESHOLD_ATR': [0.1, 0.2, 0.3, 0.5],
+    'VOLUME_SURGE_MULTIPLIER': [1.0, 1.25, 1.5, 2.0],
+    'MIN_RR_RATIO': [1.5, 2.0, 2.5, 3.0],
+}
+
+RESULT_METRICS = [
+    'total_trades', 'win_rate', 'total_pnl', 'total_fees', 'return_pct',
+    'profit_factor', 'max_drawdown_pct'
+]
+
+# Metrics ranked ascending (smaller is better); the rest rank descending
+LOWER_IS_BETTER = {'total_fees', 'max_drawdown_pct'}
+
+
+def grid_combinations(space):
+    """Every combination of the space, as a list of {param: value} dicts."""
+    names = list(space)
+    return [dict(zip(names, values)) for values in itertools.product(*space.values())]
+
+
+def random_combinations(space, n_iter, seed=None):
+    """
+    n_iter distinct combinations drawn uniformly from the grid. Values stay
+    on the listed candidates so precomputed level arrays are always reused.
+    """
+    names = list(space)
+    sizes = [len(space[name]) for name in names]
+    total = math.prod(sizes)
+    rng = np.random.default_rng(seed)
+    picks = rng.choice(total, size=min(n_iter, total), replace=False)
+
+    combos = []
+    for pick in picks:
+        combo = {}
+        for name, size in zip(reversed(names), reversed(sizes)):
+            pick, i = divmod(int(pick), size)
+            combo[name] = space[name][i]
+        combos.append({name: combo[name] for name in names})
+    return combos
+
+
+def rank_by(table, metric):
+    """Rows of a result table best-first by metric (stable on ties)."""
+    return table.sort_values(metric, ascending=metric in LOWER_IS_BETTER, kind='stable')
+
+
+def score(trades, initial_balance, final_balance):
+    """Metrics for one combination's trades (all symbols)."""
+    pnl = trades['pnl']
+    total = len(trades)
+    gross_win = float(pnl[pnl > 0].sum())
+    gross_loss = float(-pnl[pnl < 0].sum())
+    return {
+        'total_trades': total,
+        'win_rate': (int((pnl > 0).sum()) / total * 100) if total > 0 else 0.0,
+        'total_pnl': float(pnl.sum()),
+        'total_fees': float(trades['fee'].sum()),
+        'return_pct': (final_balance - initial_balance) / initial_balance * 100 if initial_balance > 0 else 0.0,
+        'profit_factor': gross_win / gross_loss if gross_loss > 0 else (math.inf if gross_win > 0 else 0.0),
+        'max_drawdown_pct': max_drawdown_pct(trades, initial_balance),
+    }
+
+
+def prepare_datasets(frames, config, tolerances):
+    """
+    Precompute everything the search reuses, per symbol:
+    indicator frame, candle arrays and level arrays per tolerance.
+    """
+    strategy = create_strategy('LiquidityGrab', config)
+    datasets = {}
+    for symbol, df in frames.items():
+        frame = resolve_indicators(df.copy(), strategy.INDICATORS)
+        levels = {}
+        for tolerance in tolerances:
+            strategy.LEVEL_TOLERANCE_PERCENT = tolerance
+            levels[tolerance] = strategy._level_arrays(frame)
+        datasets[symbol] = {
+            'frame': frame,
+            'levels': levels,
+            'high': frame['high'].to_numpy(dtype=float),
+            'low': frame['low'].to_numpy(dtype=float),
+            'close': frame['close'].to_numpy(dtype=float),
+            'times': candle_times(frame),
+        }
+    return datasets
+
+
+# Per-worker state set by _init_worker
+_worker = {}
+
+
+def _init_worker(datasets, config):
+    strategy = create_strategy('LiquidityGrab', config)
+    _worker['datasets'] = datasets
+    _worker['strategy'] = strategy
+    _worker['engine'] = BacktestEngine(None, config, strategy=strategy)
+
+
+def evaluate(combo, datasets, strategy, engine):
+    """Backtest one combination over every dataset; returns params + metrics."""
+    for name, value in combo.items():
+        setattr(strategy, name, value)
+    tolerance = strategy.LEVEL_TOLERANCE_PERCENT
+
+    results = []
+    for symbol, data in datasets.items():
+        direction, entry, stop_loss, take_profit = signal_vectors(
+            *strategy.signal_arrays(data['frame'], data['levels'][tolerance])
+        )
+        results.append(engine.simulate_signals(
+            symbol, direction, entry, stop_loss, take_profit,
+            data['high'], data['low'], data['close'], data['times']
+        ))
+
+    trades = np.concatenate([trades for trades, _ in results])
+    initial = engine.initial_balance * len(results)
+    final = sum(balance for _, balance in results)
+    return {**combo, **score(trades, initial, final)}
+
+
+def _evaluate_chunk(combos):
+    return [
+        evaluate(combo, _worker['datasets'], _worker['strategy'], _worker['engine'])
+        for combo in combos
+    ]
+
+
+class ParameterOptimizer:
+    def __init__(self, config, max_workers=None, metric='total_pnl'):
+        """
+        Args:
+            config: Config (sizing, fees, LEVEL_LOOKBACK)
+            max_workers: Process count (default: CPU count)
+            metric: Result column to rank by (best first, see LOWER_IS_BETTER)
+        """
+        if metric not in RESULT_METRICS:
+            raise ValueError(f"Unknown metric: {metric}. Available: {', '.join(RESULT_METRICS)}")
+        self.config = config
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.metric = metric
+
+    def run(self, frames, combos, output_path=None):
+        """
+        Evaluate combos over {symbol: candle frame} and return the ranked
+        result table (optionally also written to output_path as CSV).
+        """
+        if not combos:
+            raise ValueError("No parameter combinations to evaluate")
+        frames = {s: df for s, df in frames.items() if not df.empty}
+        if not frames:
+            raise ValueError("No candle data to optimize on")
+
+        tolerances = sorted({combo.get('LEVEL_TOLERANCE_PERCENT', 0.002) for combo in combos})
+        print(f"Precomputing indicators and levels for {len(frames)} symbols, {len(tolerances)} tolerances...")
+        datasets = prepare_datasets(frames, self.config, tolerances)
+
+        workers = min(self.max_workers, len(combos))
+        chunk_size = max(1, math.ceil(len(combos) / (workers * 4)))
+        chunks = [combos[i:i + chunk_size] for i in range(0, len(combos), chunk_size)]
+        print(f"Evaluating {len(combos)} combinations on {workers} workers...")
+
+        rows = []
+        if workers == 1:
+            _init_worker(datasets, self.config)
+            for chunk in chunks:
+                rows.extend(_evaluate_chunk(chunk))
+        else:
+            with ProcessPoolExecutor(
+                max_workers=workers,
+                initializer=_init_worker,
+                initargs=(datasets, self.config)
+            ) as pool:
+                for chunk_rows in pool.map(_evaluate_chunk, chunks):
+                    rows.extend(chunk_rows)
+
+        table = rank_by(pd.DataFrame(rows), self.metric)
+        table.insert(0, 'rank', np.arange(1, len(table) + 1))
+        table = table.reset_index(drop=True)
+
+        if output_path:
+            table.to_csv(output_path, index=False)
+            print(f"Wrote {len(table)} results to {output_path}")
+        return table
+
+    def grid_search(self, frames, space=None, output_path=None):
+        return self.run(frames, grid_combinations(space or PARAM_SPACE), output_path)
+
+    def random_search(self, frames, n_iter, space=None, seed=None, output_path=None):
+        return self.run(frames, random_combinations(space or PARAM_SPACE, n_iter, seed), output_path)
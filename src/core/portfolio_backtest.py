@@ -0,0 +1,230 @@
+"""
+Portfolio Backtest
+==================
+Backtests many symbols and strategies against one shared account, the way
+TradingBot trades them live.
+
+Signals and candle arrays are precomputed once per (symbol, strategy)
+stream, in worker processes attached to the candles in shared memory
+(see backtest_runner.SharedCandles). Indicators are resolved once per
+symbol for the union of the strategies' INDICATORS, and every strategy
+reads that one frame. The streams are then merged in
+candle-time order with a heap holding one pending event per stream: its
+next entry signal, or the exit of its open trade. So a stream never has
+more than one open trade, which is the one-trade-per-symbol-per-strategy
+rule of TradingBot.execute_trade.
+
+Entries are sized with RiskManager.calculate_position_size (+ rounding)
+against the shared realized balance, like the live bot sizes from the
+wallet balance. An entry whose initial margin exceeds the free balance
+(wallet minus margin of open trades) is rejected, as the exchange would.
+At equal candle times exits are booked before entries.
+"""
+from concurrent.futures import ProcessPoolExecutor
+import heapq
+import os
+import numpy as np
+
+from .backtest import BacktestEngine, STRATEGY_CLASSES, TRADE_DTYPE, WARMUP_CANDLES, summarize
+from .backtest_runner import BacktestRunner, SharedCandles
+from .risk_manager import RiskManager
+from ..utils.indicator_registry import resolve_indicators
+
+# Event kinds; exits sort before entries at the same candle time
+EXIT, ENTRY = 0, 1
+
+
+# Per-worker state set by _init_worker
+_worker_candles = None
+
+
+def _init_worker(spec):
+    global _worker_candles
+    _worker_candles = SharedCandles.attach(spec)
+
+
+def _symbol_arrays(engines, df, symbol):
+    """Signal arrays of every engine for one symbol, over one shared indicator frame."""
+    names = [name for engine in engines.values() for name in engine.strategy.INDICATORS]
+    frame = resolve_indicators(df.copy(), list(dict.fromkeys(names)))
+    return {name: engine.signal_arrays(frame, symbol) for name, engine in engines.items()}
+
+
+def _prepare_symbol(symbol, config, strategies):
+    """Worker task: signal arrays of every strategy for one symbol."""
+    engines = {name: BacktestEngine(None, config, strategy=name) for name in strategies}
+    return symbol, _symbol_arrays(engines, _worker_candles.frame(symbol), symbol)
+
+
+class PortfolioBacktest:
+    def __init__(self, exchange_client, config, strategies=None, max_workers=None):
+        """
+        Args:
+            exchange_client: BinanceClient used to fetch klines
+            config: Config (sizing, leverage, fees, LEVEL_LOOKBACK)
+            strategies: Strategy names from STRATEGY_CLASSES run on every
+                symbol (default: LiquidityGrab, like TradingBot)
+            max_workers: Processes for signal precomputation (default: CPU count)
+        """
+        strategies = list(strategies or ['LiquidityGrab'])
+        for name in strategies:
+            if name not in STRATEGY_CLASSES:
+                raise ValueError(f"Unknown strategy: {name}. Available: {', '.join(STRATEGY_CLASSES)}")
+        self.exchange = exchange_client
+        self.config = config
+        self.strategies = strategies
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.risk_manager = RiskManager(config, None)
+        self.leverage = getattr(config, 'LEVERAGE', 5)
+        self.engines = {name: BacktestEngine(None, config, strategy=name) for name in strategies}
+        self.initial_balance = self.engines[strategies[0]].initial_balance
+
+    def run(self, symbols=None, interval='5m', days=30):
+        """Fetch every symbol and backtest them as one portfolio."""
+        symbols = symbols or getattr(self.config, 'SYMBOLS', [self.config.SYMBOL])
+        print(f"Starting portfolio backtest for {len(symbols)} symbols on {interval} for {days} days...")
+        frames = BacktestRunner(self.exchange, self.config).fetch_all(symbols, interval, days)
+        return self.run_frames(frames)
+
+    def run_frames(self, frames):
+        return self.simulate(self.prepare(frames))
+
+    def prepare(self, frames):
+        """
+        Signal arrays for every (symbol, strategy) stream of
+        {symbol: candle frame}, computed in parallel.
+
+        Returns:
+            List of (symbol, strategy, arrays) in symbol, strategy order.
+        """
+        frames = {s: df for s, df in frames.items() if not df.empty}
+        prepared = {}
+        workers = min(self.max_workers, len(frames))
+        if workers <= 1:
+            for symbol, df in frames.items():
+                prepared[symbol] = _symbol_arrays(self.engines, df, symbol)
+        else:
+            candles = SharedCandles.create(frames)
+            try:
+                with ProcessPoolExecutor(
+                    max_workers=workers,
+                    initializer=_init_worker,
+                    initargs=(candles.spec,)
+                ) as pool:
+                    futures = [
+                        pool.submit(_prepare_symbol, symbol, self.config, self.strategies)
+                        for symbol in candles.symbols
+                    ]
+                    for future in futures:
+                        symbol, arrays = future.result()
+                        prepared[symbol] = arrays
+            finally:
+                candles.close()
+
+        return [
+            (symbol, name, prepared[symbol][name])
+            for symbol in frames for name in self.strategies
+        ]
+
+    def _position_size(self, balance, entry_price, stop_loss):
+        if not self.risk_manager.can_open_trade(balance):
+            return 0
+        quantity = self.risk_manager.calculate_position_size(balance, entry_price, stop_loss)
+        return self.risk_manager.round_position_size(quantity, entry_price)
+
+    def simulate(self, streams):
+        """
+        Event-ordered trade loop over prepared streams.
+
+        Returns:
+            dict with 'trades' (TRADE_DTYPE, by entry time), 'final_balance',
+            'stats' (summary of the shared account), 'symbols' (per-symbol
+            trades / win rate / PnL), 'max_open_positions' and
+            'rejected_margin' (entries skipped for insufficient margin).
+        """
+        # Candle times as int64 ns for cheap heap keys
+        keys = [data['times'].view(np.int64) for _, _, data in streams]
+        signal_bars = [np.flatnonzero(data['signals']) for _, _, data in streams]
+        heap = []
+
+        def push_entry(s, start):
+            """Queue stream s's next entry signal at or after bar `start`."""
+            k = np.searchsorted(signal_bars[s], start)
+            if k < len(signal_bars[s]):
+                bar = int(signal_bars[s][k])
+                heapq.heappush(heap, (int(keys[s][bar]), ENTRY, s, bar))
+
+        for s in range(len(streams)):
+            push_entry(s, WARMUP_CANDLES)
+
+        balance = self.initial_balance
+        used_margin = 0.0
+        open_trades = {}  # stream -> (pnl, margin)
+        max_open = 0
+        rejected = 0
+        trades = []
+
+        while heap:
+            _, kind, s, bar = heapq.heappop(heap)
+            if kind == EXIT:
+                pnl, margin = open_trades.pop(s)
+                balance += pnl
+                used_margin -= margin
+                # No new entry on the exit bar
+                push_entry(s, bar + 1)
+                continue
+
+            symbol, name, data = streams[s]
+            engine = self.engines[name]
+            side = 'LONG' if data['signals'][bar] > 0 else 'SHORT'
+            entry_price = data['entry'][bar]
+            sl = data['stop_loss'][bar]
+            tp = data['take_profit'][bar]
+
+            quantity = self._position_size(balance, entry_price, sl)
+            if not quantity > 0:
+                push_entry(s, bar + 1)
+                continue
+            margin = entry_price * quantity / self.leverage
+            if margin > balance - used_margin:
+                rejected += 1
+                push_entry(s, bar + 1)
+                continue
+
+            exit_bar, exit_reason, exit_price = engine.find_exit(
+                side, bar, sl, tp, data['high'], data['low'], data['close'], data['times']
+            )
+            pnl, fee = engine.settle(side, entry_price, exit_price, quantity)
+            trades.append((
+                symbol, side, entry_price, exit_price, sl, tp,
+                quantity, pnl, fee, data['times'][bar], data['times'][exit_bar], exit_reason,
+                engine.strategy_label
+            ))
+
+            open_trades[s] = (pnl, margin)
+            used_margin += margin
+            max_open = max(max_open, len(open_trades))
+            heapq.heappush(heap, (int(keys[s][exit_bar]), EXIT, s, exit_bar))
+
+        trades = np.array(trades, dtype=TRADE_DTYPE)
+        trades = trades[np.argsort(trades['entry_time'], kind='stable')]
+
+        per_symbol = {}
+        for symbol in dict.fromkeys(symbol for symbol, _, _ in streams):
+            pnl = trades['pnl'][trades['symbol'] == symbol]
+            per_symbol[symbol] = {
+                'total_trades': len(pnl),
+                'win_rate': (int((pnl > 0).sum()) / len(pnl) * 100) if len(pnl) > 0 else 0.0,
+                'total_pnl': float(pnl.sum()),
+            }
+
+        print(f"Portfolio backtest complete. {len(trades)} trades across {len(per_symbol)} symbols, "
+              f"final balance {balance:.2f}.")
+        return {
+            'trades': trades,
+            'final_balance': balance,
+            'stats': summarize(trades, self.initial_balance, balance),
+            'symbols': per_symbol,
+            'max_open_positions': max_open,
+            'rejected_margin': rejected,
+        }
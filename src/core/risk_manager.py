@@ -34,6 +34,17 @@ class RiskManager:
         position_size = risk_amount / price_diff
         return position_size
 
+    def round_position_size(self, position_size, entry_price):
+        """Round position size based on asset price (precision adjustment)."""
+        if entry_price > 1000:  # BTC, etc.
+            return round(position_size, 3)
+        elif entry_price > 10:  # ETH, BNB, etc.
+            return round(position_size, 2)
+        elif entry_price > 1:   # SOL, LINK, etc.
+            return round(position_size, 1)
+        else:                   # DOGE, XRP, etc.
+            return round(position_size, 0)
+
     def can_open_trade(self, account_balance):
         """
         Always returns True as per user request to remove daily limits.
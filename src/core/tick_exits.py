@@ -0,0 +1,80 @@
+"""
+Tick Exit Monitor
+=================
+Stop-loss / take-profit checks on every price tick for open trades.
+
+The SL/TP levels of open trades are held in memory (refreshed from the
+database by `sync`), so a tick only costs a dict lookup and a few
+comparisons on the WebSocket receive thread. A hit is handed to
+`on_exit` once per trade; the bot closes the trade on its own thread.
+"""
+import threading
+
+
+def exit_reason(side, price, stop_loss, take_profit):
+    """'SL Hit' / 'TP Hit' if price reaches a level of the trade, else None."""
+    if side == 'LONG':
+        if price <= stop_loss:
+            return "SL Hit"
+        if price >= take_profit:
+            return "TP Hit"
+    elif side == 'SHORT':
+        if price >= stop_loss:
+            return "SL Hit"
+        if price <= take_profit:
+            return "TP Hit"
+    return None
+
+
+class TickExitMonitor:
+    def __init__(self, on_exit):
+        """
+        Args:
+            on_exit: on_exit(trade_id, symbol, price, reason), called from
+                the tick thread when a trade's level is hit; must not block
+        """
+        self.on_exit = on_exit
+        self.levels = {}      # symbol -> {trade_id: (side, stop_loss, take_profit)}
+        self.pending = set()  # Trade ids handed to on_exit, not yet closed
+        self.lock = threading.Lock()
+
+    def sync(self, trades):
+        """
+        Replace the monitored levels with those of `trades` (open trades
+        with both SL and TP).
+
+        Returns:
+            Set of symbols with monitored trades.
+        """
+        levels = {}
+        for trade in trades:
+            if trade.stop_loss and trade.take_profit:
+                levels.setdefault(trade.symbol, {})[trade.id] = (trade.side, trade.stop_loss, trade.take_profit)
+        with self.lock:
+            self.levels = levels
+            open_ids = {trade_id for symbol_levels in levels.values() for trade_id in symbol_levels}
+            self.pending &= open_ids
+            return set(levels)
+
+    def release(self, trade_id):
+        """Re-arm a trade whose close failed, so the next tick retries."""
+        with self.lock:
+            self.pending.discard(trade_id)
+
+    def on_tick(self, symbol, bid, ask):
+        """Check a symbol's open trades against a tick (longs exit at the bid, shorts at the ask)."""
+        hits = []
+        with self.lock:
+            levels = self.levels.get(symbol)
+            if not levels:
+                return
+            for trade_id, (side, stop_loss, take_profit) in levels.items():
+                if trade_id in self.pending:
+                    continue
+                price = bid if side == 'LONG' else ask
+                reason = exit_reason(side, price, stop_loss, take_profit)
+                if reason:
+                    self.pending.add(trade_id)
+                    hits.append((trade_id, symbol, price, reason))
+        for hit in hits:
+            self.on_exit(*hit)
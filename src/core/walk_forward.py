@@ -0,0 +1,242 @@
+"""
+Walk-Forward Optimization
+=========================
+Rolling (or anchored) in-sample / out-of-sample evaluation of
+LiquidityGrab parameters.
+
+The history is cut into folds by time: a training window followed by a
+test window, with the test windows tiling the history after the first
+training window. For each fold the best combination on the training
+window (by `metric`) is run on the test window; the test results are
+stitched into one out-of-sample equity curve, each fold continuing from
+the balance the previous one ended with.
+
+Indicators and level arrays are computed once over the full history
+(optimizer.prepare_datasets) and every fold works on row slices of them.
+All of them are causal, so a slice sees exactly what the strategy would
+have seen live, with the warm-up taken from the candles before the fold.
+Per combination the signal vectors are also computed once and sliced for
+every fold. Combinations are evaluated in chunks over a
+ProcessPoolExecutor, each chunk scoring its combinations on all folds.
+"""
+from concurrent.futures import ProcessPoolExecutor
+import math
+import os
+import numpy as np
+import pandas as pd
+
+from .backtest import BacktestEngine, TRADE_DTYPE, WARMUP_CANDLES, create_strategy
+from .optimizer import (
+    PARAM_SPACE, RESULT_METRICS, grid_combinations, prepare_datasets, random_combinations, rank_by, score
+)
+from ..strategy.signals import signal_vectors
+
+
+def make_folds(start, end, train, test, anchored=False):
+    """
+    Train/test windows over [start, end) (datetime64 / timedelta64).
+    Rolling folds keep a fixed training length; anchored folds always
+    train from `start`. The last test window may be shorter.
+
+    Returns:
+        List of (train_start, train_end, test_start, test_end).
+    """
+    folds = []
+    test_start = start + train
+    while test_start < end:
+        test_end = min(test_start + test, end)
+        folds.append((start if anchored else test_start - train, test_start, test_start, test_end))
+        test_start = test_end
+    return folds
+
+
+def row_ranges(datasets, start, end):
+    """Per-symbol [lo, hi) rows with candle time in [start, end)."""
+    return {
+        symbol: (int(np.searchsorted(data['times'], start)), int(np.searchsorted(data['times'], end)))
+        for symbol, data in datasets.items()
+    }
+
+
+def combo_signals(combo, datasets, strategy):
+    """Signal vectors of one combination over each symbol's full history."""
+    for name, value in combo.items():
+        setattr(strategy, name, value)
+    tolerance = strategy.LEVEL_TOLERANCE_PERCENT
+    return {
+        symbol: signal_vectors(*strategy.signal_arrays(data['frame'], data['levels'][tolerance]))
+        for symbol, data in datasets.items()
+    }
+
+
+def run_ranges(engine, datasets, signals, ranges, balances=None):
+    """
+    Simulate every symbol on its row range of the precomputed arrays.
+    Positions still open at the end of a range close at its last price.
+
+    Returns:
+        (trades, {symbol: start balance}, {symbol: final balance}) for the
+        symbols with candles in range. Symbols start from balances[symbol]
+        (default: initial_balance).
+    """
+    results = []
+    starts = {}
+    finals = {}
+    for symbol, data in datasets.items():
+        lo, hi = ranges[symbol]
+        if hi <= lo:
+            continue
+        starts[symbol] = engine.initial_balance if balances is None else balances[symbol]
+        direction, entry, stop_loss, take_profit = signals[symbol]
+        trades, finals[symbol] = engine.simulate_signals(
+            symbol, direction[lo:hi], entry[lo:hi], stop_loss[lo:hi], take_profit[lo:hi],
+            data['high'][lo:hi], data['low'][lo:hi], data['close'][lo:hi], data['times'][lo:hi],
+            start=max(0, WARMUP_CANDLES - lo), balance=starts[symbol]
+        )
+        results.append(trades)
+    trades = np.concatenate(results) if results else np.zeros(0, dtype=TRADE_DTYPE)
+    return trades, starts, finals
+
+
+# Per-worker state set by _init_worker
+_worker = {}
+
+
+def _init_worker(datasets, train_ranges, config):
+    strategy = create_strategy('LiquidityGrab', config)
+    _worker['datasets'] = datasets
+    _worker['train_ranges'] = train_ranges
+    _worker['strategy'] = strategy
+    _worker['engine'] = BacktestEngine(None, config, strategy=strategy)
+
+
+def _evaluate_chunk(combos):
+    """Training metrics of each combination on every fold."""
+    datasets, engine = _worker['datasets'], _worker['engine']
+    rows = []
+    for combo in combos:
+        signals = combo_signals(combo, datasets, _worker['strategy'])
+        for fold, ranges in enumerate(_worker['train_ranges']):
+            trades, starts, finals = run_ranges(engine, datasets, signals, ranges)
+            rows.append({'fold': fold, **combo,
+                         **score(trades, sum(starts.values()), sum(finals.values()))})
+    return rows
+
+
+class WalkForwardOptimizer:
+    def __init__(self, config, train_days=30, test_days=7, anchored=False,
+                 max_workers=None, metric='total_pnl'):
+        """
+        Args:
+            config: Config (sizing, fees, LEVEL_LOOKBACK)
+            train_days: Training window length
+            test_days: Test window length (and step between folds)
+            anchored: Train from the start of the history instead of a
+                rolling window
+            max_workers: Process count (default: CPU count)
+            metric: Training result column that picks each fold's parameters
+        """
+        if metric not in RESULT_METRICS:
+            raise ValueError(f"Unknown metric: {metric}. Available: {', '.join(RESULT_METRICS)}")
+        self.config = config
+        self.train = np.timedelta64(int(train_days * 86_400), 's')
+        self.test = np.timedelta64(int(test_days * 86_400), 's')
+        self.anchored = anchored
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.metric = metric
+
+    def run(self, frames, combos, output_path=None):
+        """
+        Walk-forward over {symbol: candle frame}.
+
+        Returns:
+            dict with 'folds' (one row per fold: windows, chosen params,
+            training metric, test metrics; optionally written to
+            output_path as CSV), 'trades' (stitched out-of-sample trades)
+            and 'stats' (metrics of the stitched out-of-sample run).
+        """
+        if not combos:
+            raise ValueError("No parameter combinations to evaluate")
+        frames = {s: df for s, df in frames.items() if not df.empty}
+        if not frames:
+            raise ValueError("No candle data to optimize on")
+
+        tolerances = sorted({combo.get('LEVEL_TOLERANCE_PERCENT', 0.002) for combo in combos})
+        print(f"Precomputing indicators and levels for {len(frames)} symbols, {len(tolerances)} tolerances...")
+        datasets = prepare_datasets(frames, self.config, tolerances)
+
+        # History ends one candle after the last open time
+        step = min((np.diff(data['times']).min() for data in datasets.values() if len(data['times']) > 1),
+                   default=np.timedelta64(1, 'ns'))
+        start = min(data['times'][0] for data in datasets.values())
+        end = max(data['times'][-1] for data in datasets.values()) + step
+        folds = make_folds(start, end, self.train, self.test, self.anchored)
+        if not folds:
+            raise ValueError("History is shorter than one training window")
+        train_ranges = [row_ranges(datasets, lo, hi) for lo, hi, _, _ in folds]
+        test_ranges = [row_ranges(datasets, lo, hi) for _, _, lo, hi in folds]
+
+        workers = min(self.max_workers, len(combos))
+        chunk_size = max(1, math.ceil(len(combos) / (workers * 4)))
+        chunks = [combos[i:i + chunk_size] for i in range(0, len(combos), chunk_size)]
+        print(f"Evaluating {len(combos)} combinations on {len(folds)} folds with {workers} workers...")
+
+        rows = []
+        if workers == 1:
+            _init_worker(datasets, train_ranges, self.config)
+            for chunk in chunks:
+                rows.extend(_evaluate_chunk(chunk))
+        else:
+            with ProcessPoolExecutor(
+                max_workers=workers,
+                initializer=_init_worker,
+                initargs=(datasets, train_ranges, self.config)
+            ) as pool:
+                for chunk_rows in pool.map(_evaluate_chunk, chunks):
+                    rows.extend(chunk_rows)
+        training = pd.DataFrame(rows)
+
+        # Out-of-sample: each fold's best parameters, chained balances
+        strategy = create_strategy('LiquidityGrab', self.config)
+        engine = BacktestEngine(None, self.config, strategy=strategy)
+        balances = {symbol: engine.initial_balance for symbol in datasets}
+        params = list(combos[0])
+        fold_rows = []
+        stitched = []
+        for fold, (train_start, train_end, test_start, test_end) in enumerate(folds):
+            candidates = training[training['fold'] == fold]
+            best = rank_by(candidates, self.metric).iloc[0]
+            combo = {name: best[name] for name in params}
+
+            signals = combo_signals(combo, datasets, strategy)
+            trades, starts, finals = run_ranges(engine, datasets, signals, test_ranges[fold], balances)
+            balances.update(finals)
+            stitched.append(trades)
+            test = score(trades, sum(starts.values()), sum(finals.values()))
+
+            fold_rows.append({
+                'fold': fold,
+                'train_start': pd.Timestamp(train_start), 'train_end': pd.Timestamp(train_end),
+                'test_start': pd.Timestamp(test_start), 'test_end': pd.Timestamp(test_end),
+                **combo,
+                f'train_{self.metric}': best[self.metric],
+                **{f'test_{name}': test[name] for name in RESULT_METRICS},
+            })
+
+        trades = np.concatenate(stitched)
+        trades = trades[np.argsort(trades['entry_time'], kind='stable')]
+        stats = score(trades, engine.initial_balance * len(datasets), sum(balances.values()))
+        table = pd.DataFrame(fold_rows)
+
+        if output_path:
+            table.to_csv(output_path, index=False)
+            print(f"Wrote {len(table)} folds to {output_path}")
+        print(f"Walk-forward complete. Out-of-sample: {stats['total_trades']} trades, "
+              f"PnL {stats['total_pnl']:.2f}, return {stats['return_pct']:.2f}%")
+        return {'folds': table, 'trades': trades, 'stats': stats}
+
+    def grid_search(self, frames, space=None, output_path=None):
+        return self.run(frames, grid_combinations(space or PARAM_SPACE), output_path)
+
+    def random_search(self, frames, n_iter, space=None, seed=None, output_path=None):
+        return self.run(frames, random_combinations(space or PARAM_SPACE, n_iter, seed), output_path)
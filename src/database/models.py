@@ -1,3 +1,4 @@
+import json
 from datetime import datetime
 from flask_sqlalchemy import SQLAlchemy
 
@@ -50,3 +51,91 @@ class BotState(db.Model):
             'last_update': self.last_update.isoformat() if self.last_update else None,
             'active_pairs': self.active_pairs
         }
+
+class BacktestRun(db.Model):
+    __tablename__ = 'backtest_runs'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    cache_key = db.Column(db.String(64), unique=True, index=True, nullable=True) # sha256 of the run inputs (None = not cacheable)
+    strategy = db.Column(db.String(50), nullable=False)
+    params = db.Column(db.Text, nullable=True) # JSON: strategy overrides + risk/fee settings
+    symbol = db.Column(db.String(20), nullable=False)
+    interval = db.Column(db.String(10), nullable=False)
+    start_time = db.Column(db.DateTime, nullable=False)
+    end_time = db.Column(db.DateTime, nullable=False)
+    initial_balance = db.Column(db.Float, nullable=False)
+    final_balance = db.Column(db.Float, nullable=False)
+    # Summary, computed when the run is saved
+    total_trades = db.Column(db.Integer, default=0)
+    winning_trades = db.Column(db.Integer, default=0)
+    losing_trades = db.Column(db.Integer, default=0)
+    win_rate = db.Column(db.Float, default=0.0)
+    total_pnl = db.Column(db.Float, default=0.0)
+    total_fees = db.Column(db.Float, default=0.0)
+    return_pct = db.Column(db.Float, default=0.0)
+    max_drawdown_pct = db.Column(db.Float, default=0.0)
+    monte_carlo = db.Column(db.Text, nullable=True) # JSON: resampled equity path percentiles
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'cache_key': self.cache_key,
+            'strategy': self.strategy,
+            'params': json.loads(self.params) if self.params else {},
+            'symbol': self.symbol,
+            'interval': self.interval,
+            'start_time': self.start_time.isoformat() if self.start_time else None,
+            'end_time': self.end_time.isoformat() if self.end_time else None,
+            'initial_balance': self.initial_balance,
+            'final_balance': self.final_balance,
+            'stats': {
+                'total_trades': self.total_trades,
+                'winning_trades': self.winning_trades,
+                'losing_trades': self.losing_trades,
+                'win_rate': self.win_rate,
+                'total_pnl': self.total_pnl,
+                'total_fees': self.total_fees,
+                'initial_balance': self.initial_balance,
+                'final_balance': self.final_balance,
+                'return_pct': self.return_pct,
+                'max_drawdown_pct': self.max_drawdown_pct
+            },
+            'monte_carlo': json.loads(self.monte_carlo) if self.monte_carlo else None,
+            'created_at': self.created_at.isoformat() if self.created_at else None
+        }
+
+class BacktestTrade(db.Model):
+    __tablename__ = 'backtest_trades'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    run_id = db.Column(db.Integer, db.ForeignKey('backtest_runs.id'), index=True, nullable=False)
+    symbol = db.Column(db.String(20), nullable=False)
+    side = db.Column(db.String(10), nullable=False)
+    entry_price = db.Column(db.Float, nullable=False)
+    exit_price = db.Column(db.Float, nullable=True)
+    stop_loss = db.Column(db.Float, nullable=True)
+    take_profit = db.Column(db.Float, nullable=True)
+    quantity = db.Column(db.Float, nullable=False)
+    pnl = db.Column(db.Float, nullable=True)
+    fee = db.Column(db.Float, nullable=True)
+    entry_time = db.Column(db.DateTime, nullable=True)
+    exit_time = db.Column(db.DateTime, nullable=True)
+    exit_reason = db.Column(db.String(20), nullable=True)
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'symbol': self.symbol,
+            'side': self.side,
+            'entry_price': self.entry_price,
+            'exit_price': self.exit_price,
+            'stop_loss': self.stop_loss,
+            'take_profit': self.take_profit,
+            'quantity': self.quantity,
+            'pnl': self.pnl,
+            'fee': self.fee,
+            'entry_time': self.entry_time.isoformat() if self.entry_time else None,
+            'exit_time': self.exit_time.isoformat() if self.exit_time else None,
+            'exit_reason': self.exit_reason
+        }
@@ -60,6 +60,21 @@ class BinanceClient:
             print(f"Error fetching klines for {symbol}: {e}")
             return pd.DataFrame()
 
+    def get_klines_range(self, symbol, interval, start_time, end_time, limit=1500):
+        """
+        Raw klines with open time in [start_time, end_time] (ms), at most
+        `limit` rows, oldest first. Returns None on API error so callers can
+        tell a failed request from an empty range.
+        """
+        try:
+            return self.client.futures_klines(
+                symbol=symbol, interval=interval,
+                startTime=int(start_time), endTime=int(end_time), limit=limit
+            )
+        except BinanceAPIException as e:
+            print(f"Error fetching klines for {symbol}: {e}")
+            return None
+
     def get_account_balance(self, asset='USDT'):
         try:
             account = self.client.futures_account()
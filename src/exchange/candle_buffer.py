@@ -0,0 +1,129 @@
+"""
+Candle Ring Buffer
+==================
+Fixed-capacity per-symbol candle storage for the WebSocket cache.
+
+Closed candles live in preallocated arrays: int64 open times (ms) and a
+row-major float64 OHLCV matrix. Every candle is written twice, at slot i
+and i + capacity, so the most recent N candles are always one contiguous
+slice: appends are O(1) and allocation-free, and reading N candles is a
+zero-copy view (`arrays`) or a single copy into a DataFrame (`frame`).
+"""
+import numpy as np
+import pandas as pd
+
+COLUMNS = ['open', 'high', 'low', 'close', 'volume']
+
+
+class CandleBuffer:
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.timestamps = np.zeros(2 * capacity, dtype=np.int64)
+        self.values = np.zeros((2 * capacity, len(COLUMNS)), dtype=np.float64)
+        self.count = 0  # Closed candles ever appended
+
+        # In-progress candle
+        self.current_timestamp = None
+        self.current = np.zeros(len(COLUMNS), dtype=np.float64)
+
+    def __len__(self):
+        return min(self.count, self.capacity)
+
+    @property
+    def last_timestamp(self):
+        """Open time (ms) of the newest closed candle, or None."""
+        if self.count == 0:
+            return None
+        return int(self.timestamps[(self.count - 1) % self.capacity])
+
+    def append(self, timestamp, open_, high, low, close, volume):
+        """
+        Add a closed candle. A repeat of the newest candle overwrites it;
+        older candles are ignored, so replays after a reconnect are safe.
+        """
+        last = self.last_timestamp
+        if last is not None and timestamp < last:
+            return
+        if last is not None and timestamp == last:
+            self.count -= 1
+        pos = self.count % self.capacity
+        for slot in (pos, pos + self.capacity):
+            self.timestamps[slot] = timestamp
+            row = self.values[slot]
+            row[0] = open_
+            row[1] = high
+            row[2] = low
+            row[3] = close
+            row[4] = volume
+        self.count += 1
+
+    def merge(self, timestamps, values):
+        """
+        Merge closed candles (int64 ms open times, OHLCV rows) fetched
+        elsewhere into the buffer: history before it or a gap inside it.
+        Buffered candles win on equal open times, so REST data can be
+        merged while the stream is live. The newest `capacity` are kept.
+        """
+        live_times, live_values = self.arrays()
+        if len(live_times):
+            new = ~np.isin(timestamps, live_times)
+            timestamps = np.concatenate([timestamps[new], live_times])
+            values = np.concatenate([values[new], live_values])
+        order = np.argsort(timestamps, kind='stable')
+        timestamps, values = timestamps[order], values[order]
+        n = min(len(timestamps), self.capacity)
+        for offset in (0, self.capacity):
+            self.timestamps[offset:offset + n] = timestamps[len(timestamps) - n:]
+            self.values[offset:offset + n] = values[len(values) - n:]
+        self.count = n
+
+    def update_current(self, timestamp, open_, high, low, close, volume):
+        """Replace the in-progress candle."""
+        self.current_timestamp = timestamp
+        row = self.current
+        row[0] = open_
+        row[1] = high
+        row[2] = low
+        row[3] = close
+        row[4] = volume
+
+    @property
+    def current_price(self):
+        return float(self.current[3]) if self.current_timestamp is not None else None
+
+    def arrays(self, limit=None):
+        """
+        Zero-copy views (timestamps ms, OHLCV rows) of the newest `limit`
+        closed candles, oldest first. Only valid until the next append.
+        """
+        n = len(self) if limit is None else min(limit, len(self))
+        end = (self.count - 1) % self.capacity + self.capacity + 1
+        return self.timestamps[end - n:end], self.values[end - n:end]
+
+    def frame(self, limit, include_current=True):
+        """
+        DataFrame ('timestamp' + OHLCV) of the newest `limit` candles,
+        copied once out of the buffer. With include_current, the
+        in-progress candle is the last row (when newer than the last
+        closed candle) and counts towards `limit`.
+        """
+        if self.count == 0:
+            return pd.DataFrame()
+        extra = int(
+            include_current and self.current_timestamp is not None and
+            self.current_timestamp > self.last_timestamp
+        )
+        timestamps, values = self.arrays(limit - extra)
+        n = len(timestamps)
+
+        out_times = np.empty(n + extra, dtype=np.int64)
+        out_values = np.empty((n + extra, len(COLUMNS)), dtype=np.float64)
+        out_times[:n] = timestamps
+        out_values[:n] = values
+        if extra:
+            out_times[n] = self.current_timestamp
+            out_values[n] = self.current
+
+        df = pd.DataFrame(out_values, columns=COLUMNS, copy=False)
+        df.insert(0, 'timestamp', out_times.view('datetime64[ms]'))
+        return df
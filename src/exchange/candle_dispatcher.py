@@ -0,0 +1,107 @@
+"""
+Candle-Close Dispatcher
+=======================
+Runs candle-close callbacks on a bounded worker pool instead of the
+WebSocket receive thread.
+
+Each symbol has an ordered queue; at most one worker drains a symbol's
+queue at a time, so callbacks for one symbol run in candle order while
+different symbols run in parallel. Queue depth and dispatch lag (time
+from a candle close to its callback starting) are tracked for monitoring.
+"""
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+DISPATCH_WORKERS = 4
+
+
+class CandleDispatcher:
+    def __init__(self, callback, max_workers=DISPATCH_WORKERS):
+        """
+        Args:
+            callback: callback(symbol, df) for each closed candle
+            max_workers: Callbacks running at the same time
+        """
+        self.callback = callback
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='candle-close')
+        self.queues = {}     # symbol -> deque of (enqueued_at, df)
+        self.active = set()  # Symbols with a worker draining their queue
+        self.lock = threading.Lock()
+        self.running = True
+
+        # Metrics (under lock)
+        self.depth = 0
+        self.max_depth = 0
+        self.dispatched = 0
+        self.errors = 0
+        self.lag_total = 0.0
+        self.last_lag = 0.0
+        self.max_lag = 0.0
+
+    def submit(self, symbol, df):
+        """Queue a callback for a symbol; returns immediately."""
+        with self.lock:
+            if not self.running:
+                return
+            self.queues.setdefault(symbol, deque()).append((time.monotonic(), df))
+            self.depth += 1
+            self.max_depth = max(self.max_depth, self.depth)
+            if symbol in self.active:
+                return
+            self.active.add(symbol)
+        self.executor.submit(self._drain, symbol)
+
+    def _drain(self, symbol):
+        """Run a symbol's queued callbacks in order until its queue is empty."""
+        queue = self.queues[symbol]
+        while True:
+            with self.lock:
+                if not queue or not self.running:
+                    self.active.discard(symbol)
+                    return
+                enqueued_at, df = queue.popleft()
+                self.depth -= 1
+                lag = time.monotonic() - enqueued_at
+                self.dispatched += 1
+                self.lag_total += lag
+                self.last_lag = lag
+                self.max_lag = max(self.max_lag, lag)
+            try:
+                self.callback(symbol, df)
+            except Exception as e:
+                with self.lock:
+                    self.errors += 1
+                print(f"Candle-close callback error for {symbol}: {e}")
+
+    def metrics(self, reset=False):
+        """
+        Queue depth and dispatch lag (seconds). With reset, the max/avg
+        counters start over, so periodic reads cover one interval.
+        """
+        with self.lock:
+            stats = {
+                'queue_depth': self.depth,
+                'max_queue_depth': self.max_depth,
+                'queued_symbols': sorted(s for s, q in self.queues.items() if q),
+                'dispatched': self.dispatched,
+                'errors': self.errors,
+                'avg_lag': self.lag_total / self.dispatched if self.dispatched else 0.0,
+                'last_lag': self.last_lag,
+                'max_lag': self.max_lag,
+            }
+            if reset:
+                self.max_depth = self.depth
+                self.dispatched = self.errors = 0
+                self.lag_total = self.max_lag = 0.0
+            return stats
+
+    def stop(self, wait=False):
+        """Drop pending callbacks and shut the pool down."""
+        with self.lock:
+            self.running = False
+            self.depth = 0
+            for queue in self.queues.values():
+                queue.clear()
+        self.executor.shutdown(wait=wait)
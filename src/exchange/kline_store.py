@@ -0,0 +1,267 @@
+"""
+Local Kline Store
+=================
+On-disk candle history per symbol/interval, filled from the REST API.
+
+Layout (one directory per symbol/interval):
+
+    {root}/{SYMBOL}/{interval}/open_time.npy   int64, ms, sorted, unique
+                              /open.npy ... /volume.npy   float64
+                              /coverage.json   [[start_ms, end_ms], ...]
+
+Each column is a plain .npy file opened with mmap_mode='r', so reads are
+zero-copy views into the page cache. `coverage.json` records which open-time
+ranges have already been requested from the exchange (including ranges
+where the exchange had no candles), so later runs only fetch the gaps.
+Only closed candles are stored.
+"""
+import json
+import os
+import tempfile
+import threading
+import time
+import numpy as np
+import pandas as pd
+
+COLUMNS = ['open', 'high', 'low', 'close', 'volume']
+
+INTERVAL_MS = {
+    '1m': 60_000, '3m': 180_000, '5m': 300_000, '15m': 900_000, '30m': 1_800_000,
+    '1h': 3_600_000, '2h': 7_200_000, '4h': 14_400_000, '6h': 21_600_000,
+    '8h': 28_800_000, '12h': 43_200_000, '1d': 86_400_000,
+}
+
+# Binance futures klines page size
+PAGE_LIMIT = 1500
+
+# One lock per series directory, shared by every KlineStore in the process
+# (each backtest job builds its own store over the same files)
+_series_locks = {}
+_series_locks_guard = threading.Lock()
+
+
+def _series_lock(path):
+    key = os.path.abspath(path)
+    with _series_locks_guard:
+        return _series_locks.setdefault(key, threading.Lock())
+
+
+def interval_ms(interval):
+    if interval not in INTERVAL_MS:
+        raise ValueError(f"Unsupported interval: {interval}")
+    return INTERVAL_MS[interval]
+
+
+def _merge_ranges(ranges, step):
+    """Union of inclusive [start, end] open-time ranges on a `step` grid."""
+    merged = []
+    for start, end in sorted(ranges):
+        if merged and start <= merged[-1][1] + step:
+            merged[-1][1] = max(merged[-1][1], end)
+        else:
+            merged.append([start, end])
+    return merged
+
+
+def missing_ranges(coverage, start, end, step):
+    """Parts of [start, end] (open times on a `step` grid) not in coverage."""
+    gaps = []
+    cursor = start
+    for lo, hi in coverage:
+        if hi < cursor:
+            continue
+        if lo > end:
+            break
+        if lo > cursor:
+            gaps.append((cursor, min(lo - step, end)))
+        cursor = max(cursor, hi + step)
+        if cursor > end:
+            break
+    if cursor <= end:
+        gaps.append((cursor, end))
+    return gaps
+
+
+class KlineStore:
+    def __init__(self, root, exchange=None, page_limit=PAGE_LIMIT):
+        """
+        Args:
+            root: Store directory
+            exchange: Anything with get_klines_range(symbol, interval,
+                start_time, end_time, limit) returning Binance kline rows
+                (BinanceClient, or a fake in tests). None = read-only.
+            page_limit: Rows requested per REST call
+        """
+        self.root = root
+        self.exchange = exchange
+        self.page_limit = page_limit
+
+    def _dir(self, symbol, interval):
+        return os.path.join(self.root, symbol.upper(), interval)
+
+    def _read_coverage(self, path):
+        try:
+            with open(os.path.join(path, 'coverage.json')) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return []
+
+    def _read_columns(self, path):
+        """Memory-mapped columns, or None if the series is missing/inconsistent."""
+        try:
+            data = {'open_time': np.load(os.path.join(path, 'open_time.npy'), mmap_mode='r')}
+            for column in COLUMNS:
+                data[column] = np.load(os.path.join(path, f'{column}.npy'), mmap_mode='r')
+        except (OSError, ValueError):
+            return None
+        if any(len(values) != len(data['open_time']) for values in data.values()):
+            return None
+        return data
+
+    def _replace_file(self, path, name, write):
+        """Write a file under a unique temp name in path, then rename it over name."""
+        fd, tmp = tempfile.mkstemp(prefix=f'.{name}.', suffix='.tmp', dir=path)
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                write(f)
+            os.replace(tmp, os.path.join(path, name))
+        except BaseException:
+            os.unlink(tmp)
+            raise
+
+    def _write(self, path, data, coverage):
+        """Replace the series files (each written to a temp file, then renamed)."""
+        os.makedirs(path, exist_ok=True)
+        for column, values in data.items():
+            self._replace_file(path, f'{column}.npy', lambda f, values=values: np.save(f, values))
+        self._replace_file(path, 'coverage.json', lambda f: f.write(json.dumps(coverage).encode()))
+
+    def _fetch_range(self, symbol, interval, start, end, on_page=None, should_stop=None):
+        """
+        Page through [start, end] with startTime/endTime.
+        Returns (rows, covered_until); covered_until < end if a call failed
+        or should_stop() asked to stop early.
+        """
+        step = interval_ms(interval)
+        rows = []
+        cursor = start
+        while cursor <= end:
+            if should_stop is not None and should_stop():
+                return rows, cursor - step
+            page = self.exchange.get_klines_range(symbol, interval, cursor, end, limit=self.page_limit)
+            if page is None:
+                return rows, cursor - step
+            if not page:
+                break
+            rows.extend(page)
+            cursor = int(page[-1][0]) + step
+            if on_page is not None:
+                on_page(len(page))
+            if len(page) < self.page_limit:
+                break
+        return rows, end
+
+    def backfill(self, symbol, interval, start, end, progress=None, should_stop=None):
+        """
+        Fetch the parts of [start, end] (ms, open times) not fetched before.
+        Candles that have not closed yet are never stored.
+
+        Args:
+            progress: Optional callback(fetched, expected) after each page
+            should_stop: Optional callable; fetching stops (keeping what was
+                already downloaded) once it returns True
+
+        Returns:
+            Number of candles fetched.
+        """
+        if self.exchange is None:
+            return 0
+        step = interval_ms(interval)
+        start = int(start) // step * step
+        last_closed = int(time.time() * 1000) // step * step - step
+        end = min(int(end) // step * step, last_closed)
+        if end < start:
+            return 0
+
+        path = self._dir(symbol, interval)
+        with _series_lock(path):
+            coverage = self._read_coverage(path)
+            data = self._read_columns(path)
+            if data is None:
+                coverage = []
+
+            gaps = missing_ranges(coverage, start, end, step)
+            if not gaps:
+                return 0
+
+            expected = sum((gap_end - gap_start) // step + 1 for gap_start, gap_end in gaps)
+            done = [0]
+
+            def on_page(count):
+                done[0] += count
+                if progress is not None:
+                    progress(min(done[0], expected), expected)
+
+            fetched = []
+            for gap_start, gap_end in gaps:
+                rows, covered_until = self._fetch_range(
+                    symbol, interval, gap_start, gap_end, on_page, should_stop
+                )
+                fetched.extend(row for row in rows if int(row[0]) <= gap_end)
+                if covered_until >= gap_start:
+                    coverage.append([gap_start, covered_until])
+
+            new = {'open_time': np.array([int(row[0]) for row in fetched], dtype=np.int64)}
+            for i, column in enumerate(COLUMNS, start=1):
+                new[column] = np.array([float(row[i]) for row in fetched], dtype=np.float64)
+
+            if data is not None and len(data['open_time']):
+                merged = {k: np.concatenate([data[k], new[k]]) for k in new}
+            else:
+                merged = new
+            # Sort by open time, keeping the newest copy of any duplicate
+            order = np.argsort(merged['open_time'], kind='stable')[::-1]
+            _, first = np.unique(merged['open_time'][order], return_index=True)
+            keep = order[first]
+            merged = {k: np.ascontiguousarray(v[keep]) for k, v in merged.items()}
+
+            self._write(path, merged, _merge_ranges(coverage, step))
+            print(f"Kline store: fetched {len(fetched)} {symbol} {interval} candles in {len(gaps)} range(s)")
+            return len(fetched)
+
+    def covers(self, symbol, interval, start, end):
+        """True if every open time in [start, end] (ms) has been fetched."""
+        step = interval_ms(interval)
+        path = self._dir(symbol, interval)
+        if self._read_columns(path) is None:
+            return False
+        start = int(start) // step * step
+        end = int(end) // step * step
+        return not missing_ranges(self._read_coverage(path), start, end, step)
+
+    def arrays(self, symbol, interval, start=None, end=None):
+        """
+        Zero-copy views (open_time + OHLCV) of stored candles with open
+        time in [start, end] (ms); whole series if start/end are None.
+        """
+        data = self._read_columns(self._dir(symbol, interval))
+        if data is None:
+            empty = {'open_time': np.zeros(0, dtype=np.int64)}
+            empty.update({column: np.zeros(0) for column in COLUMNS})
+            return empty
+        open_time = data['open_time']
+        lo = 0 if start is None else int(np.searchsorted(open_time, start, side='left'))
+        hi = len(open_time) if end is None else int(np.searchsorted(open_time, end, side='right'))
+        return {k: v[lo:hi] for k, v in data.items()}
+
+    def get_frame(self, symbol, interval, start, end, backfill=True, progress=None, should_stop=None):
+        """
+        Candle frame for [start, end] (ms) in the get_historical_klines
+        shape ('timestamp' column + OHLCV), backfilling gaps first.
+        """
+        if backfill:
+            self.backfill(symbol, interval, start, end, progress, should_stop)
+        data = self.arrays(symbol, interval, start, end)
+        df = pd.DataFrame({column: data[column] for column in COLUMNS})
+        df.insert(0, 'timestamp', pd.to_datetime(data['open_time'], unit='ms'))
+        return df
@@ -3,28 +3,249 @@ Binance WebSocket Manager
 =========================
 Handles real-time kline (candlestick) streams from Binance Futures.
 Uses websocket-client library for reliable connections.
+
+Streams are spread over several combined-stream connections
+(/stream?streams=a/b/c), each carrying at most MAX_STREAMS_PER_CONNECTION
+streams. Symbols can be added or removed at runtime: the change is sent
+as a SUBSCRIBE / UNSUBSCRIBE frame on the affected connection, without
+reconnecting.
+
+Each connection is kept up by a supervisor loop that reconnects with
+jittered exponential backoff for as long as the manager runs. Candles
+missed while a connection was down are backfilled from REST.
 """
 import json
+import random
 import threading
 import time
-from collections import defaultdict
-from datetime import datetime
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
 import pandas as pd
 
+from .candle_buffer import COLUMNS, CandleBuffer
+from .candle_dispatcher import DISPATCH_WORKERS, CandleDispatcher
+from .kline_store import PAGE_LIMIT, interval_ms
+
 try:
-    from binance import ThreadedWebsocketManager
-    USE_BINANCE_WS = True
+    import websocket
 except ImportError:
-    USE_BINANCE_WS = False
-    try:
-        import websocket
-    except ImportError:
-        websocket = None
-        print("Warning: websocket-client not installed. WebSocket features will be disabled.")
+    websocket = None
+    print("Warning: websocket-client not installed. WebSocket features will be disabled.")
+
+# Combined-stream endpoints
+TESTNET_STREAM_URL = "wss://stream.binancefuture.com/stream"
+MAINNET_STREAM_URL = "wss://fstream.binance.com/stream"
+
+# Binance allows 1024 streams per connection; smaller shards spread the
+# message load over more receive threads
+MAX_STREAMS_PER_CONNECTION = 200
+# Binance accepts at most 10 incoming messages per second per connection
+CONTROL_MESSAGE_INTERVAL = 0.25
+
+# Tick streams for exit monitoring, by Config.TICK_EXIT_STREAM
+TICK_STREAMS = {
+    'bookTicker': '{symbol}@bookTicker',
+    'markPrice': '{symbol}@markPrice@1s',
+    'aggTrade': '{symbol}@aggTrade',
+}
+
+# Reconnect backoff (seconds): doubles per failed attempt up to the cap
+RECONNECT_BASE_DELAY = 1.0
+RECONNECT_MAX_DELAY = 60.0
+
+# REST warm-start: concurrent kline requests, and the share of the
+# 2400/min IP request weight they may use (the bot trades on the rest)
+WARM_START_WORKERS = 5
+WARM_START_WEIGHT_PER_MINUTE = 1200
+WARM_START_RETRIES = 3
+
+
+def reconnect_delay(attempt):
+    """Exponential backoff with jitter: half fixed, half random."""
+    delay = min(RECONNECT_MAX_DELAY, RECONNECT_BASE_DELAY * 2 ** attempt)
+    return delay / 2 + random.uniform(0, delay / 2)
+
+
+def kline_weight(limit):
+    """Request weight of GET /fapi/v1/klines for a page size."""
+    if limit < 100:
+        return 1
+    if limit < 500:
+        return 2
+    if limit <= 1000:
+        return 5
+    return 10
 
-# WebSocket endpoints
-TESTNET_WS_URL = "wss://stream.binancefuture.com/ws"
-MAINNET_WS_URL = "wss://fstream.binance.com/ws"
+
+class WeightLimiter:
+    """Client-side request weight budget over a sliding minute."""
+
+    def __init__(self, weight_per_minute):
+        self.weight_per_minute = weight_per_minute
+        self.spent = deque()  # (time, weight)
+        self.lock = threading.Lock()
+
+    def acquire(self, weight):
+        """Block until `weight` fits in the last minute's budget."""
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                while self.spent and now - self.spent[0][0] >= 60:
+                    self.spent.popleft()
+                if sum(w for _, w in self.spent) + weight <= self.weight_per_minute:
+                    self.spent.append((now, weight))
+                    return
+                wait = 60 - (now - self.spent[0][0])
+            time.sleep(wait)
+
+
+class StreamConnection:
+    """
+    One combined-stream WebSocket connection. `streams` is the set the
+    connection should carry; changes while connected are sent as
+    SUBSCRIBE / UNSUBSCRIBE frames, and a (re)connect subscribes to the
+    current set through the URL. on_reconnect(connection) is called when
+    a connection opens again after a drop.
+    """
+    
+    def __init__(self, name, base_url, on_message, on_reconnect=None):
+        self.name = name
+        self.base_url = base_url
+        self.on_message = on_message
+        self.on_reconnect = on_reconnect
+        self.streams = set()
+        self.subscribed = set()  # Streams requested on the current socket
+        self.lock = threading.Lock()
+        
+        self.ws = None
+        self.thread = None
+        self.running = False
+        self.stop_event = threading.Event()
+        self.connected = False
+        self.opened_at = None
+        self.connect_count = 0  # Successful opens
+        self.reconnect_count = 0  # Attempts since the last stable connection
+        self.request_id = 0
+        self.last_send = 0.0
+    
+    def _send(self, method, streams):
+        """Send a control frame, throttled to the per-connection message limit (lock held)."""
+        wait = self.last_send + CONTROL_MESSAGE_INTERVAL - time.monotonic()
+        if wait > 0:
+            time.sleep(wait)
+        self.request_id += 1
+        self.ws.send(json.dumps({'method': method, 'params': sorted(streams), 'id': self.request_id}))
+        self.last_send = time.monotonic()
+        if method == 'SUBSCRIBE':
+            self.subscribed |= streams
+        else:
+            self.subscribed -= streams
+    
+    def _sync(self):
+        """Bring the socket's subscriptions in line with `streams` (lock held)."""
+        added = self.streams - self.subscribed
+        removed = self.subscribed - self.streams
+        try:
+            if added:
+                self._send('SUBSCRIBE', added)
+            if removed:
+                self._send('UNSUBSCRIBE', removed)
+        except Exception as e:
+            # The socket is closing; the reconnect URL carries `streams`
+            print(f"WebSocket {self.name}: subscription update failed: {e}")
+    
+    def add(self, streams):
+        with self.lock:
+            self.streams |= set(streams)
+            if self.connected:
+                self._sync()
+    
+    def remove(self, streams):
+        with self.lock:
+            self.streams -= set(streams)
+            if self.connected:
+                self._sync()
+    
+    def _on_error(self, ws, error):
+        """Handle WebSocket error."""
+        print(f"WebSocket {self.name} error: {error}")
+        self.connected = False
+    
+    def _on_close(self, ws, close_status_code, close_msg):
+        """Handle WebSocket close; the supervisor loop reconnects."""
+        print(f"WebSocket {self.name} closed: {close_status_code} - {close_msg}")
+        self.connected = False
+    
+    def _on_open(self, ws):
+        """Handle WebSocket open."""
+        with self.lock:
+            print(f"✅ WebSocket {self.name} connected ({len(self.streams)} streams)")
+            self.connected = True
+            self.opened_at = time.monotonic()
+            self.connect_count += 1
+            # Streams changed during the handshake
+            self._sync()
+        if self.connect_count > 1 and self.on_reconnect:
+            self.on_reconnect(self)
+    
+    def _connect(self):
+        """Run one WebSocket connection until it closes."""
+        with self.lock:
+            self.subscribed = set(self.streams)
+            url = f"{self.base_url}?streams={'/'.join(sorted(self.subscribed))}"
+        
+        self.ws = websocket.WebSocketApp(
+            url,
+            on_message=self.on_message,
+            on_error=self._on_error,
+            on_close=self._on_close,
+            on_open=self._on_open
+        )
+        if not self.running:  # stop() ran before the socket existed
+            return
+        
+        try:
+            self.ws.run_forever()
+        except Exception as e:
+            print(f"WebSocket {self.name} error: {e}")
+        self.connected = False
+    
+    def _supervise(self):
+        """Connect, then reconnect with jittered exponential backoff until stopped."""
+        if not websocket:
+            print("Cannot connect: websocket-client library is not installed.")
+            self.running = False
+            return
+        
+        while self.running:
+            self.opened_at = None
+            self._connect()
+            if not self.running:
+                break
+            
+            # A connection that stayed up restarts the backoff
+            if self.opened_at is not None and time.monotonic() - self.opened_at >= RECONNECT_MAX_DELAY:
+                self.reconnect_count = 0
+            delay = reconnect_delay(self.reconnect_count)
+            self.reconnect_count += 1
+            print(f"Reconnecting {self.name} in {delay:.1f}s (attempt {self.reconnect_count})")
+            self.stop_event.wait(delay)
+    
+    def start(self):
+        """Start the connection in a background thread."""
+        if self.running:
+            return
+        self.running = True
+        self.stop_event.clear()
+        self.thread = threading.Thread(target=self._supervise, name=f"ws-{self.name}", daemon=True)
+        self.thread.start()
+    
+    def stop(self):
+        self.running = False
+        self.stop_event.set()
+        if self.ws:
+            self.ws.close()
 
 
 class BinanceWebSocket:
@@ -33,42 +254,98 @@ class BinanceWebSocket:
     Maintains a local cache of candle data that gets updated in real-time.
     """
     
-    def __init__(self, symbols, timeframe="1m", testnet=False, on_candle_close=None):
+    def __init__(self, symbols, timeframe="1m", testnet=False, on_candle_close=None, candle_limit=205,
+                 http_client=None, callback_workers=DISPATCH_WORKERS, on_tick=None, tick_stream='bookTicker'):
         """
         Args:
             symbols: List of trading pairs (e.g., ["BTCUSDT", "ETHUSDT"])
             timeframe: Candle interval (e.g., "1m", "5m", "15m")
             testnet: If True, connects to testnet WebSocket
-            on_candle_close: Callback function called when a candle closes
+            on_candle_close: Callback function called when a candle closes,
+                run on a worker pool (in order per symbol)
+            candle_limit: Number of candles passed to on_candle_close
+            http_client: BinanceClient used to warm-start the cache from
+                REST history on start()
+            callback_workers: Worker threads running on_candle_close
+            on_tick: on_tick(symbol, bid, ask) for every tick of the symbols
+                given to set_tick_symbols, called on the receive thread
+            tick_stream: Tick source, a TICK_STREAMS key (bookTicker gives
+                bid/ask, markPrice and aggTrade one price for both)
         """
+        if tick_stream not in TICK_STREAMS:
+            raise ValueError(f"Unknown tick stream: {tick_stream}. Available: {', '.join(TICK_STREAMS)}")
         self.symbols = [s.lower() for s in symbols]
         self.timeframe = timeframe
         self.testnet = testnet
         self.on_candle_close = on_candle_close
+        self.dispatcher = CandleDispatcher(on_candle_close, callback_workers) if on_candle_close else None
+        self.candle_limit = candle_limit
+        self.max_cached_candles = max(250, candle_limit + 45)
+        self.interval_ms = interval_ms(timeframe)
+        self.http_client = http_client
+        self.rest_limiter = WeightLimiter(WARM_START_WEIGHT_PER_MINUTE)
+        self.on_tick = on_tick
+        self.tick_stream = tick_stream
+        self.tick_symbols = set()
         
-        # Local candle cache: {symbol: DataFrame}
-        self.candle_cache = defaultdict(lambda: pd.DataFrame())
+        # Local candle cache: {symbol: CandleBuffer}, closed and current candles
+        self.candle_cache = {}
         self.cache_lock = threading.Lock()
+        # Open time (ms) of the newest closed candle handed to the dispatcher
+        self.last_dispatched = {}
         
-        # Current (incomplete) candle data
-        self.current_candles = {}
-        
-        # Connection state
-        self.ws = None
-        self.ws_thread = None
+        # Connection state: stream shards and which one carries each stream
+        self.connections = []
+        self.stream_connection = {}
+        self.streams_lock = threading.Lock()
         self.running = False
-        self.connected = False
-        self.reconnect_count = 0
-        self.max_reconnects = 10
         
-        # Use appropriate endpoint
-        self.ws_url = TESTNET_WS_URL if testnet else MAINNET_WS_URL
+        # Symbols with a REST backfill in progress
+        self.backfilling = set()
+        self.backfill_lock = threading.Lock()
         
-    def _build_stream_url(self):
-        """Build the combined stream URL for multiple symbols."""
-        streams = [f"{symbol}@kline_{self.timeframe}" for symbol in self.symbols]
-        stream_param = "/".join(streams)
-        return f"{self.ws_url}/{stream_param}"
+        # Use appropriate endpoint
+        self.stream_url = TESTNET_STREAM_URL if testnet else MAINNET_STREAM_URL
+    
+    @property
+    def connected(self):
+        return bool(self.connections) and all(c.connected for c in self.connections)
+    
+    def _symbol_streams(self, symbol):
+        """Streams followed for a symbol."""
+        return [f"{symbol.lower()}@kline_{self.timeframe}"]
+    
+    def _subscribe(self, streams):
+        """Place new streams on connections with room, opening more as needed (streams_lock held)."""
+        placed = {}
+        for stream in streams:
+            if stream in self.stream_connection:
+                continue
+            connection = next((c for c in self.connections
+                               if len(c.streams) + len(placed.get(c, ())) < MAX_STREAMS_PER_CONNECTION), None)
+            if connection is None:
+                connection = StreamConnection(f"#{len(self.connections) + 1}", self.stream_url,
+                                              self._on_message, self._on_reconnect)
+                self.connections.append(connection)
+            placed.setdefault(connection, []).append(stream)
+            self.stream_connection[stream] = connection
+        for connection, added in placed.items():
+            connection.add(added)
+            if self.running:
+                connection.start()
+    
+    def _unsubscribe(self, streams):
+        """Drop streams; connections left without streams are closed (streams_lock held)."""
+        removed = {}
+        for stream in streams:
+            connection = self.stream_connection.pop(stream, None)
+            if connection is not None:
+                removed.setdefault(connection, []).append(stream)
+        for connection, dropped in removed.items():
+            connection.remove(dropped)
+            if not connection.streams:
+                connection.stop()
+                self.connections.remove(connection)
     
     def _on_message(self, ws, message):
         """Handle incoming WebSocket message."""
@@ -79,95 +356,96 @@ class BinanceWebSocket:
             if 'data' in data:
                 data = data['data']
             
-            if 'e' not in data or data['e'] != 'kline':
+            # Reply to a SUBSCRIBE / UNSUBSCRIBE frame
+            if 'id' in data and 'e' not in data:
+                if data.get('error'):
+                    print(f"WebSocket subscription error: {data['error']}")
+                return
+            
+            event = data.get('e')
+            if event == 'bookTicker':
+                if self.on_tick:
+                    self.on_tick(data['s'], float(data['b']), float(data['a']))
+                return
+            if event in ('markPriceUpdate', 'aggTrade'):
+                if self.on_tick:
+                    price = float(data['p'])
+                    self.on_tick(data['s'], price, price)
+                return
+            if event != 'kline':
                 return
                 
             kline = data['k']
             symbol = kline['s'].upper()
             is_closed = kline['x']
             
-            # Update current candle
-            candle_data = {
-                'timestamp': pd.to_datetime(kline['t'], unit='ms'),
-                'open': float(kline['o']),
-                'high': float(kline['h']),
-                'low': float(kline['l']),
-                'close': float(kline['c']),
-                'volume': float(kline['v']),
-            }
+            candle = (
+                int(kline['t']),
+                float(kline['o']),
+                float(kline['h']),
+                float(kline['l']),
+                float(kline['c']),
+                float(kline['v']),
+            )
             
-            self.current_candles[symbol] = candle_data
-            
-            # If candle is closed, add to cache and trigger callback
-            if is_closed:
-                with self.cache_lock:
-                    df = self.candle_cache[symbol]
-                    new_row = pd.DataFrame([candle_data])
-                    
-                    if df.empty:
-                        self.candle_cache[symbol] = new_row
-                    else:
-                        # Append and keep only last 250 candles
-                        self.candle_cache[symbol] = pd.concat([df, new_row], ignore_index=True).tail(250)
+            with self.cache_lock:
+                buffer = self.candle_cache.get(symbol)
+                if buffer is None:
+                    buffer = self.candle_cache[symbol] = CandleBuffer(self.max_cached_candles)
+                buffer.update_current(*candle)
                 
-                # Trigger callback for strategy analysis
-                if self.on_candle_close:
-                    self.on_candle_close(symbol, self.get_candles(symbol))
+                gap = False
+                if is_closed:
+                    last = buffer.last_timestamp
+                    gap = last is not None and candle[0] > last + self.interval_ms
+                    buffer.append(*candle)
+                    
+                    # If candle is closed, queue callback for strategy analysis;
+                    # the frame is taken now so later messages don't change it
+                    if not gap and self.dispatcher:
+                        self.last_dispatched[symbol] = candle[0]
+                        self.dispatcher.submit(symbol, buffer.frame(self.candle_limit))
+            
+            # Candles are missing before this one: fill them from REST and
+            # skip analysis on the incomplete frame (the backfill queues it)
+            if gap:
+                print(f"⚠️ {symbol}: candles missing before {pd.to_datetime(candle[0], unit='ms')}, backfilling")
+                self._schedule_backfill([symbol])
                     
         except Exception as e:
             print(f"WebSocket message error: {e}")
     
-    def _on_error(self, ws, error):
-        """Handle WebSocket error."""
-        print(f"WebSocket error: {error}")
-        self.connected = False
-    
-    def _on_close(self, ws, close_status_code, close_msg):
-        """Handle WebSocket close."""
-        print(f"WebSocket closed: {close_status_code} - {close_msg}")
-        self.connected = False
-        
-        # Auto-reconnect if still running
-        if self.running and self.reconnect_count < self.max_reconnects:
-            self.reconnect_count += 1
-            print(f"Reconnecting... (attempt {self.reconnect_count}/{self.max_reconnects})")
-            time.sleep(5)  # Wait before reconnecting
-            self._connect()
-    
-    def _on_open(self, ws):
-        """Handle WebSocket open."""
-        print(f"✅ WebSocket connected to Binance {'Testnet' if self.testnet else 'Mainnet'}")
-        print(f"📡 Streaming {len(self.symbols)} symbols on {self.timeframe} timeframe")
-        self.connected = True
-        self.reconnect_count = 0
-    
-    def _connect(self):
-        """Establish WebSocket connection."""
-        if not websocket:
-            print("Cannot connect: websocket-client library is not installed.")
-            self.running = False
+    def set_tick_symbols(self, symbols):
+        """
+        Stream ticks (tick_stream) for exactly these symbols, e.g. those
+        with open trades: new ones are subscribed, dropped ones
+        unsubscribed.
+        """
+        if not self.on_tick:
             return
-
-        url = self._build_stream_url()
-        
-        self.ws = websocket.WebSocketApp(
-            url,
-            on_message=self._on_message,
-            on_error=self._on_error,
-            on_close=self._on_close,
-            on_open=self._on_open
-        )
-        
-        self.ws.run_forever()
+        symbols = {s.lower() for s in symbols}
+        template = TICK_STREAMS[self.tick_stream]
+        with self.streams_lock:
+            added = symbols - self.tick_symbols
+            removed = self.tick_symbols - symbols
+            self.tick_symbols = symbols
+            self._unsubscribe([template.format(symbol=symbol) for symbol in sorted(removed)])
+            self._subscribe([template.format(symbol=symbol) for symbol in sorted(added)])
+        if added or removed:
+            print(f"🎯 Tick exits: watching {len(symbols)} symbol(s)"
+                  + (f", +{', '.join(sorted(s.upper() for s in added))}" if added else "")
+                  + (f", -{', '.join(sorted(s.upper() for s in removed))}" if removed else ""))
     
     def start(self):
-        """Start WebSocket connection in background thread."""
+        """Start the stream connections in background threads."""
         if self.running:
             return
             
         self.running = True
-        self.ws_thread = threading.Thread(target=self._connect, daemon=True)
-        self.ws_thread.start()
+        with self.streams_lock:
+            self._subscribe([stream for symbol in self.symbols for stream in self._symbol_streams(symbol)])
+        print(f"📡 Streaming {len(self.symbols)} symbols on {self.timeframe} timeframe "
+              f"over {len(self.connections)} connection(s) to Binance {'Testnet' if self.testnet else 'Mainnet'}")
         
         # Wait for connection
         timeout = 10
@@ -177,12 +455,246 @@ class BinanceWebSocket:
         
         if not self.connected:
             print("⚠️ WebSocket connection timeout - will retry in background")
+        
+        # Seed history once the stream is live, so the first streamed
+        # candles continue where the REST history ends
+        if self.http_client:
+            self.warm_start()
+    
+    def add_symbols(self, symbols):
+        """
+        Follow more symbols without reconnecting: their streams are
+        subscribed on connections with room (new connections if needed),
+        then their caches are warm-started from REST.
+        
+        Returns:
+            Symbols that were added.
+        """
+        with self.streams_lock:
+            added = [s.lower() for s in dict.fromkeys(symbols) if s.lower() not in self.symbols]
+            self.symbols.extend(added)
+            self._subscribe([stream for symbol in added for stream in self._symbol_streams(symbol)])
+        if added and self.running and self.http_client:
+            self.warm_start(added)
+        return [s.upper() for s in added]
+    
+    def remove_symbols(self, symbols):
+        """
+        Stop following symbols: their kline and tick streams are
+        unsubscribed and their cached candles dropped.
+        
+        Returns:
+            Symbols that were removed.
+        """
+        with self.streams_lock:
+            removed = [s.lower() for s in dict.fromkeys(symbols) if s.lower() in self.symbols]
+            self.symbols = [s for s in self.symbols if s not in removed]
+            self._unsubscribe([stream for symbol in removed for stream in self._symbol_streams(symbol)])
+            ticking = [symbol for symbol in removed if symbol in self.tick_symbols]
+            self.tick_symbols -= set(ticking)
+            if ticking:
+                template = TICK_STREAMS[self.tick_stream]
+                self._unsubscribe([template.format(symbol=symbol) for symbol in ticking])
+        with self.cache_lock:
+            for symbol in removed:
+                self.candle_cache.pop(symbol.upper(), None)
+                self.last_dispatched.pop(symbol.upper(), None)
+        return [s.upper() for s in removed]
+    
+    def _request(self, weight, fetch, ok):
+        """REST call within the weight budget, retried with backoff; None if every attempt failed."""
+        for attempt in range(WARM_START_RETRIES):
+            if attempt:
+                time.sleep(2 ** attempt)
+            self.rest_limiter.acquire(weight)
+            result = fetch()
+            if ok(result):
+                return result
+        return None
+    
+    def _fetch_history(self, symbol):
+        """
+        The newest closed candles for a symbol from REST, as (open times
+        ms, OHLCV rows), or None if every attempt failed.
+        """
+        limit = self.max_cached_candles + 1  # The newest kline is still forming
+        df = self._request(
+            kline_weight(limit),
+            lambda: self.http_client.get_historical_klines(symbol, self.timeframe, limit),
+            lambda df: not df.empty
+        )
+        if df is None:
+            return None
+        
+        timestamps = df['timestamp'].values.astype('datetime64[ms]').astype(np.int64)
+        closed = timestamps + self.interval_ms <= int(time.time() * 1000)
+        return timestamps[closed], df[COLUMNS].to_numpy(dtype=np.float64)[closed]
+    
+    def _fetch_missing(self, symbol):
+        """
+        Closed candles from the first one missing in the symbol's cache
+        (the first hole, or after the newest candle) up to now, at most a
+        cache's worth, paged from REST; None if a request failed.
+        """
+        with self.cache_lock:
+            buffer = self.candle_cache.get(symbol)
+            if buffer is None or not len(buffer):
+                first_missing = None
+            else:
+                timestamps, _ = buffer.arrays()
+                holes = np.flatnonzero(np.diff(timestamps) != self.interval_ms)
+                first_missing = int(timestamps[holes[0] if len(holes) else -1]) + self.interval_ms
+        if first_missing is None:
+            return self._fetch_history(symbol)
+        
+        step = self.interval_ms
+        now = int(time.time() * 1000)
+        cursor = max(first_missing, now // step * step - self.max_cached_candles * step)
+        klines = []
+        while cursor + step <= now:
+            limit = min(PAGE_LIMIT, (now - cursor) // step + 1)
+            page = self._request(
+                kline_weight(limit),
+                lambda: self.http_client.get_klines_range(symbol, self.timeframe, cursor, now, limit=limit),
+                lambda page: page is not None
+            )
+            if page is None:
+                return None
+            klines.extend(page)
+            if len(page) < limit:
+                break
+            cursor = int(page[-1][0]) + step
+        
+        timestamps = np.array([int(k[0]) for k in klines], dtype=np.int64)
+        values = np.array([[float(x) for x in k[1:6]] for k in klines], dtype=np.float64).reshape(-1, len(COLUMNS))
+        closed = timestamps + step <= now
+        return timestamps[closed], values[closed]
+    
+    def _fill(self, symbols, fetch, max_workers):
+        """
+        Fetch candles for symbols concurrently and merge them into the
+        caches; streamed candles win over REST data.
+        
+        Returns:
+            {symbol: candles merged} for the symbols whose fetch succeeded.
+        """
+        filled = {}
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='kline-fill') as pool:
+            for symbol, history in zip(symbols, pool.map(fetch, symbols)):
+                if history is None:
+                    continue
+                with self.cache_lock:
+                    buffer = self.candle_cache.get(symbol)
+                    if buffer is None:
+                        buffer = self.candle_cache[symbol] = CandleBuffer(self.max_cached_candles)
+                    buffer.merge(*history)
+                    timestamps, _ = buffer.arrays()
+                    gaps = int(np.count_nonzero(np.diff(timestamps) != self.interval_ms))
+                if gaps:
+                    print(f"⚠️ {symbol}: {gaps} gap(s) left in cached candles")
+                filled[symbol] = len(history[0])
+        return filled
+    
+    def warm_start(self, symbols=None, max_workers=WARM_START_WORKERS):
+        """
+        Seed symbols' caches (default: all followed symbols) with REST
+        history, fetched concurrently within the request weight budget.
+        Candles already streamed are kept, so the live stream continues
+        the history without gaps or duplicates.
+        
+        Returns:
+            Number of symbols seeded.
+        """
+        symbols = [s.upper() for s in (self.symbols if symbols is None else symbols)]
+        started = time.time()
+        seeded = self._fill(symbols, self._fetch_history, max_workers)
+        with self.cache_lock:
+            # REST history counts as seen: only candles closing from now on
+            # (or missed later) are analyzed
+            for symbol in seeded:
+                self.last_dispatched.setdefault(symbol, self.candle_cache[symbol].last_timestamp)
+        for symbol in symbols:
+            if symbol not in seeded:
+                print(f"⚠️ Warm-start failed for {symbol}, waiting for streamed candles")
+        print(f"🔥 Warm-started {len(seeded)}/{len(symbols)} symbols from REST in {time.time() - started:.1f}s")
+        return len(seeded)
+    
+    def backfill(self, symbols, max_workers=WARM_START_WORKERS):
+        """
+        Fetch the candles each symbol's cache is missing (e.g. closed
+        while disconnected) from REST and merge them into the cache, then
+        queue the newest closed candle if it was never analyzed.
+        
+        Returns:
+            {symbol: candles fetched} for the symbols backfilled.
+        """
+        symbols = [s.upper() for s in symbols]
+        filled = self._fill(symbols, self._fetch_missing, max_workers)
+        missing = sum(filled.values())
+        failed = [s for s in symbols if s not in filled]
+        print(f"🩹 Backfilled {missing} candle(s) for {len(filled)} symbol(s)"
+              + (f", failed: {', '.join(failed)}" if failed else ""))
+        for symbol in filled:
+            self._dispatch_missed(symbol)
+        return filled
+    
+    def _dispatch_missed(self, symbol):
+        """
+        Queue the newest closed candle for analysis if it never was: its
+        close was skipped on a gap, or it closed while disconnected. Only
+        once the frame handed to the callback has no holes left.
+        """
+        if not self.dispatcher:
+            return
+        with self.cache_lock:
+            buffer = self.candle_cache.get(symbol)
+            dispatched = self.last_dispatched.get(symbol)
+            if buffer is None or dispatched is None or buffer.last_timestamp <= dispatched:
+                return
+            timestamps, _ = buffer.arrays(self.candle_limit)
+            if np.any(np.diff(timestamps) != self.interval_ms):
+                return
+            self.last_dispatched[symbol] = buffer.last_timestamp
+            self.dispatcher.submit(symbol, buffer.frame(self.candle_limit, include_current=False))
+    
+    def _schedule_backfill(self, symbols):
+        """Backfill symbols on a background thread (once per symbol at a time)."""
+        if not self.http_client:
+            return
+        with self.backfill_lock:
+            symbols = [s for s in symbols if s not in self.backfilling]
+            self.backfilling.update(symbols)
+        if not symbols:
+            return
+        
+        def run():
+            try:
+                self.backfill(symbols)
+            except Exception as e:
+                print(f"Backfill error: {e}")
+            finally:
+                with self.backfill_lock:
+                    self.backfilling.difference_update(symbols)
+        
+        threading.Thread(target=run, name='kline-backfill', daemon=True).start()
+    
+    def _on_reconnect(self, connection):
+        """A connection came back: backfill the candles its symbols missed."""
+        with connection.lock:
+            symbols = {stream.split('@')[0] for stream in connection.streams if '@kline_' in stream}
+        self._schedule_backfill(sorted(s.upper() for s in symbols))
     
     def stop(self):
-        """Stop WebSocket connection."""
+        """Stop WebSocket connections."""
         self.running = False
-        if self.ws:
-            self.ws.close()
+        for connection in self.connections:
+            connection.stop()
+        if self.dispatcher:
+            self.dispatcher.stop()
+    
+    def dispatch_metrics(self, reset=False):
+        """Candle-close queue depth and dispatch lag (see CandleDispatcher.metrics)."""
+        return self.dispatcher.metrics(reset) if self.dispatcher else None
     
     def get_candles(self, symbol, limit=205):
         """
@@ -192,31 +704,26 @@ class BinanceWebSocket:
         symbol = symbol.upper()
         
         with self.cache_lock:
-            df = self.candle_cache.get(symbol, pd.DataFrame())
-            
-            if df.empty:
+            buffer = self.candle_cache.get(symbol)
+            if buffer is None:
                 return pd.DataFrame()
             
-            # Include current (incomplete) candle if available
-            if symbol in self.current_candles:
-                current = pd.DataFrame([self.current_candles[symbol]])
-                df = pd.concat([df, current], ignore_index=True)
-            
-            return df.tail(limit).copy()
+            # Includes the current (incomplete) candle if it is newer
+            return buffer.frame(limit)
     
     def is_ready(self, symbol):
         """Check if we have enough cached data for a symbol."""
         symbol = symbol.upper()
         with self.cache_lock:
-            df = self.candle_cache.get(symbol, pd.DataFrame())
-            return len(df) >= 200
+            buffer = self.candle_cache.get(symbol)
+            return buffer is not None and len(buffer) >= 200
     
     def get_current_price(self, symbol):
         """Get the latest price for a symbol."""
         symbol = symbol.upper()
-        if symbol in self.current_candles:
-            return self.current_candles[symbol]['close']
-        return None
+        with self.cache_lock:
+            buffer = self.candle_cache.get(symbol)
+            return buffer.current_price if buffer is not None else None
 
 
 class WebSocketDataProvider:
@@ -16,15 +16,20 @@ Exit Logic:
 """
 import pandas as pd
 import numpy as np
-from ..utils.indicators import calculate_indicators
+from ..utils.indicator_registry import resolve_indicators
+from ..utils.level_index import LevelIndex, window_touch_counts
+from .signals import MIN_CANDLES, col, warmed_up, signal_frame
 
 class LiquidityGrabStrategy:
-    def __init__(self, risk_manager):
+    # Indicator columns read by analyze()
+    INDICATORS = ('atr', 'vol_ma')
+    
+    def __init__(self, risk_manager, level_lookback=50):
         self.risk_manager = risk_manager
         self.name = "LiquidityGrab"
         
         # Configuration
-        self.LEVEL_LOOKBACK = 50
+        self.LEVEL_LOOKBACK = level_lookback  # 500+ is fine: level search is O(n log n)
         self.LEVEL_TOLERANCE_PERCENT = 0.002  # 0.2% tolerance
         self.MIN_TOUCHES = 2
         self.SWEEP_THRESHOLD_ATR = 0.3
@@ -33,6 +38,7 @@ class LiquidityGrabStrategy:
         
         # State tracking
         self.last_sweep_candle = {}  # {symbol: candle_index}
+        self.level_indexes = {}  # {symbol: LevelIndex}
         
     def _find_key_levels(self, df):
         """
@@ -47,25 +53,38 @@ class LiquidityGrabStrategy:
         tolerance = avg_price * self.LEVEL_TOLERANCE_PERCENT
         
         # Find resistance levels (clustered highs)
-        resistance_levels = []
         sorted_highs = np.unique(np.round(highs, 2))
-        
-        for level in sorted_highs:
-            touches = np.sum(np.abs(highs - level) <= tolerance)
-            if touches >= self.MIN_TOUCHES:
-                resistance_levels.append(level)
+        touches = window_touch_counts(highs[None, :], sorted_highs[None, :], [tolerance])[0]
+        resistance_levels = list(sorted_highs[touches >= self.MIN_TOUCHES])
         
         # Find support levels (clustered lows)
-        support_levels = []
         sorted_lows = np.unique(np.round(lows, 2))
-        
-        for level in sorted_lows:
-            touches = np.sum(np.abs(lows - level) <= tolerance)
-            if touches >= self.MIN_TOUCHES:
-                support_levels.append(level)
+        touches = window_touch_counts(lows[None, :], sorted_lows[None, :], [tolerance])[0]
+        support_levels = list(sorted_lows[touches >= self.MIN_TOUCHES])
         
         return support_levels, resistance_levels
     
+    def _get_level_index(self, symbol):
+        index = self.level_indexes.get(symbol)
+        if index is None:
+            index = LevelIndex(
+                lookback=self.LEVEL_LOOKBACK,
+                tolerance_pct=self.LEVEL_TOLERANCE_PERCENT,
+                min_touches=self.MIN_TOUCHES
+            )
+            self.level_indexes[symbol] = index
+        return index
+    
+    def get_levels(self, symbol):
+        """
+        Current (support_levels, resistance_levels) for a symbol from its
+        level index, as of the last analyzed candle. Empty if not tracked yet.
+        """
+        index = self.level_indexes.get(symbol)
+        if index is None:
+            return [], []
+        return index.levels('support'), index.levels('resistance')
+    
     def _detect_liquidity_sweep_bullish(self, curr, prev, support_level, atr):
         """
         Detect bullish liquidity sweep.
@@ -132,19 +151,32 @@ class LiquidityGrabStrategy:
         if len(df) < 200:
             return 'NONE', 0, 0, 0
         
-        df = calculate_indicators(df)
+        df = resolve_indicators(df, self.INDICATORS)
         curr = df.iloc[-1]
         prev = df.iloc[-2]
         
-        # Find key support/resistance levels
-        support_levels, resistance_levels = self._find_key_levels(df)
-        
-        if not support_levels and not resistance_levels:
-            return 'NONE', 0, 0, 0
-        
-        # Find nearest levels to current price
-        nearest_support = self._find_nearest_level(curr['close'], support_levels)
-        nearest_resistance = self._find_nearest_level(curr['close'], resistance_levels)
+        # Find key support/resistance levels: per-symbol index when the
+        # frame is timestamped, full rescan otherwise
+        if symbol != 'UNKNOWN' and isinstance(df.index, pd.DatetimeIndex):
+            index = self._get_level_index(symbol)
+            index.sync(df)
+            if not index.has_levels():
+                return 'NONE', 0, 0, 0
+            nearest_support = index.nearest('support', curr['close'])
+            nearest_resistance = index.nearest('resistance', curr['close'])
+            lowest_resistance = index.lowest('resistance')
+            highest_support = index.highest('support')
+        else:
+            support_levels, resistance_levels = self._find_key_levels(df)
+            
+            if not support_levels and not resistance_levels:
+                return 'NONE', 0, 0, 0
+            
+            # Find nearest levels to current price
+            nearest_support = self._find_nearest_level(curr['close'], support_levels)
+            nearest_resistance = self._find_nearest_level(curr['close'], resistance_levels)
+            lowest_resistance = min(resistance_levels) if resistance_levels else None
+            highest_support = max(support_levels) if support_levels else None
         
         signal = 'NONE'
         
@@ -165,8 +197,8 @@ class LiquidityGrabStrategy:
                 stop_loss = curr['low'] - (curr['atr'] * 0.3)
                 
                 # Target: Previous high (opposite side of range)
-                if resistance_levels:
-                    take_profit = min(resistance_levels)
+                if lowest_resistance is not None:
+                    take_profit = lowest_resistance
                 else:
                     # Fallback: 2R minimum
                     sl_distance = entry_price - stop_loss
@@ -196,8 +228,8 @@ class LiquidityGrabStrategy:
                 stop_loss = curr['high'] + (curr['atr'] * 0.3)
                 
                 # Target: Previous low (opposite side of range)
-                if support_levels:
-                    take_profit = max(support_levels)
+                if highest_support is not None:
+                    take_profit = highest_support
                 else:
                     # Fallback: 2R minimum
                     sl_distance = stop_loss - entry_price
@@ -211,3 +243,122 @@ class LiquidityGrabStrategy:
                 return signal, entry_price, stop_loss, take_profit
         
         return 'NONE', 0, 0, 0
+    
+    def _level_arrays(self, df, chunk_cells=2_000_000):
+        """
+        Per-row nearest support/resistance, lowest resistance and highest
+        support (NaN when missing), i.e. _find_key_levels + _find_nearest_level
+        evaluated for every row over sliding windows, in row chunks. Rows
+        before the first full window use all the candles they have, as
+        analyze() does on a frame shorter than LEVEL_LOOKBACK.
+        """
+        n = len(df)
+        lookback = self.LEVEL_LOOKBACK
+        arrays = {name: np.full(n, np.nan) for name in (
+            'nearest_support', 'nearest_resistance', 'lowest_resistance', 'highest_support'
+        )}
+        first = MIN_CANDLES - 1
+        if first >= n:
+            return arrays
+        
+        closes = col(df, 'close')
+        full = max(first, lookback - 1)  # First row with a full window
+        
+        for side, column in (('support', 'low'), ('resistance', 'high')):
+            values = col(df, column)
+            
+            # Growing windows: values[:i + 1]
+            for i in range(first, min(full, n)):
+                rows = slice(i, i + 1)
+                tol = [closes[:i + 1].mean() * self.LEVEL_TOLERANCE_PERCENT]
+                self._fill_levels(arrays, side, rows, values[None, :i + 1], tol, closes[rows])
+            if full >= n:
+                continue
+            
+            # Full windows: the last `lookback` values
+            windows = np.lib.stride_tricks.sliding_window_view(values, lookback)
+            tolerance = np.lib.stride_tricks.sliding_window_view(closes, lookback).mean(axis=1) * self.LEVEL_TOLERANCE_PERCENT
+            chunk = max(1, chunk_cells // lookback)
+            for start in range(full, n, chunk):
+                rows = slice(start, min(start + chunk, n))
+                win = windows[rows.start - lookback + 1:rows.stop - lookback + 1]
+                tol = tolerance[rows.start - lookback + 1:rows.stop - lookback + 1]
+                self._fill_levels(arrays, side, rows, win, tol, closes[rows])
+        return arrays
+    
+    def _fill_levels(self, arrays, side, rows, win, tol, price):
+        """Levels of one side for a block of rows (one window per row)."""
+        candidates = np.round(win, 2)
+        touches = window_touch_counts(win, candidates, tol)
+        is_level = touches >= self.MIN_TOUCHES
+        
+        distance = np.where(is_level, np.abs(candidates - price[:, None]), np.inf)
+        closest = distance == distance.min(axis=1, keepdims=True)
+        nearest = np.where(is_level & closest, candidates, np.inf).min(axis=1)
+        
+        found = is_level.any(axis=1)
+        arrays[f'nearest_{side}'][rows] = np.where(found, nearest, np.nan)
+        if side == 'support':
+            highest = np.where(is_level, candidates, -np.inf).max(axis=1)
+            arrays['highest_support'][rows] = np.where(found, highest, np.nan)
+        else:
+            lowest = np.where(is_level, candidates, np.inf).min(axis=1)
+            arrays['lowest_resistance'][rows] = np.where(found, lowest, np.nan)
+    
+    def generate_signals(self, df: pd.DataFrame):
+        """
+        Evaluate every candle in one pass.
+        
+        Returns:
+            DataFrame (signal, entry_price, stop_loss, take_profit) per row,
+            equal to analyze() on the frame truncated at that row.
+        """
+        df = resolve_indicators(df.copy(), self.INDICATORS)
+        return signal_frame(df.index, *self.signal_arrays(df, self._level_arrays(df)))
+    
+    def signal_arrays(self, df, levels):
+        """
+        Per-row masks and exits from an indicator frame and precomputed
+        _level_arrays(): (long_mask, short_mask, entry, long_sl, long_tp,
+        short_sl, short_tp). Levels only depend on LEVEL_LOOKBACK,
+        LEVEL_TOLERANCE_PERCENT and MIN_TOUCHES, so they can be reused while
+        the other parameters change.
+        """
+        o, h, l, c = col(df, 'open'), col(df, 'high'), col(df, 'low'), col(df, 'close')
+        atr, volume, vol_ma = col(df, 'atr'), col(df, 'volume'), col(df, 'vol_ma')
+        support = levels['nearest_support']
+        resistance = levels['nearest_resistance']
+        
+        sweep_threshold = atr * self.SWEEP_THRESHOLD_ATR
+        candle_range = h - l
+        has_volume_spike = volume > vol_ma * self.VOLUME_SURGE_MULTIPLIER
+        
+        # ===== LONG: Bullish Liquidity Sweep =====
+        long_mask = (
+            ~np.isnan(support) &
+            (l < support - sweep_threshold) &
+            (c > support) &
+            (c > o) &
+            ((c - l) > candle_range * 0.7) &
+            has_volume_spike
+        )
+        long_sl = l - atr * 0.3
+        long_min_tp = c + (c - long_sl) * self.MIN_RR_RATIO
+        long_tp = np.fmax(levels['lowest_resistance'], long_min_tp)
+        
+        # ===== SHORT: Bearish Liquidity Sweep =====
+        short_mask = (
+            ~np.isnan(resistance) &
+            (h > resistance + sweep_threshold) &
+            (c < resistance) &
+            (c < o) &
+            ((h - c) > candle_range * 0.7) &
+            has_volume_spike
+        )
+        short_sl = h + atr * 0.3
+        short_min_tp = c - (short_sl - c) * self.MIN_RR_RATIO
+        short_tp = np.fmin(levels['highest_support'], short_min_tp)
+        
+        active = warmed_up(len(df))
+        return (long_mask & active, short_mask & active, c,
+                long_sl, long_tp, short_sl, short_tp)
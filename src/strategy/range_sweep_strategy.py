@@ -13,9 +13,13 @@ Rules:
 """
 import pandas as pd
 import numpy as np
-from ..utils.indicators import calculate_indicators
+from ..utils.indicator_registry import resolve_indicators
+from .signals import col, warmed_up, signal_frame
 
 class RangeSweepStrategy:
+    # Indicator columns read by analyze()
+    INDICATORS = ('atr',)
+    
     def __init__(self, risk_manager):
         self.risk_manager = risk_manager
         
@@ -87,7 +91,7 @@ class RangeSweepStrategy:
         if len(df) < 200:
             return 'NONE', 0, 0, 0
         
-        df = calculate_indicators(df)
+        df = resolve_indicators(df, self.INDICATORS)
         curr = df.iloc[-1]
         prev = df.iloc[-2]
         atr = curr['atr']
@@ -120,3 +124,58 @@ class RangeSweepStrategy:
             return signal, entry_price, stop_loss, take_profit
         
         return 'NONE', 0, 0, 0
+    
+    def _range_level_arrays(self, values, tolerance, descending):
+        """
+        Vectorized _find_range_levels for one side: per row, the first of
+        the 10 most extreme window values with >= MIN_TOUCHES equal values.
+        """
+        n = len(values)
+        level = np.full(n, np.nan)
+        if n < self.RANGE_LOOKBACK:
+            return level
+        
+        windows = np.lib.stride_tricks.sliding_window_view(values, self.RANGE_LOOKBACK)
+        ordered = np.sort(windows, axis=1)
+        ordered = ordered[:, ::-1][:, :10] if descending else ordered[:, :10]
+        
+        tol = tolerance[self.RANGE_LOOKBACK - 1:, None, None]
+        touches = (np.abs(windows[:, None, :] - ordered[:, :, None]) < tol).sum(axis=2)
+        qualifies = touches >= self.MIN_TOUCHES
+        first = qualifies.argmax(axis=1)
+        found = qualifies.any(axis=1)
+        rows = np.arange(len(ordered))
+        level[self.RANGE_LOOKBACK - 1:] = np.where(found, ordered[rows, first], np.nan)
+        return level
+    
+    def generate_signals(self, df: pd.DataFrame):
+        """
+        Evaluate every candle in one pass.
+        
+        Returns:
+            DataFrame (signal, entry_price, stop_loss, take_profit) per row,
+            equal to analyze() on the frame truncated at that row.
+        """
+        df = resolve_indicators(df.copy(), self.INDICATORS)
+        o, h, l, c = col(df, 'open'), col(df, 'high'), col(df, 'low'), col(df, 'close')
+        atr = col(df, 'atr')
+        
+        tolerance = c * self.EQUAL_LEVEL_TOLERANCE
+        resistance = self._range_level_arrays(h, tolerance, descending=True)
+        support = self._range_level_arrays(l, tolerance, descending=False)
+        valid_range = (resistance - support) >= self.MIN_RANGE_ATR * atr
+        sweep_threshold = atr * self.SWEEP_THRESHOLD_ATR
+        active = warmed_up(len(df)) & valid_range
+        
+        # ===== SHORT: Sweep of resistance (fake breakout up) =====
+        short_mask = active & (h > resistance + sweep_threshold) & (c < resistance) & (c < o)
+        short_sl = h + atr * 0.2
+        short_tp = c - (short_sl - c) * self.TP_RR_RATIO
+        
+        # ===== LONG: Sweep of support (fake breakout down) =====
+        long_mask = active & ~short_mask & (l < support - sweep_threshold) & (c > support) & (c > o)
+        long_sl = l - atr * 0.2
+        long_tp = c + (c - long_sl) * self.TP_RR_RATIO
+        
+        return signal_frame(df.index, long_mask, short_mask, c,
+                            long_sl, long_tp, short_sl, short_tp)
@@ -1,7 +1,15 @@
 import pandas as pd
-from ..utils.indicators import calculate_indicators
+import numpy as np
+from ..utils.indicator_registry import resolve_indicators
+from .signals import col, prev, warmed_up, signal_frame
 
 class ScalpingStrategy:
+    # Indicator columns read by analyze()
+    INDICATORS = (
+        'ema_fast', 'ema_slow', 'ema_trend', 'vwap', 'rsi', 'vol_ma', 'atr',
+        'atr_percentile', 'volume_strength',
+    )
+    
     def __init__(self, risk_manager):
         self.risk_manager = risk_manager
         
@@ -37,7 +45,7 @@ class ScalpingStrategy:
         if symbol and symbol in self.SYMBOL_BLACKLIST:
             return 'NONE', 0, 0, 0
 
-        df = calculate_indicators(df)
+        df = resolve_indicators(df, self.INDICATORS)
         last_row = df.iloc[-1]
         prev_row = df.iloc[-2]
         
@@ -121,3 +129,55 @@ class ScalpingStrategy:
             return signal, entry_price, stop_loss, take_profit
 
         return 'NONE', 0, 0, 0
+
+    def generate_signals(self, df: pd.DataFrame, symbol=None):
+        """
+        Evaluate every candle in one pass.
+
+        Returns:
+            DataFrame (signal, entry_price, stop_loss, take_profit) per row,
+            equal to analyze() on the frame truncated at that row.
+        """
+        df = resolve_indicators(df.copy(), self.INDICATORS)
+        c, volume = col(df, 'close'), col(df, 'volume')
+        ema_fast, ema_slow, ema_trend = col(df, 'ema_fast'), col(df, 'ema_slow'), col(df, 'ema_trend')
+        vwap, rsi, vol_ma, atr = col(df, 'vwap'), col(df, 'rsi'), col(df, 'vol_ma'), col(df, 'atr')
+
+        active = warmed_up(len(df))
+        if symbol and symbol in self.SYMBOL_BLACKLIST:
+            active[:] = False
+
+        # Regime filters (NaN passes, as in analyze)
+        active &= ~(col(df, 'atr_percentile') < self.MIN_ATR_PERCENTILE)
+        active &= ~(col(df, 'volume_strength') < self.MIN_VOLUME_STRENGTH)
+
+        # LONG: pullback entry in an uptrend
+        long_trend = (c > ema_trend) & (c > vwap) & (ema_fast > ema_slow) & (volume > vol_ma)
+        ema_gap_pct = (ema_fast - ema_slow) / ema_slow
+        recent_high = df['high'].rolling(window=10, min_periods=1).max().to_numpy()
+        pullback_pct = (recent_high - c) / recent_high
+        price_near_ema = np.abs(c - ema_fast) / c
+        long_mask = (
+            long_trend &
+            ~(rsi < 55) &
+            ~(ema_gap_pct < 0.002) &
+            (pullback_pct >= 0.003) &
+            (price_near_ema < 0.004) &
+            (volume > vol_ma * 1.3)
+        )
+
+        # SHORT: crossover entry in a downtrend (only if the LONG trend test failed)
+        prev_fast, prev_slow, prev_close = prev(ema_fast), prev(ema_slow), prev(c)
+        cross_down = (prev_fast >= prev_slow) & (ema_fast < ema_slow)
+        price_cross_down = (prev_close >= prev_fast) & (c < ema_fast)
+        short_mask = (
+            ~long_trend &
+            (c < ema_trend) & (c < vwap) & (ema_fast < ema_slow) &
+            (rsi < 50) & (volume > vol_ma) &
+            (cross_down | price_cross_down)
+        )
+
+        sl_dist = atr * self.risk_manager.sl_multiplier
+        tp_rr = 2.0
+        return signal_frame(df.index, long_mask & active, short_mask & active, c,
+                            c - sl_dist, c + sl_dist * tp_rr, c + sl_dist, c - sl_dist * tp_rr)
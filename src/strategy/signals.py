@@ -0,0 +1,72 @@
+"""
+Helpers for whole-history (vectorized) signal generation.
+
+Every strategy's `generate_signals(df)` returns a frame with one row per
+candle and the same four values `analyze()` would return if it were called
+with the frame truncated at that candle:
+
+    signal ('LONG' / 'SHORT' / 'NONE'), entry_price, stop_loss, take_profit
+"""
+import numpy as np
+import pandas as pd
+
+SIGNAL_COLUMNS = ['signal', 'entry_price', 'stop_loss', 'take_profit']
+
+# analyze() returns NONE until the frame has this many candles
+MIN_CANDLES = 200
+
+
+def warmed_up(length):
+    """Mask of rows where analyze() would see at least MIN_CANDLES candles."""
+    return np.arange(length) >= MIN_CANDLES - 1
+
+
+def col(df, name):
+    return df[name].to_numpy(dtype=float)
+
+
+def prev(values):
+    """Previous row's value (NaN for the first row)."""
+    out = np.empty_like(values)
+    out[0] = np.nan
+    out[1:] = values[:-1]
+    return out
+
+
+def signal_vectors(long_mask, short_mask, entry,
+                   long_sl, long_tp, short_sl, short_tp):
+    """
+    Combine per-side masks and levels into (direction, entry_price,
+    stop_loss, take_profit) arrays; direction is 1 = LONG, -1 = SHORT,
+    0 = none. LONG wins if both masks are set.
+    """
+    short_mask = short_mask & ~long_mask
+    direction = np.zeros(len(long_mask), dtype=np.int8)
+    direction[long_mask] = 1
+    direction[short_mask] = -1
+
+    any_signal = long_mask | short_mask
+    return (
+        direction,
+        np.where(any_signal, entry, 0.0),
+        np.where(long_mask, long_sl, np.where(short_mask, short_sl, 0.0)),
+        np.where(long_mask, long_tp, np.where(short_mask, short_tp, 0.0)),
+    )
+
+
+def signal_frame(index, long_mask, short_mask, entry,
+                 long_sl, long_tp, short_sl, short_tp):
+    """Assemble the generate_signals() output; LONG wins if both masks are set."""
+    direction, entry, stop_loss, take_profit = signal_vectors(
+        long_mask, short_mask, entry, long_sl, long_tp, short_sl, short_tp
+    )
+    signal = np.full(len(index), 'NONE', dtype=object)
+    signal[direction == 1] = 'LONG'
+    signal[direction == -1] = 'SHORT'
+
+    return pd.DataFrame({
+        'signal': signal,
+        'entry_price': entry,
+        'stop_loss': stop_loss,
+        'take_profit': take_profit,
+    }, index=index)
@@ -1,5 +1,7 @@
 import pandas as pd
-from ..utils.indicators import calculate_indicators
+import numpy as np
+from ..utils.indicator_registry import resolve_indicators
+from .signals import col, prev, warmed_up, signal_frame
 from datetime import datetime, timedelta
 
 class SmartScalpingStrategy:
@@ -12,6 +14,12 @@ class SmartScalpingStrategy:
     3. Trade Frequency Controls - Max trades per symbol/day with cooldown
     """
     
+    # Indicator columns read by analyze()
+    INDICATORS = (
+        'ema_fast', 'ema_slow', 'ema_trend', 'vwap', 'rsi', 'vol_ma', 'atr',
+        'atr_percentile', 'ema_compression', 'volume_strength',
+    )
+    
     def __init__(self, risk_manager):
         self.risk_manager = risk_manager
         self.trade_counts = {}  # {symbol: {date: count}}
@@ -106,7 +114,7 @@ class SmartScalpingStrategy:
         if len(df) < 200:
             return 'NONE', 0, 0, 0
 
-        df = calculate_indicators(df)
+        df = resolve_indicators(df, self.INDICATORS)
         last_row = df.iloc[-1]
         prev_row = df.iloc[-2]
         
@@ -191,3 +199,51 @@ class SmartScalpingStrategy:
             return signal, entry_price, stop_loss, take_profit
 
         return 'NONE', 0, 0, 0
+
+    def generate_signals(self, df: pd.DataFrame):
+        """
+        Evaluate every candle in one pass.
+
+        Returns:
+            DataFrame (signal, entry_price, stop_loss, take_profit) per row,
+            equal to analyze() on the frame truncated at that row.
+        """
+        df = resolve_indicators(df.copy(), self.INDICATORS)
+        c, volume = col(df, 'close'), col(df, 'volume')
+        ema_fast, ema_slow, ema_trend = col(df, 'ema_fast'), col(df, 'ema_slow'), col(df, 'ema_trend')
+        vwap, rsi, vol_ma, atr = col(df, 'vwap'), col(df, 'rsi'), col(df, 'vol_ma'), col(df, 'atr')
+        atr_percentile = col(df, 'atr_percentile')
+        prev_close, prev_fast, prev_vwap = prev(c), prev(ema_fast), prev(vwap)
+
+        # Market Regime Filter (NaN passes, as in _check_market_regime)
+        active = warmed_up(len(df))
+        active &= ~(atr_percentile < self.MIN_ATR_PERCENTILE)
+        active &= ~(col(df, 'ema_compression') < self.MIN_EMA_COMPRESSION)
+        active &= ~(col(df, 'volume_strength') < self.MIN_VOLUME_STRENGTH)
+
+        price_near_ema = np.abs(c - ema_fast) / atr < 0.3
+        rsi_band = (rsi > 35) & (rsi < 65)
+
+        # LONG Condition
+        long_base = (
+            (c > ema_trend) & (ema_fast > ema_slow) & (c > vwap) &
+            rsi_band & (rsi > 50) & (volume > vol_ma)
+        )
+        price_bouncing = (prev_close < prev_fast) & (c >= ema_fast)
+        vwap_reclaim = (prev_close < prev_vwap) & (c > vwap)
+        long_mask = long_base & (price_bouncing | (price_near_ema & vwap_reclaim))
+
+        # SHORT Condition (only if the LONG conditions failed)
+        short_base = (
+            (c < ema_trend) & (ema_fast < ema_slow) & (c < vwap) &
+            rsi_band & (rsi < 50) & (volume > vol_ma)
+        )
+        price_bouncing = (prev_close > prev_fast) & (c <= ema_fast)
+        vwap_rejection = (prev_close > prev_vwap) & (c < vwap)
+        short_mask = ~long_base & short_base & (price_bouncing | (price_near_ema & vwap_rejection))
+
+        sl_dist = np.maximum(atr * self.risk_manager.sl_multiplier, c * 0.005)
+        rr_multiplier = np.where(atr_percentile > 60, 1.5, 2.0)
+        return signal_frame(df.index, long_mask & active, short_mask & active, c,
+                            c - sl_dist, c + sl_dist * rr_multiplier,
+                            c + sl_dist, c - sl_dist * rr_multiplier)
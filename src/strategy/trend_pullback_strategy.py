@@ -13,9 +13,14 @@ Rules:
 7. Take Profit: 2R
 """
 import pandas as pd
-from ..utils.indicators import calculate_indicators
+import numpy as np
+from ..utils.indicator_registry import resolve_indicators
+from .signals import col, prev, warmed_up, signal_frame
 
 class TrendPullbackStrategy:
+    # Indicator columns read by analyze()
+    INDICATORS = ('ema_20', 'ema_50', 'ema_trend', 'rsi', 'atr')
+    
     def __init__(self, risk_manager):
         self.risk_manager = risk_manager
         
@@ -90,7 +95,7 @@ class TrendPullbackStrategy:
         if len(df) < 200:
             return 'NONE', 0, 0, 0
         
-        df = calculate_indicators(df)
+        df = resolve_indicators(df, self.INDICATORS)
         curr = df.iloc[-1]
         prev = df.iloc[-2]
         atr = curr['atr']
@@ -149,3 +154,53 @@ class TrendPullbackStrategy:
             return signal, entry_price, stop_loss, take_profit
         
         return 'NONE', 0, 0, 0
+    
+    def generate_signals(self, df: pd.DataFrame):
+        """
+        Evaluate every candle in one pass.
+        
+        Returns:
+            DataFrame (signal, entry_price, stop_loss, take_profit) per row,
+            equal to analyze() on the frame truncated at that row.
+        """
+        df = resolve_indicators(df.copy(), self.INDICATORS)
+        o, h, l, c = col(df, 'open'), col(df, 'high'), col(df, 'low'), col(df, 'close')
+        prev_o, prev_c = prev(o), prev(c)
+        atr, rsi = col(df, 'atr'), col(df, 'rsi')
+        ema_20, ema_50, ema_trend = col(df, 'ema_20'), col(df, 'ema_50'), col(df, 'ema_trend')
+        tolerance = atr * self.PULLBACK_TOLERANCE_ATR
+        
+        body = np.abs(c - o)
+        lower_wick = np.minimum(o, c) - l
+        upper_wick = h - np.maximum(o, c)
+        has_range = (h - l) != 0
+        
+        # ===== BULLISH TREND PULLBACK =====
+        near_ema = (np.abs(l - ema_20) < tolerance) | (np.abs(l - ema_50) < tolerance)
+        bullish_engulfing = (prev_c < prev_o) & (c > o) & (c > prev_o) & (o < prev_c)
+        bullish_rejection = has_range & (c > o) & (lower_wick > body * 2) & (upper_wick < body)
+        long_mask = (
+            (ema_50 > ema_trend) & near_ema &
+            (rsi >= 40) & (rsi <= 50) &
+            (bullish_engulfing | bullish_rejection)
+        )
+        
+        # ===== BEARISH TREND PULLBACK =====
+        near_ema = (np.abs(h - ema_20) < tolerance) | (np.abs(h - ema_50) < tolerance)
+        bearish_engulfing = (prev_c > prev_o) & (c < o) & (c < prev_o) & (o > prev_c)
+        bearish_rejection = has_range & (c < o) & (upper_wick > body * 2) & (lower_wick < body)
+        short_mask = (
+            (ema_50 < ema_trend) & near_ema &
+            (rsi >= 50) & (rsi <= 60) &
+            (bearish_engulfing | bearish_rejection)
+        )
+        
+        # ===== CALCULATE RISK PARAMETERS =====
+        long_sl = df['low'].rolling(window=5, min_periods=1).min().to_numpy() - atr * 0.2
+        long_tp = c + (c - long_sl) * self.TP_RR_RATIO
+        short_sl = df['high'].rolling(window=5, min_periods=1).max().to_numpy() + atr * 0.2
+        short_tp = c - (short_sl - c) * self.TP_RR_RATIO
+        
+        active = warmed_up(len(df))
+        return signal_frame(df.index, long_mask & active, short_mask & active, c,
+                            long_sl, long_tp, short_sl, short_tp)
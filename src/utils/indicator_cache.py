@@ -0,0 +1,73 @@
+"""
+Indicator Frame Cache
+=====================
+LRU cache of computed indicator frames keyed by
+(symbol, timeframe, last closed candle timestamp).
+
+A closed candle's indicators never change, so every strategy and every
+repeated poll for the same candle can share one frame.
+"""
+from collections import OrderedDict
+import threading
+
+
+class IndicatorCache:
+    def __init__(self, max_entries=256):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(symbol, timeframe, df):
+        """
+        Key for a frame of closed candles (last row = last closed candle).
+        The row count is included so a short warm-up frame is never served
+        in place of a full lookback ending on the same candle.
+        """
+        if 'timestamp' in df.columns:
+            last_timestamp = df['timestamp'].iloc[-1]
+        else:
+            last_timestamp = df.index[-1]
+        return (symbol.upper(), timeframe, last_timestamp, len(df))
+
+    def get(self, key):
+        with self.lock:
+            frame = self.entries.get(key)
+            if frame is None:
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return frame
+
+    def put(self, key, frame):
+        with self.lock:
+            self.entries[key] = frame
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def get_or_compute(self, key, compute):
+        """Return the cached frame for key, computing and storing it on a miss."""
+        frame = self.get(key)
+        if frame is None:
+            frame = compute()
+            self.put(key, frame)
+        return frame
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+    def stats(self):
+        with self.lock:
+            total = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': (self.hits / total * 100) if total > 0 else 0.0,
+                'size': len(self.entries),
+                'max_entries': self.max_entries
+            }
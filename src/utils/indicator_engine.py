@@ -0,0 +1,317 @@
+"""
+Streaming Indicator Engine
+==========================
+Keeps per-symbol indicator state and advances it one candle at a time, so a
+candle close costs O(1) work instead of re-running `calculate_indicators`
+over the whole lookback.
+
+Values match the batch functions in `indicators.py` applied to the full
+series the engine has seen since it was seeded (EMA/ATR/RSI recursions and
+VWAP are anchored at the first seeded candle, exactly like the batch path).
+This is a deliberate change from recomputing each 205-candle frame: long
+recursions (EMA200, VWAP, ATR) no longer restart at the frame's first
+candle, so live values follow the full streamed history.
+
+Committed rows live in a preallocated ring buffer per symbol (same layout
+as CandleBuffer), so returning a frame is one slice + copy out of the
+buffer rather than a DataFrame built from per-row dicts.
+"""
+from collections import deque
+import math
+import threading
+import numpy as np
+import pandas as pd
+
+from .indicators import INDICATOR_COLUMNS, RollingPercentileRank
+
+EMA_LENGTHS = {
+    'ema_fast': 9,
+    'ema_slow': 21,
+    'ema_trend': 200,
+    'ema_20': 20,
+    'ema_50': 50,
+}
+RSI_LENGTH = 14
+ATR_LENGTH = 14
+VOL_MA_LENGTH = 20
+VOL_MA_SLOW_LENGTH = 50
+ATR_PERCENTILE_LOOKBACK = 100
+
+OHLCV_COLUMNS = ['open', 'high', 'low', 'close', 'volume']
+FRAME_COLUMNS = OHLCV_COLUMNS + INDICATOR_COLUMNS
+NAN = float('nan')
+
+
+class _RollingMean:
+    """Fixed-window running mean (NaN until the window is full)."""
+
+    def __init__(self, length):
+        self.length = length
+        self.window = deque()
+        self.total = 0.0
+
+    def value_with(self, x):
+        """Mean the window would have after appending x (no mutation)."""
+        n = len(self.window) + 1
+        total = self.total + x
+        if n > self.length:
+            total -= self.window[0]
+            n = self.length
+        return total / n if n == self.length else NAN
+
+    def push(self, x):
+        self.window.append(x)
+        self.total += x
+        if len(self.window) > self.length:
+            self.total -= self.window.popleft()
+
+
+class IndicatorState:
+    """
+    Incremental equivalent of `calculate_indicators` for a single symbol.
+
+    `update()` commits a closed candle and returns its indicator row.
+    `peek()` returns the provisional row for an in-progress candle without
+    touching the committed state.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.prev_close = None
+        self.ema = {name: None for name in EMA_LENGTHS}
+        self.avg_gain = None
+        self.avg_loss = None
+        self.atr = None
+        self.cum_tp_vol = 0.0
+        self.cum_vol = 0.0
+        self.vol_ma = _RollingMean(VOL_MA_LENGTH)
+        self.vol_ma_slow = _RollingMean(VOL_MA_SLOW_LENGTH)
+        self.atr_rank = RollingPercentileRank(ATR_PERCENTILE_LOOKBACK)
+
+    def _step(self, candle):
+        """Compute the next state and indicator row without committing."""
+        high = float(candle['high'])
+        low = float(candle['low'])
+        close = float(candle['close'])
+        volume = float(candle['volume'])
+        first = self.prev_close is None
+
+        # EMA (adjust=False): seeded with the first close
+        ema = {}
+        for name, length in EMA_LENGTHS.items():
+            alpha = 2 / (length + 1)
+            prev = self.ema[name]
+            ema[name] = close if prev is None else prev + alpha * (close - prev)
+
+        # RSI (Wilder smoothing, first diff counts as zero gain/loss)
+        delta = 0.0 if first else close - self.prev_close
+        gain = delta if delta > 0 else 0.0
+        loss = -delta if delta < 0 else 0.0
+        alpha = 1 / RSI_LENGTH
+        if first:
+            avg_gain, avg_loss = gain, loss
+        else:
+            avg_gain = self.avg_gain + alpha * (gain - self.avg_gain)
+            avg_loss = self.avg_loss + alpha * (loss - self.avg_loss)
+        rsi = _rsi_from_averages(avg_gain, avg_loss) if self.count + 1 >= RSI_LENGTH else NAN
+
+        # ATR (EMA of true range, span=14)
+        if first:
+            true_range = high - low
+        else:
+            true_range = max(high - low, abs(high - self.prev_close), abs(low - self.prev_close))
+        alpha = 2 / (ATR_LENGTH + 1)
+        atr = true_range if self.atr is None else self.atr + alpha * (true_range - self.atr)
+
+        # VWAP (cumulative since seed)
+        cum_tp_vol = self.cum_tp_vol + (high + low + close) / 3 * volume
+        cum_vol = self.cum_vol + volume
+        vwap = _safe_ratio(cum_tp_vol, cum_vol, math.inf)
+
+        vol_ma = self.vol_ma.value_with(volume)
+        vol_ma_slow = self.vol_ma_slow.value_with(volume)
+
+        row = {
+            'ema_fast': ema['ema_fast'],
+            'ema_slow': ema['ema_slow'],
+            'ema_trend': ema['ema_trend'],
+            'ema_20': ema['ema_20'],
+            'ema_50': ema['ema_50'],
+            'vwap': vwap,
+            'rsi': rsi,
+            'vol_ma': vol_ma,
+            'vol_ma_slow': vol_ma_slow,
+            'atr': atr,
+            'atr_percentile': self.atr_rank.peek(atr),
+            'ema_compression': _safe_ratio(abs(ema['ema_fast'] - ema['ema_slow']), atr, 0.0),
+            'volume_strength': _safe_ratio(vol_ma, vol_ma_slow, 1.0),
+        }
+        state = (close, ema, avg_gain, avg_loss, atr, cum_tp_vol, cum_vol, volume)
+        return state, row
+
+    def update(self, candle):
+        """Commit a closed candle and return its indicator row."""
+        state, row = self._step(candle)
+        close, ema, avg_gain, avg_loss, atr, cum_tp_vol, cum_vol, volume = state
+        self.prev_close = close
+        self.ema = ema
+        self.avg_gain = avg_gain
+        self.avg_loss = avg_loss
+        self.atr = atr
+        self.cum_tp_vol = cum_tp_vol
+        self.cum_vol = cum_vol
+        self.vol_ma.push(volume)
+        self.vol_ma_slow.push(volume)
+        self.atr_rank.push(atr)
+        self.count += 1
+        return row
+
+    def peek(self, candle):
+        """Indicator row for an in-progress candle (state is not modified)."""
+        return self._step(candle)[1]
+
+
+def _rsi_from_averages(avg_gain, avg_loss):
+    """Mirror pandas float semantics of 100 - 100 / (1 + gain / loss)."""
+    if avg_loss == 0:
+        return NAN if avg_gain == 0 else 100.0
+    return 100 - (100 / (1 + avg_gain / avg_loss))
+
+
+def _safe_ratio(numerator, denominator, inf_value):
+    """Division with the same NaN/inf replacement as the batch helpers."""
+    if math.isnan(numerator) or math.isnan(denominator):
+        return NAN
+    if denominator == 0:
+        return NAN if numerator == 0 else inf_value
+    return numerator / denominator
+
+
+class _RowBuffer:
+    """
+    Committed candles + indicator rows (FRAME_COLUMNS) of one symbol in
+    preallocated arrays. Like CandleBuffer, every row is written at slot i
+    and i + capacity, so the newest rows are always one contiguous slice.
+    """
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.timestamps = np.zeros(2 * capacity, dtype=np.int64)
+        self.values = np.zeros((2 * capacity, len(FRAME_COLUMNS)), dtype=np.float64)
+        self.count = 0
+
+    def append(self, timestamp, values):
+        pos = self.count % self.capacity
+        for slot in (pos, pos + self.capacity):
+            self.timestamps[slot] = timestamp
+            self.values[slot] = values
+        self.count += 1
+
+    def arrays(self):
+        """Views (timestamps ns, rows) of the buffered rows, oldest first."""
+        n = min(self.count, self.capacity)
+        end = (self.count - 1) % self.capacity + self.capacity + 1
+        return self.timestamps[end - n:end], self.values[end - n:end]
+
+
+def _row_values(candle, row):
+    return [candle[c] for c in OHLCV_COLUMNS] + [row[c] for c in INDICATOR_COLUMNS]
+
+
+class IndicatorEngine:
+    """
+    Per-symbol streaming indicators with a bounded row history.
+
+    `compute(symbol, df)` is the drop-in replacement for
+    `calculate_indicators(df)` in the bot: only candles newer than the last
+    committed one are processed, and the returned frame has the same shape
+    (timestamp index, OHLCV + indicator columns).
+    """
+
+    def __init__(self, history=500):
+        self.history = history
+        self.states = {}
+        self.rows = {}
+        self.first_timestamp = {}
+        self.last_timestamp = {}
+        self.lock = threading.Lock()
+
+    def reset(self, symbol):
+        self.states.pop(symbol, None)
+        self.rows.pop(symbol, None)
+        self.first_timestamp.pop(symbol, None)
+        self.last_timestamp.pop(symbol, None)
+
+    def _commit(self, symbol, timestamp, candle):
+        row = self.states[symbol].update(candle)
+        self.rows[symbol].append(timestamp, _row_values(candle, row))
+        self.last_timestamp[symbol] = pd.Timestamp(timestamp)
+
+    def compute(self, symbol, df, closed=True):
+        """
+        Advance the symbol's state with the new candles in df and return an
+        indicator frame covering the same candles.
+
+        Args:
+            symbol: Trading pair
+            df: Candle frame with a 'timestamp' column (or DatetimeIndex),
+                oldest first
+            closed: False if the last row is the in-progress candle; it is
+                then evaluated provisionally and not committed.
+        """
+        if df.empty:
+            return df
+
+        timestamps = df['timestamp'] if 'timestamp' in df.columns else df.index
+        timestamps = np.asarray(timestamps, dtype='datetime64[ns]').view(np.int64)
+        values = df[OHLCV_COLUMNS].to_numpy(dtype=np.float64)
+        # Keep the last row of a repeated timestamp
+        keep = np.append(timestamps[1:] != timestamps[:-1], True)
+        if not keep.all():
+            timestamps, values = timestamps[keep], values[keep]
+
+        closed_count = len(timestamps) if closed else len(timestamps) - 1
+        with self.lock:
+            return self._compute(symbol, timestamps, values, closed, closed_count)
+
+    def _compute(self, symbol, timestamps, values, closed, closed_count):
+        last = self.last_timestamp.get(symbol)
+        pos = 0 if last is None else int(np.searchsorted(timestamps[:closed_count], last.value))
+
+        # Reseed on first sight, when the frame does not contain the last
+        # committed candle (gap after a disconnect), or when it reaches
+        # further back than the current seed (more warm-up history).
+        if (
+            last is None or
+            pos == closed_count or timestamps[pos] != last.value or
+            timestamps[0] < self.first_timestamp[symbol].value
+        ):
+            self.reset(symbol)
+            self.states[symbol] = IndicatorState()
+            self.rows[symbol] = _RowBuffer(self.history)
+            self.first_timestamp[symbol] = pd.Timestamp(timestamps[0])
+            start = 0
+        else:
+            start = pos + 1
+
+        for i in range(start, closed_count):
+            self._commit(symbol, timestamps[i], dict(zip(OHLCV_COLUMNS, values[i])))
+
+        # Committed rows from the frame's first candle on (the newest is `last`)
+        row_times, row_values = self.rows[symbol].arrays()
+        lo = int(np.searchsorted(row_times, timestamps[0]))
+        n = len(row_times) - lo
+        extra = 0 if closed else 1
+        out_times = np.empty(n + extra, dtype=np.int64)
+        out_values = np.empty((n + extra, len(FRAME_COLUMNS)), dtype=np.float64)
+        out_times[:n] = row_times[lo:]
+        out_values[:n] = row_values[lo:]
+        if not closed:
+            candle = dict(zip(OHLCV_COLUMNS, values[-1]))
+            out_times[n] = timestamps[-1]
+            out_values[n] = _row_values(candle, self.states[symbol].peek(candle))
+
+        return pd.DataFrame(
+            out_values, columns=FRAME_COLUMNS, copy=False,
+            index=pd.DatetimeIndex(out_times.view('datetime64[ns]'), name='timestamp'),
+        )
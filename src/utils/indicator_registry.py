@@ -0,0 +1,136 @@
+"""
+Indicator Registry
+==================
+Declarative indicator definitions with dependency resolution.
+
+Strategies declare the columns they read in an `INDICATORS` class attribute
+and call `resolve_indicators(df, self.INDICATORS)`; only those columns (plus
+whatever they depend on) are computed. Columns already present on the frame
+are reused, so the frame itself is the per-frame memo: a frame from the
+streaming engine, or one already resolved by another strategy, costs nothing.
+"""
+import pandas as pd
+
+from .indicators import (
+    ema, sma, rsi, vwap, atr, atr_percentile, ema_compression, volume_strength
+)
+
+# name -> (dependencies, function(df) -> Series)
+INDICATOR_REGISTRY = {}
+
+
+def register_indicator(name, depends=()):
+    """Decorator registering an indicator column and the columns it reads."""
+    def decorator(func):
+        INDICATOR_REGISTRY[name] = (tuple(depends), func)
+        return func
+    return decorator
+
+
+@register_indicator('ema_fast')
+def _ema_fast(df):
+    return ema(df['close'], length=9)
+
+
+@register_indicator('ema_slow')
+def _ema_slow(df):
+    return ema(df['close'], length=21)
+
+
+@register_indicator('ema_trend')
+def _ema_trend(df):
+    return ema(df['close'], length=200)
+
+
+@register_indicator('ema_20')
+def _ema_20(df):
+    return ema(df['close'], length=20)
+
+
+@register_indicator('ema_50')
+def _ema_50(df):
+    return ema(df['close'], length=50)
+
+
+@register_indicator('vwap')
+def _vwap(df):
+    return vwap(df['high'], df['low'], df['close'], df['volume'])
+
+
+@register_indicator('rsi')
+def _rsi(df):
+    return rsi(df['close'], length=14)
+
+
+@register_indicator('vol_ma')
+def _vol_ma(df):
+    return sma(df['volume'], length=20)
+
+
+@register_indicator('vol_ma_slow')
+def _vol_ma_slow(df):
+    return sma(df['volume'], length=50)
+
+
+@register_indicator('atr')
+def _atr(df):
+    return atr(df['high'], df['low'], df['close'], length=14)
+
+
+@register_indicator('atr_percentile', depends=('atr',))
+def _atr_percentile(df):
+    return atr_percentile(df['atr'], lookback=100)
+
+
+@register_indicator('ema_compression', depends=('ema_fast', 'ema_slow', 'atr'))
+def _ema_compression(df):
+    return ema_compression(df['ema_fast'], df['ema_slow'], df['atr'])
+
+
+@register_indicator('volume_strength', depends=('vol_ma', 'vol_ma_slow'))
+def _volume_strength(df):
+    return volume_strength(df['volume'], df['vol_ma'], df['vol_ma_slow'])
+
+
+def resolve_order(names):
+    """Dependency-ordered list of indicator names needed for `names`."""
+    order = []
+    visiting = set()
+
+    def visit(name):
+        if name in order:
+            return
+        if name not in INDICATOR_REGISTRY:
+            raise KeyError(f"Unknown indicator: {name}")
+        if name in visiting:
+            raise ValueError(f"Circular indicator dependency at: {name}")
+        visiting.add(name)
+        for dep in INDICATOR_REGISTRY[name][0]:
+            visit(dep)
+        visiting.discard(name)
+        order.append(name)
+
+    for name in names:
+        visit(name)
+    return order
+
+
+def resolve_indicators(df: pd.DataFrame, names) -> pd.DataFrame:
+    """
+    Add the requested indicator columns (and their dependencies) to df,
+    skipping any that are already present.
+    """
+    if df.empty:
+        return df
+
+    missing = [name for name in resolve_order(names) if name not in df.columns]
+    if not missing:
+        return df
+
+    # Same index convention as calculate_indicators
+    if not isinstance(df.index, pd.DatetimeIndex) and 'timestamp' in df.columns:
+        df.set_index('timestamp', inplace=True)
+
+    for name in missing:
+        df[name] = INDICATOR_REGISTRY[name][1](df)
+    return df
@@ -1,6 +1,16 @@
+from bisect import bisect_left, insort
+from collections import deque
+import math
 import pandas as pd
 import numpy as np
 
+# Columns added by calculate_indicators (in order)
+INDICATOR_COLUMNS = [
+    'ema_fast', 'ema_slow', 'ema_trend', 'ema_20', 'ema_50',
+    'vwap', 'rsi', 'vol_ma', 'vol_ma_slow', 'atr',
+    'atr_percentile', 'ema_compression', 'volume_strength',
+]
+
 def ema(series: pd.Series, length: int) -> pd.Series:
     """Calculate Exponential Moving Average."""
     return series.ewm(span=length, adjust=False).mean()
@@ -37,10 +47,79 @@ def atr(high: pd.Series, low: pd.Series, close: pd.Series, length: int = 14) ->
     true_range = pd.concat([tr1, tr2, tr3], axis=1).max(axis=1)
     return true_range.ewm(span=length, adjust=False).mean()
 
+class RollingPercentileRank:
+    """
+    Sliding-window percentile rank backed by a sorted copy of the window.
+
+    Each push is a bisect insert plus a bisect removal of the value leaving
+    the window, and the rank of the newest value is a single bisect, so a
+    step costs O(log w) comparisons (plus a C-level memmove) instead of the
+    O(w) Python-level scan of rolling().apply.
+
+    rank = percent of window values >= newest value, NaN until the window
+    is full or while it contains a NaN (same as rolling(window).apply).
+    """
+
+    def __init__(self, lookback: int = 100):
+        self.lookback = lookback
+        self.window = deque()
+        self.sorted_window = []
+        self.nan_count = 0
+
+    def _rank(self, sorted_values, value):
+        return (len(sorted_values) - bisect_left(sorted_values, value)) / self.lookback * 100
+
+    def push(self, value: float) -> float:
+        """Append a value, evict the oldest if full, return the new rank."""
+        value = float(value)
+        self.window.append(value)
+        if math.isnan(value):
+            self.nan_count += 1
+        else:
+            insort(self.sorted_window, value)
+
+        if len(self.window) > self.lookback:
+            old = self.window.popleft()
+            if math.isnan(old):
+                self.nan_count -= 1
+            else:
+                del self.sorted_window[bisect_left(self.sorted_window, old)]
+
+        if len(self.window) < self.lookback or self.nan_count:
+            return np.nan
+        return self._rank(self.sorted_window, value)
+
+    def peek(self, value: float) -> float:
+        """Rank value would get if pushed now (window is not modified)."""
+        value = float(value)
+        if len(self.window) + 1 < self.lookback or math.isnan(value):
+            return np.nan
+        if len(self.window) < self.lookback:
+            oldest = None
+        else:
+            oldest = self.window[0]
+        nan_count = self.nan_count - (1 if oldest is not None and math.isnan(oldest) else 0)
+        if nan_count:
+            return np.nan
+
+        count_ge = len(self.sorted_window) - bisect_left(self.sorted_window, value) + 1
+        if oldest is not None and oldest >= value:
+            count_ge -= 1
+        return count_ge / self.lookback * 100
+
+
+def rolling_percentile_rank(values, lookback: int = 100) -> np.ndarray:
+    """Batch percentile rank over a whole array using RollingPercentileRank."""
+    ranker = RollingPercentileRank(lookback)
+    push = ranker.push
+    return np.fromiter((push(v) for v in np.asarray(values, dtype=float)), dtype=float, count=len(values))
+
+
 def atr_percentile(atr_series: pd.Series, lookback: int = 100) -> pd.Series:
     """Calculate ATR percentile rank over lookback period."""
-    return atr_series.rolling(window=lookback).apply(
-        lambda x: (x.iloc[-1] <= x).sum() / len(x) * 100 if len(x) > 0 else 50
+    return pd.Series(
+        rolling_percentile_rank(atr_series.to_numpy(dtype=float), lookback),
+        index=atr_series.index,
     )
 
 def ema_compression(ema_fast: pd.Series, ema_slow: pd.Series, atr: pd.Series) -> pd.Series:
@@ -100,3 +179,135 @@ def calculate_indicators(df: pd.DataFrame) -> pd.DataFrame:
     df['volume_strength'] = volume_strength(df['volume'], df['vol_ma'], df['vol_ma_slow'])
 
     return df
+
+
+# ===== Batched kernels: (symbols x time) matrices =====
+# Each row is one symbol, each column one candle. Rows may be left-padded
+# with NaN for symbols with shorter history (see stack_ohlcv); gaps after
+# the first valid candle are not supported. Every kernel matches the
+# pandas function of the same name applied to each row on its own.
+
+def stack_ohlcv(frames: dict, length: int = None):
+    """
+    Right-align per-symbol candle frames into (symbols x time) arrays.
+
+    Returns:
+        symbols (list), arrays (dict of 'open'/'high'/'low'/'close'/'volume'
+        -> float64 ndarray of shape (len(symbols), length))
+    """
+    symbols = list(frames.keys())
+    if length is None:
+        length = max((len(df) for df in frames.values()), default=0)
+    arrays = {col: np.full((len(symbols), length), np.nan) for col in ('open', 'high', 'low', 'close', 'volume')}
+    for i, symbol in enumerate(symbols):
+        df = frames[symbol].tail(length)
+        n = len(df)
+        if n == 0:
+            continue
+        for col, matrix in arrays.items():
+            matrix[i, length - n:] = df[col].to_numpy(dtype=float)
+    return symbols, arrays
+
+def _ewm_matrix(values: np.ndarray, alpha: float, min_periods: int = 0) -> np.ndarray:
+    """adjust=False EWM along axis 1, seeded at each row's first valid value."""
+    out = np.empty_like(values)
+    prev = np.full(values.shape[0], np.nan)
+    for t in range(values.shape[1]):
+        x = values[:, t]
+        prev = np.where(np.isnan(prev), x, prev + alpha * (x - prev))
+        out[:, t] = prev
+    if min_periods > 1:
+        out[np.cumsum(~np.isnan(values), axis=1) < min_periods] = np.nan
+    return out
+
+def ema_matrix(close: np.ndarray, length: int) -> np.ndarray:
+    """EMA of every row (matches ema())."""
+    return _ewm_matrix(close, 2 / (length + 1))
+
+def sma_matrix(values: np.ndarray, length: int) -> np.ndarray:
+    """Rolling mean of every row (matches sma())."""
+    valid = ~np.isnan(values)
+    padded = np.zeros((values.shape[0], values.shape[1] + 1))
+    padded[:, 1:] = np.cumsum(np.where(valid, values, 0.0), axis=1)
+    counts = np.zeros_like(padded)
+    counts[:, 1:] = np.cumsum(valid, axis=1)
+
+    out = np.full(values.shape, np.nan)
+    if values.shape[1] >= length:
+        window_sum = padded[:, length:] - padded[:, :-length]
+        window_count = counts[:, length:] - counts[:, :-length]
+        out[:, length - 1:] = np.where(window_count == length, window_sum / length, np.nan)
+    return out
+
+def rsi_matrix(close: np.ndarray, length: int = 14) -> np.ndarray:
+    """RSI of every row (matches rsi())."""
+    delta = np.diff(close, axis=1, prepend=np.nan)
+    started = ~np.isnan(close)
+    gain = np.where(started, np.where(delta > 0, delta, 0.0), np.nan)
+    loss = np.where(started, np.where(delta < 0, -delta, 0.0), np.nan)
+    avg_gain = _ewm_matrix(gain, 1 / length, min_periods=length)
+    avg_loss = _ewm_matrix(loss, 1 / length, min_periods=length)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return 100 - (100 / (1 + avg_gain / avg_loss))
+
+def vwap_matrix(high: np.ndarray, low: np.ndarray, close: np.ndarray, volume: np.ndarray) -> np.ndarray:
+    """Cumulative VWAP of every row (matches vwap())."""
+    typical_price = (high + low + close) / 3
+    valid = ~np.isnan(typical_price * volume)
+    cumulative_tp_vol = np.cumsum(np.where(valid, typical_price * volume, 0.0), axis=1)
+    cumulative_vol = np.cumsum(np.where(valid, volume, 0.0), axis=1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        out = cumulative_tp_vol / cumulative_vol
+    out[~np.logical_or.accumulate(valid, axis=1)] = np.nan
+    return out
+
+def atr_matrix(high: np.ndarray, low: np.ndarray, close: np.ndarray, length: int = 14) -> np.ndarray:
+    """ATR of every row (matches atr())."""
+    prev_close = np.empty_like(close)
+    prev_close[:, 0] = np.nan
+    prev_close[:, 1:] = close[:, :-1]
+    true_range = np.fmax(np.fmax(high - low, np.abs(high - prev_close)), np.abs(low - prev_close))
+    return _ewm_matrix(true_range, 2 / (length + 1))
+
+def atr_percentile_matrix(atr_values: np.ndarray, lookback: int = 100) -> np.ndarray:
+    """Percentile rank of every row over a sliding window (matches atr_percentile())."""
+    out = np.full(atr_values.shape, np.nan)
+    if atr_values.shape[1] < lookback:
+        return out
+    windows = np.lib.stride_tricks.sliding_window_view(atr_values, lookback, axis=1)
+    latest = windows[:, :, -1:]
+    ranks = (windows >= latest).sum(axis=2) / lookback * 100
+    ranks[np.isnan(windows).any(axis=2)] = np.nan
+    out[:, lookback - 1:] = ranks
+    return out
+
+def calculate_indicators_matrix(arrays: dict) -> dict:
+    """
+    Vectorized calculate_indicators for many symbols at once.
+
+    Args:
+        arrays: dict with 'open', 'high', 'low', 'close', 'volume' 2D arrays
+                (as returned by stack_ohlcv)
+    Returns:
+        dict of indicator name -> 2D array, same keys as INDICATOR_COLUMNS
+    """
+    high, low, close, volume = arrays['high'], arrays['low'], arrays['close'], arrays['volume']
+    out = {
+        'ema_fast': ema_matrix(close, 9),
+        'ema_slow': ema_matrix(close, 21),
+        'ema_trend': ema_matrix(close, 200),
+        'ema_20': ema_matrix(close, 20),
+        'ema_50': ema_matrix(close, 50),
+        'vwap': vwap_matrix(high, low, close, volume),
+        'rsi': rsi_matrix(close, 14),
+        'vol_ma': sma_matrix(volume, 20),
+        'vol_ma_slow': sma_matrix(volume, 50),
+        'atr': atr_matrix(high, low, close, 14),
+    }
+    out['atr_percentile'] = atr_percentile_matrix(out['atr'], 100)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        compression = np.abs(out['ema_fast'] - out['ema_slow']) / out['atr']
+        strength = out['vol_ma'] / out['vol_ma_slow']
+    out['ema_compression'] = np.where(np.isinf(compression), 0, compression)
+    out['volume_strength'] = np.where(np.isinf(strength), 1, strength)
+    return out
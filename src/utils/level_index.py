@@ -0,0 +1,221 @@
+"""
+Support/Resistance Level Index
+==============================
+Sliding-window index of candle highs/lows that answers support/resistance
+queries without rescanning the window on every candle.
+
+A level is a candidate price (a high/low rounded to 2 decimals) touched by
+at least `min_touches` raw highs/lows within `tolerance`, where tolerance is
+`tolerance_pct` of the window's average close. This is the same definition
+as LiquidityGrabStrategy._find_key_levels; the index just keeps the sorted
+highs/lows and candidates up to date as one candle enters and one leaves.
+"""
+from bisect import bisect_left, bisect_right, insort
+from collections import Counter, deque
+import numpy as np
+
+class _SortedSide:
+    """Sorted raw values plus sorted unique rounded candidates for one side."""
+
+    def __init__(self):
+        self.values = []
+        self.candidates = []
+        self.candidate_counts = Counter()
+
+    def add(self, value):
+        insort(self.values, value)
+        candidate = float(np.round(value, 2))
+        if self.candidate_counts[candidate] == 0:
+            insort(self.candidates, candidate)
+        self.candidate_counts[candidate] += 1
+
+    def remove(self, value):
+        del self.values[bisect_left(self.values, value)]
+        candidate = float(np.round(value, 2))
+        self.candidate_counts[candidate] -= 1
+        if self.candidate_counts[candidate] == 0:
+            del self.candidate_counts[candidate]
+            del self.candidates[bisect_left(self.candidates, candidate)]
+
+    def touches(self, level, tolerance):
+        """Count of values with |value - level| <= tolerance."""
+        values = self.values
+        lo = bisect_left(values, level - tolerance)
+        hi = bisect_right(values, level + tolerance)
+        # level +/- tolerance may round by an ulp; settle the boundaries with
+        # the exact test so counts match the brute-force scan
+        while lo > 0 and abs(values[lo - 1] - level) <= tolerance:
+            lo -= 1
+        while lo < len(values) and abs(values[lo] - level) > tolerance:
+            lo += 1
+        while hi < len(values) and abs(values[hi] - level) <= tolerance:
+            hi += 1
+        while hi > lo and abs(values[hi - 1] - level) > tolerance:
+            hi -= 1
+        return max(hi - lo, 0)
+
+
+class LevelIndex:
+    def __init__(self, lookback=50, tolerance_pct=0.002, min_touches=2):
+        self.lookback = lookback
+        self.tolerance_pct = tolerance_pct
+        self.min_touches = min_touches
+        self.window = deque()
+        self.close_sum = 0.0
+        self.last_timestamp = None
+        self.sides = {'support': _SortedSide(), 'resistance': _SortedSide()}
+
+    def __len__(self):
+        return len(self.window)
+
+    def clear(self):
+        self.window.clear()
+        self.close_sum = 0.0
+        self.last_timestamp = None
+        self.sides = {'support': _SortedSide(), 'resistance': _SortedSide()}
+
+    def push(self, timestamp, high, low, close):
+        """Add a closed candle, evicting the oldest once the window is full."""
+        high, low, close = float(high), float(low), float(close)
+        self.window.append((high, low, close))
+        self.sides['resistance'].add(high)
+        self.sides['support'].add(low)
+        self.close_sum += close
+        self.last_timestamp = timestamp
+
+        if len(self.window) > self.lookback:
+            old_high, old_low, old_close = self.window.popleft()
+            self.sides['resistance'].remove(old_high)
+            self.sides['support'].remove(old_low)
+            self.close_sum -= old_close
+
+    def _replace_newest(self, high, low, close):
+        """Overwrite the newest candle's values (same timestamp, e.g. still forming)."""
+        old_high, old_low, old_close = self.window.pop()
+        self.sides['resistance'].remove(old_high)
+        self.sides['support'].remove(old_low)
+        self.close_sum -= old_close
+        high, low, close = float(high), float(low), float(close)
+        self.window.append((high, low, close))
+        self.sides['resistance'].add(high)
+        self.sides['support'].add(low)
+        self.close_sum += close
+
+    def sync(self, df):
+        """
+        Bring the index up to date with a candle frame (DatetimeIndex or
+        'timestamp' column). Only candles newer than the last one pushed are
+        added; the window is rebuilt if the frame does not continue it. The
+        last pushed candle is refreshed from the frame, since it may have
+        been the forming candle of an earlier poll.
+        """
+        if df.empty:
+            return
+        timestamps = df['timestamp'] if 'timestamp' in df.columns else df.index
+        timestamps = list(timestamps[-self.lookback:])
+        highs = df['high'].values[-self.lookback:]
+        lows = df['low'].values[-self.lookback:]
+        closes = df['close'].values[-self.lookback:]
+
+        if self.last_timestamp is None or self.last_timestamp not in set(timestamps):
+            self.clear()
+            start = 0
+        else:
+            start = timestamps.index(self.last_timestamp)
+            self._replace_newest(highs[start], lows[start], closes[start])
+            start += 1
+
+        for i in range(start, len(timestamps)):
+            self.push(timestamps[i], highs[i], lows[i], closes[i])
+
+    @property
+    def tolerance(self):
+        if not self.window:
+            return 0.0
+        return self.close_sum / len(self.window) * self.tolerance_pct
+
+    def _is_level(self, side, candidate, tolerance):
+        return self.sides[side].touches(candidate, tolerance) >= self.min_touches
+
+    def levels(self, side):
+        """All levels on one side ('support' or 'resistance'), ascending."""
+        tolerance = self.tolerance
+        return [c for c in self.sides[side].candidates if self._is_level(side, c, tolerance)]
+
+    def has_levels(self):
+        return self.lowest('support') is not None or self.lowest('resistance') is not None
+
+    def lowest(self, side):
+        tolerance = self.tolerance
+        for candidate in self.sides[side].candidates:
+            if self._is_level(side, candidate, tolerance):
+                return candidate
+        return None
+
+    def highest(self, side):
+        tolerance = self.tolerance
+        for candidate in reversed(self.sides[side].candidates):
+            if self._is_level(side, candidate, tolerance):
+                return candidate
+        return None
+
+    def nearest(self, side, price):
+        """
+        Level closest to price (the lower one on a tie), walking outward from
+        the bisect position so only candidates near price are checked.
+        """
+        candidates = self.sides[side].candidates
+        tolerance = self.tolerance
+        right = bisect_left(candidates, price)
+        left = right - 1
+        while left >= 0 or right < len(candidates):
+            if right >= len(candidates) or (left >= 0 and price - candidates[left] <= candidates[right] - price):
+                candidate = candidates[left]
+                left -= 1
+            else:
+                candidate = candidates[right]
+                right += 1
+            if self._is_level(side, candidate, tolerance):
+                return candidate
+        return None
+
+
+def window_touch_counts(windows, candidates, tolerance):
+    """
+    Batch touch counting: for every row r and candidate k, the number of
+    values in windows[r] with |value - candidates[r, k]| <= tolerance[r].
+
+    Each window is sorted once and both interval ends are found with a
+    vectorized binary search over all (row, candidate) pairs at once, using
+    the exact |value - level| test as the search predicate. The search
+    takes power-of-two steps with flat indexing into the sorted windows,
+    so each step is one gather, one predicate and one select.
+
+    Args:
+        windows: (rows x w) raw highs or lows
+        candidates: (rows x k) candidate levels
+        tolerance: (rows,) tolerance per row
+    """
+    ordered = np.sort(windows, axis=1)
+    rows, width = ordered.shape
+    tol = np.asarray(tolerance, dtype=float)[:, None]
+    if width == 0:
+        return np.zeros(candidates.shape, dtype=np.intp)
+    flat = ordered.ravel()
+    # flat[base + n] is the n-th (1-based) sorted value of each row
+    base = np.arange(rows, dtype=np.intp)[:, None] * width - 1
+    top = 1 << (width.bit_length() - 1)
+
+    def first_true(predicate):
+        pos = np.zeros(candidates.shape, dtype=np.intp)
+        step = top
+        while step:
+            probe = np.minimum(pos + step, width)
+            value = flat[base + probe]
+            pos = np.where(predicate(value) | (pos + step > width), pos, pos + step)
+            step >>= 1
+        return pos
+
+    start = first_true(lambda v: (v >= candidates) | (candidates - v <= tol))
+    stop = first_true(lambda v: (v > candidates) & (v - candidates > tol))
+    return stop - start
@@ -1,8 +1,8 @@
 from flask import Flask, render_template, jsonify, request
 from ..database.db_manager import DBManager
-from ..database.models import Trade, BotState, db
+from ..database.models import Trade, BacktestRun, BacktestTrade, db
 
-from ..core.backtest import BacktestEngine
+from ..core.backtest_jobs import BacktestJobQueue
 from ..exchange.binance_client import BinanceClient
 from config.settings import Config
 import os
@@ -235,55 +235,76 @@ def close_position():
         return jsonify({'status': 'error', 'message': str(e)}), 500
 
 
+def _exchange_client():
+    return BinanceClient(
+        Config.BINANCE_API_KEY, 
+        Config.BINANCE_API_SECRET, 
+        testnet=Config.TESTNET
+    )
+
+# Backtests run in background threads; results are cached in backtest_runs
+backtest_jobs = BacktestJobQueue(app, Config, _exchange_client,
+                                 max_workers=getattr(Config, 'BACKTEST_WORKERS', 2))
+
 @app.route('/api/backtest', methods=['POST'])
 def run_backtest():
-    """Run a backtest on historical data."""
+    """
+    Queue a backtest. Body: symbol, interval, days (or start/end), optional
+    strategy, params, intrabar_interval, monte_carlo_paths and
+    monte_carlo_method. Returns the job; identical requests are answered
+    from the stored run immediately.
+    """
     try:
-        data = request.get_json() or {}
-        symbol = data.get('symbol', Config.SYMBOL)
-        interval = data.get('interval', Config.TIMEFRAME)
-        days = data.get('days', 30)
-        
-        # Initialize exchange client for testnet
-        exchange = BinanceClient(
-            Config.BINANCE_API_KEY, 
-            Config.BINANCE_API_SECRET, 
-            testnet=Config.TESTNET
-        )
-        
-        # Run backtest
-        engine = BacktestEngine(exchange, Config)
-        trades, final_balance = engine.run_backtest(symbol, interval, days)
-        
-        if not trades:
-            return jsonify({
-                'status': 'error',
-                'message': 'No trades generated. Not enough data or no signals found.'
-            }), 400
-        
-        # Save to database
-        saved = engine.save_to_database(trades)
-        
-        # Calculate stats
-        winning = sum(1 for t in trades if t['pnl'] > 0)
-        losing = sum(1 for t in trades if t['pnl'] <= 0)
-        total_pnl = sum(t['pnl'] for t in trades)
-        win_rate = (winning / len(trades) * 100) if trades else 0
-        
-        return jsonify({
-            'status': 'success',
-            'message': f'Backtest completed. {saved} trades saved.',
-            'stats': {
-                'total_trades': len(trades),
-                'winning_trades': winning,
-                'losing_trades': losing,
-                'win_rate': f"{win_rate:.2f}%",
-                'total_pnl': f"${total_pnl:.2f}",
-                'initial_balance': 10000,
-                'final_balance': f"${final_balance:.2f}",
-                'return_pct': f"{((final_balance - 10000) / 10000 * 100):.2f}%"
-            }
-        })
+        job = backtest_jobs.submit(request.get_json() or {})
+        return jsonify({'status': 'success', 'job': job.to_dict()}), (200 if job.done else 202)
+    except ValueError as e:
+        return jsonify({'status': 'error', 'message': str(e)}), 400
+    except Exception as e:
+        return jsonify({'status': 'error', 'message': str(e)}), 500
+
+@app.route('/api/backtest/jobs/<job_id>', methods=['GET'])
+def get_backtest_job(job_id):
+    """Status and progress (0-100) of a backtest job; result once completed."""
+    job = backtest_jobs.get(job_id)
+    if job is None:
+        return jsonify({'status': 'error', 'message': 'Job not found'}), 404
+    return jsonify({'status': 'success', 'job': job.to_dict()})
+
+@app.route('/api/backtest/jobs/<job_id>/cancel', methods=['POST'])
+def cancel_backtest_job(job_id):
+    if not backtest_jobs.cancel(job_id):
+        return jsonify({'status': 'error', 'message': 'Job not found or already finished'}), 404
+    return jsonify({'status': 'success', 'job': backtest_jobs.get(job_id).to_dict()})
+
+@app.route('/api/backtest/runs', methods=['GET'])
+def list_backtest_runs():
+    """Most recent stored backtest runs (summary + Monte Carlo, no trades)."""
+    limit = min(request.args.get('limit', 50, type=int), 500)
+    runs = BacktestRun.query.order_by(BacktestRun.created_at.desc()).limit(limit).all()
+    return jsonify({'status': 'success', 'runs': [run.to_dict() for run in runs]})
+
+@app.route('/api/backtest/runs/<int:run_id>', methods=['GET'])
+def get_backtest_run(run_id):
+    """A stored backtest run with its trades."""
+    run = BacktestRun.query.get(run_id)
+    if run is None:
+        return jsonify({'status': 'error', 'message': 'Run not found'}), 404
+    trades = BacktestTrade.query.filter_by(run_id=run_id).order_by(BacktestTrade.entry_time).all()
+    return jsonify({'status': 'success', 'run': run.to_dict(), 'trades': [t.to_dict() for t in trades]})
+
+@app.route('/api/backtest/multi', methods=['POST'])
+def run_multi_backtest():
+    """
+    Queue a backtest of several symbols (default: Config.SYMBOLS) in
+    parallel processes. Body: symbols, interval, days, optional strategy,
+    workers, monte_carlo_paths and monte_carlo_method. Returns the job;
+    poll /api/backtest/jobs/<job_id> for one saved run per symbol.
+    """
+    try:
+        job = backtest_jobs.submit_multi(request.get_json() or {})
+        return jsonify({'status': 'success', 'job': job.to_dict()}), 202
+    except ValueError as e:
+        return jsonify({'status': 'error', 'message': str(e)}), 400
     except Exception as e:
         return jsonify({'status': 'error', 'message': str(e)}), 500
 
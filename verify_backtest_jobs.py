@@ -0,0 +1,139 @@
+import math
+import os
+import tempfile
+import threading
+import time
+from flask import Flask
+
+from src.core.backtest_jobs import BacktestJobQueue, normalize_request
+from src.database.models import db, BacktestRun
+from verify_helpers import check
+
+MINUTE = 60_000
+
+class MockConfig:
+    SYMBOL = 'BTCUSDT'
+    TIMEFRAME = '1m'
+    RISK_PER_TRADE = 0.01
+    POSITION_SIZE_USDT = 0
+    LEVERAGE = 5
+    STOP_LOSS_ATR_MULTIPLIER = 2.0
+    TAKE_PROFIT_RR = 1.5
+    TRADING_FEE_RATE = 0.0005
+    LEVEL_LOOKBACK = 50
+    KLINE_STORE_DIR = os.path.join(tempfile.mkdtemp(), 'klines')
+
+class FakeExchange:
+    """Klines from a deterministic series; pages can fail or be held back."""
+    def __init__(self):
+        self.calls = 0
+        self.fail_calls = set()  # 1-based call numbers that return None
+        self.gate = threading.Event()
+        self.gate.set()
+
+    def get_klines_range(self, symbol, interval, start_time, end_time, limit=1500):
+        self.gate.wait()
+        self.calls += 1
+        if self.calls in self.fail_calls:
+            return None
+        first = -(-start_time // MINUTE) * MINUTE
+        rows = []
+        for t in range(first, end_time + 1, MINUTE):
+            base = 100 + 3 * math.sin(t / MINUTE / 45) + math.sin(t / MINUTE / 7)
+            rows.append([t, base, base + 0.6, base - 0.6, base + 0.2, 10.0 + (t // MINUTE) % 7, t + MINUTE - 1])
+            if len(rows) == limit:
+                break
+        return rows
+
+def wait_done(job, timeout=30):
+    deadline = time.time() + timeout
+    while not job.done and time.time() < deadline:
+        time.sleep(0.01)
+    return job.done
+
+def test_backtest_jobs():
+    print("Verifying the background backtest job queue...")
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'jobs.db')}"
+    db.init_app(app)
+    with app.app_context():
+        db.create_all()
+    exchange = FakeExchange()
+    jobs = BacktestJobQueue(app, MockConfig, lambda: exchange, max_workers=2)
+    last_closed = int(time.time() * 1000) // MINUTE * MINUTE - MINUTE
+    start = last_closed - 3 * 1440 * MINUTE  # 3 pages of 1500
+    request = {'symbol': 'BTCUSDT', 'interval': '1m', 'start': start, 'end': last_closed,
+               'monte_carlo_paths': 100}
+    results = []
+
+    future = dict(request, end=last_closed + 10 * 1440 * MINUTE)
+    results.append(check("an end past the last closed candle is clamped",
+                         normalize_request(future, MockConfig)['end'] == last_closed))
+
+    # Second page fails: the run completes but must not be cached
+    exchange.fail_calls = {2}
+    partial = jobs.submit(request)
+    results.append(check("partial download completes without a cache key",
+                         wait_done(partial) and partial.status == 'COMPLETED'
+                         and partial.result['cache_key'] is None))
+
+    # Same request again: not a cache hit, the gap is fetched and cached
+    full = jobs.submit(request)
+    results.append(check("request after a partial run runs again and is cached",
+                         not full.cached and wait_done(full) and full.status == 'COMPLETED'
+                         and full.result['cache_key'] == full.cache_key))
+
+    calls = exchange.calls
+    hit = jobs.submit(future)
+    results.append(check("identical request (clamped end) is served from the cache",
+                         hit.cached and hit.done and hit.run_id == full.run_id and exchange.calls == calls))
+
+    # In-flight join: hold the download, submit twice
+    exchange.gate.clear()
+    slow = dict(request, start=start - 1440 * MINUTE)
+    first = jobs.submit(slow)
+    second = jobs.submit(slow)
+    results.append(check("identical in-flight request joins the running job", first is second))
+    exchange.gate.set()
+    results.append(check("joined job completes once", wait_done(first) and first.status == 'COMPLETED'))
+
+    exchange.gate.clear()
+    cancelled = jobs.submit(dict(request, start=start - 5 * 1440 * MINUTE))
+    time.sleep(0.1)
+    results.append(check("cancel accepts a running job", jobs.cancel(cancelled.id)))
+    exchange.gate.set()
+    results.append(check("cancelled job stops without saving a run",
+                         wait_done(cancelled) and cancelled.status == 'CANCELLED' and cancelled.run_id is None
+                         and not jobs.cancel(cancelled.id)))
+
+    with app.app_context():
+        keys = [run.cache_key for run in BacktestRun.query.order_by(BacktestRun.id).all()]
+    results.append(check("stored runs: partial (no key), full, joined",
+                         keys == [None, full.cache_key, first.cache_key]))
+
+    # Multi-symbol job: queued, one run per symbol with its own Monte Carlo
+    multi = jobs.submit_multi({'symbols': ['btcusdt', 'ETHUSDT'], 'interval': '1m', 'days': 2,
+                               'workers': 2, 'monte_carlo_paths': 100})
+    results.append(check("multi-symbol request is queued", not multi.done or multi.status == 'COMPLETED'))
+    runs = (multi.result or {}).get('runs', {}) if wait_done(multi, timeout=60) else {}
+    results.append(check("multi-symbol job saves one run per symbol",
+                         multi.status == 'COMPLETED' and sorted(runs) == ['BTCUSDT', 'ETHUSDT']
+                         and all(run['symbol'] == symbol for symbol, run in runs.items())))
+    results.append(check("Monte Carlo is per symbol, not over the combined trades",
+                         all(run['monte_carlo'] is not None
+                             and run['monte_carlo']['trades'] == run['stats']['total_trades']
+                             for run in runs.values())
+                         and 'monte_carlo' not in multi.result))
+    try:
+        jobs.submit_multi({'symbols': 'BTCUSDT'})
+        results.append(check("multi-symbol request rejects a bare symbol string", False))
+    except ValueError:
+        results.append(check("multi-symbol request rejects a bare symbol string", True))
+
+    jobs.executor.shutdown()
+    if all(results):
+        print("PASS: backtest jobs verified.")
+    return all(results)
+
+if __name__ == "__main__":
+    test_backtest_jobs()
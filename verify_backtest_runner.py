@@ -0,0 +1,46 @@
+import numpy as np
+import pandas as pd
+
+from config.settings import Config
+from src.core.backtest import BacktestEngine, create_strategy
+from src.core.backtest_runner import BacktestRunner, SharedCandles
+from verify_helpers import check, make_candles
+
+def test_backtest_runner():
+    print("Verifying the shared-memory multi-symbol runner against sequential runs...")
+    start = pd.Timestamp('2024-01-01')
+    frames = {
+        'BTCUSDT': make_candles(20 * 288, start, 0),
+        'ETHUSDT': make_candles(20 * 288, start, 1),
+        'SOLUSDT': make_candles(12 * 288, start + pd.Timedelta(days=8), 2),
+    }
+    results = []
+
+    candles = SharedCandles.create(frames)
+    try:
+        results.append(check("shared memory round-trips every frame",
+                             all((candles.frame(symbol) == df).all().all() for symbol, df in frames.items())))
+    finally:
+        candles.close()
+
+    for strategy in (None, 'LiquidityGrab'):
+        label = strategy or 'built-in'
+        report = BacktestRunner(None, Config, strategy=strategy, max_workers=2).run_frames(frames)
+        ok = True
+        sequential = []
+        for symbol, df in frames.items():
+            engine = BacktestEngine(None, Config, strategy=create_strategy(strategy, Config) if strategy else None)
+            trades, balance = engine.simulate(df, symbol)
+            sequential.append(trades)
+            ok &= np.isclose(report['symbols'][symbol]['final_balance'], balance)
+            ok &= np.array_equal(report['trades'][report['trades']['symbol'] == symbol], trades)
+        count = sum(len(trades) for trades in sequential)
+        results.append(check(f"{label}: {count} trades and balances equal the sequential runs",
+                             ok and count > 0 and len(report['trades']) == count))
+
+    if all(results):
+        print("PASS: backtest runner verified.")
+    return all(results)
+
+if __name__ == "__main__":
+    test_backtest_runner()
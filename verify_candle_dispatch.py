@@ -0,0 +1,135 @@
+import json
+import threading
+import time
+from types import SimpleNamespace
+import src.core.bot as bot_module
+from src.exchange.websocket_manager import BinanceWebSocket
+from verify_helpers import check
+
+def kline_message(symbol, open_time, closed=True):
+    return json.dumps({'e': 'kline', 'k': {
+        's': symbol, 't': open_time, 'x': closed, 'o': 1, 'h': 1, 'l': 1, 'c': 1, 'v': 1,
+    }})
+
+def test_candle_dispatch():
+    print("Verifying candle-close dispatch off the WebSocket receive thread...")
+    symbols = [f"SYM{i}USDT" for i in range(21)]
+    candles = 3
+    workers = 4
+    seen = {symbol: [] for symbol in symbols}
+    state = {'in_flight': 0, 'max_in_flight': 0}
+    lock = threading.Lock()
+    done = threading.Event()
+    expected = len(symbols) * candles
+
+    def on_candle_close(symbol, df):
+        with lock:
+            state['in_flight'] += 1
+            state['max_in_flight'] = max(state['max_in_flight'], state['in_flight'])
+        time.sleep(0.02)  # DB queries, account request, order placement
+        with lock:
+            state['in_flight'] -= 1
+            seen[symbol].append(int(df['timestamp'].iloc[-1].value // 1_000_000))
+            if sum(map(len, seen.values())) == expected:
+                done.set()
+        if symbol == 'SYM0USDT' and len(seen[symbol]) == 1:
+            raise RuntimeError("strategy failure")
+
+    ws = BinanceWebSocket(symbols, timeframe='1m', on_candle_close=on_candle_close, callback_workers=workers)
+    results = []
+
+    # Every pair closes at the same instant, several candles in a row
+    t0 = time.perf_counter()
+    for i in range(candles):
+        for symbol in symbols:
+            ws._on_message(None, kline_message(symbol, i * 60_000))
+    receive_time = time.perf_counter() - t0
+    queued = ws.dispatch_metrics()
+
+    results.append(check(f"receive thread returned in {receive_time * 1000:.0f}ms "
+                         f"(callbacks alone take {expected * 20}ms)", receive_time < expected * 0.02 / 2))
+    results.append(check("backlog visible in queue depth", queued['max_queue_depth'] > workers))
+    results.append(check("all callbacks ran", done.wait(10)))
+    results.append(check(f"concurrency bounded by {workers} workers (peak {state['max_in_flight']})",
+                         1 < state['max_in_flight'] <= workers))
+    results.append(check("callbacks run in candle order per symbol (also after an error)",
+                         all(times == [i * 60_000 for i in range(candles)] for times in seen.values())))
+
+    time.sleep(0.05)
+    metrics = ws.dispatch_metrics(reset=True)
+    results.append(check("metrics count dispatches, errors and lag",
+                         metrics['dispatched'] == expected and metrics['errors'] == 1 and metrics['queue_depth'] == 0
+                         and 0 < metrics['avg_lag'] <= metrics['max_lag']))
+    results.append(check("reset starts a new interval", ws.dispatch_metrics()['dispatched'] == 0))
+    ws.stop()
+
+    if all(results):
+        print("PASS: candle dispatch verified.")
+    return all(results)
+
+class SlowBalanceExchange:
+    """Account requests take a while; records how many overlap."""
+    def __init__(self, *args, **kwargs):
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.lock = threading.Lock()
+
+    def get_account_balance(self, asset):
+        with self.lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        time.sleep(0.01)
+        with self.lock:
+            self.in_flight -= 1
+        return 1000.0, 1000.0
+
+class MockDBManager:
+    def __init__(self):
+        self.trades = []
+
+    def add_trade(self, symbol, side, entry_price, quantity, stop_loss=None, take_profit=None, strategy="Scalping"):
+        time.sleep(0.005)
+        self.trades.append(SimpleNamespace(symbol=symbol, strategy=strategy, status='OPEN'))
+
+    def get_open_trades(self):
+        return list(self.trades)
+
+    def get_recent_trades(self, limit):
+        return []
+
+class MockConfig:
+    BINANCE_API_KEY = BINANCE_API_SECRET = ""
+    TESTNET = True
+    SYMBOL = 'BTCUSDT'
+    TIMEFRAME = '1m'
+    RISK_PER_TRADE = 0.01
+    POSITION_SIZE_USDT = 0
+    STOP_LOSS_ATR_MULTIPLIER = 2.0
+    TAKE_PROFIT_RR = 1.5
+    DRY_RUN = True
+
+def test_serialized_entries():
+    print("Verifying entries from concurrent candle-close callbacks are serialized...")
+    bot_module.BinanceClient = SlowBalanceExchange
+    db = MockDBManager()
+    bot = bot_module.TradingBot(MockConfig, db)
+    # Two signals per symbol at once: sizing must not overlap, one trade each
+    threads = [threading.Thread(target=bot.execute_trade,
+                                args=(f"SYM{i % 4}USDT", 'LONG', 100.0, 99.0, 102.0, 'LiquidityGrab'))
+               for i in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    results = [
+        check("account balance and sizing run one entry at a time", bot.exchange.max_in_flight == 1),
+        check("one trade per symbol and strategy despite concurrent signals",
+              sorted(t.symbol for t in db.trades) == [f"SYM{i}USDT" for i in range(4)]),
+    ]
+    if all(results):
+        print("PASS: entries serialized.")
+    return all(results)
+
+if __name__ == "__main__":
+    test_candle_dispatch()
+    test_serialized_entries()
@@ -0,0 +1,40 @@
+"""Helpers shared by the verify_*.py and benchmark_*.py scripts."""
+import numpy as np
+import pandas as pd
+
+
+def check(name, ok):
+    print(f"{'PASS' if ok else 'FAIL'}: {name}")
+    return ok
+
+
+def make_candles(periods, start='2024-01-01', seed=0, freq='5min'):
+    """Geometric random walk (0.2% steps) with proportional wicks and uniform volume."""
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.002, periods)))
+    open_ = np.roll(close, 1)
+    open_[0] = close[0]
+    return pd.DataFrame({
+        'timestamp': pd.date_range(start=start, periods=periods, freq=freq),
+        'open': open_,
+        'high': np.maximum(open_, close) * (1 + np.abs(rng.normal(0, 0.001, periods))),
+        'low': np.minimum(open_, close) * (1 - np.abs(rng.normal(0, 0.001, periods))),
+        'close': close,
+        'volume': rng.uniform(100, 1000, periods)
+    })
+
+
+def make_walk_candles(periods, seed=0, start='2024-01-01', freq='5min'):
+    """Additive random walk (0.5 steps) with uniform wicks and integer volume."""
+    rng = np.random.default_rng(seed)
+    close = 100 + np.cumsum(rng.normal(0, 0.5, periods))
+    open_ = np.roll(close, 1)
+    open_[0] = close[0]
+    return pd.DataFrame({
+        'timestamp': pd.date_range(start=start, periods=periods, freq=freq),
+        'open': open_,
+        'high': np.maximum(open_, close) + rng.uniform(0, 0.5, periods),
+        'low': np.minimum(open_, close) - rng.uniform(0, 0.5, periods),
+        'close': close,
+        'volume': rng.integers(100, 1000, periods).astype(float)
+    })
@@ -0,0 +1,90 @@
+import numpy as np
+import pandas as pd
+import src.core.bot as bot_module
+from verify_helpers import check
+
+class MockExchange:
+    def __init__(self, *args, **kwargs): pass
+
+class MockDBManager:
+    def get_open_trades(self): return []
+    def get_recent_trades(self, limit): return []
+
+class MockConfig:
+    BINANCE_API_KEY = BINANCE_API_SECRET = ""
+    TESTNET = True
+    SYMBOL = 'BTCUSDT'
+    SYMBOLS = ['BTCUSDT']
+    TIMEFRAME = '5m'
+    LEVEL_LOOKBACK = 50
+    RISK_PER_TRADE = 0.01
+    STOP_LOSS_ATR_MULTIPLIER = 2.0
+    TAKE_PROFIT_RR = 1.5
+    DRY_RUN = True
+
+class RecordingStrategy:
+    """Records the indicator frames it is asked to analyze."""
+    def __init__(self):
+        self.frames = []
+
+    def analyze(self, df, symbol='UNKNOWN'):
+        self.frames.append(df)
+        return 'NONE', 0, 0, 0
+
+class MockProvider:
+    def __init__(self, df):
+        self.df = df
+
+    def get_candles(self, symbol, timeframe, limit):
+        return self.df.tail(limit).reset_index(drop=True)
+
+def make_candles(periods, seed=0):
+    rng = np.random.default_rng(seed)
+    close = 100 + np.cumsum(rng.normal(0, 0.5, periods))
+    return pd.DataFrame({
+        'timestamp': pd.date_range(start='2024-01-01', periods=periods, freq='5min'),
+        'open': close, 'high': close + 0.5, 'low': close - 0.5, 'close': close,
+        'volume': rng.integers(100, 1000, periods).astype(float)
+    })
+
+def test_indicator_cache():
+    print("Verifying the shared indicator cache and the HTTP fallback frame...")
+    bot_module.BinanceClient = MockExchange
+    bot = bot_module.TradingBot(MockConfig, MockDBManager())
+    first, second = RecordingStrategy(), RecordingStrategy()
+    bot.strategies = [("First", first), ("Second", second)]
+    bot.is_running = True
+    candles = make_candles(300)
+    results = []
+
+    # Candle close: both strategies share one frame; a repeat is a cache hit
+    closed = candles.iloc[:250]
+    bot._on_candle_close('BTCUSDT', closed)
+    bot._on_candle_close('BTCUSDT', closed)
+    stats = bot.indicator_cache.stats()
+    results.append(check("strategies share one frame per closed candle",
+                         first.frames[0] is second.frames[0] and first.frames[1] is first.frames[0]))
+    results.append(check("repeated candle close is served from the cache",
+                         stats['misses'] == 1 and stats['hits'] == 1))
+
+    # HTTP fallback: the forming candle is still evaluated provisionally
+    forming = candles.iloc[:251].copy()
+    bot.data_provider = MockProvider(forming)
+    bot.process_symbol('BTCUSDT')
+    frame = first.frames[-1]
+    results.append(check("HTTP fallback analyzes the forming candle",
+                         frame.index[-1] == forming['timestamp'].iloc[-1]
+                         and frame['close'].iloc[-1] == forming['close'].iloc[-1]))
+    forming.loc[forming.index[-1], 'close'] += 1.0
+    bot.process_symbol('BTCUSDT')
+    results.append(check("each poll sees the forming candle's latest price",
+                         first.frames[-1]['close'].iloc[-1] == forming['close'].iloc[-1]
+                         and bot.indicator_engine.last_timestamp['BTCUSDT'] == closed['timestamp'].iloc[-1]))
+
+    bot._report_indicator_cache()
+    if all(results):
+        print("PASS: indicator cache verified.")
+    return all(results)
+
+if __name__ == "__main__":
+    test_indicator_cache()
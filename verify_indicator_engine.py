@@ -0,0 +1,71 @@
+import numpy as np
+import pandas as pd
+from src.utils.indicators import INDICATOR_COLUMNS, calculate_indicators
+from src.utils.indicator_engine import IndicatorEngine
+from verify_helpers import check, make_walk_candles
+
+WINDOW = 205  # Candles per frame, as TradingBot requests them
+
+def max_diff(actual, expected):
+    a = actual[INDICATOR_COLUMNS].to_numpy(dtype=float)
+    e = expected[INDICATOR_COLUMNS].to_numpy(dtype=float)
+    both = ~np.isnan(a) & ~np.isnan(e)
+    if (np.isnan(a) != np.isnan(e)).any():
+        return np.inf
+    return float(np.abs(a[both] - e[both]).max(initial=0.0))
+
+def test_indicator_engine():
+    print("Verifying streamed indicators against calculate_indicators...")
+    df = make_walk_candles(1200, 0)
+    # Batch over the full history since the first candle the engine saw
+    full = calculate_indicators(df.copy())
+    engine = IndicatorEngine(history=500)
+    results = []
+
+    # Slide a WINDOW-candle frame forward one closed candle at a time
+    worst = 0.0
+    for end in range(WINDOW, len(df) + 1):
+        frame = engine.compute('BTCUSDT', df.iloc[end - WINDOW:end], closed=True)
+        worst = max(worst, max_diff(frame, full.iloc[end - WINDOW:end]))
+    results.append(check(f"{len(df) - WINDOW + 1} streamed frames equal the batch over the full history "
+                         f"(max diff {worst:.2e})", worst < 1e-9))
+
+    # In-progress candle: peek() matches the batch row, nothing is committed
+    forming = df.iloc[-1:].copy()
+    forming['timestamp'] += pd.Timedelta(minutes=5)
+    forming['close'] += 0.7
+    extended = pd.concat([df, forming], ignore_index=True)
+    frame = engine.compute('BTCUSDT', extended.iloc[-WINDOW:], closed=False)
+    batch = calculate_indicators(extended.copy()).iloc[-WINDOW:]
+    results.append(check("provisional in-progress row equals the batch row",
+                         max_diff(frame, batch) < 1e-9 and engine.last_timestamp['BTCUSDT'] == df['timestamp'].iloc[-1]))
+
+    # CandleBuffer frames carry datetime64[ms] times; a repeated timestamp keeps its last row
+    repeated = df.iloc[:WINDOW].copy()
+    repeated['timestamp'] = repeated['timestamp'].astype('datetime64[ms]')
+    stale = repeated.iloc[[10]].assign(close=repeated['close'].iloc[10] + 5.0)
+    repeated = pd.concat([repeated.iloc[:10], stale, repeated.iloc[10:]], ignore_index=True)
+    frame = IndicatorEngine(history=500).compute('ETHUSDT', repeated, closed=True)
+    results.append(check("ms timestamps + repeated row: frame equals the batch over the clean frame",
+                         len(frame) == WINDOW and max_diff(frame, full.iloc[:WINDOW]) < 1e-9
+                         and frame.index.equals(pd.DatetimeIndex(df['timestamp'].iloc[:WINDOW]))))
+
+    # A frame that does not contain the last committed candle reseeds
+    gap = df.iloc[-WINDOW:].copy()
+    gap['timestamp'] += pd.Timedelta(days=30)
+    frame = engine.compute('BTCUSDT', gap, closed=True)
+    results.append(check("gap reseeds: frame equals the batch over the new frame only",
+                         max_diff(frame, calculate_indicators(gap.copy())) < 1e-9))
+
+    # Intended behavior change: the old live path recomputed each WINDOW
+    # frame from scratch, so EMA200 etc. were anchored at the window start
+    windowed = calculate_indicators(df.iloc[-WINDOW:].copy())
+    drift = float(np.abs(windowed['ema_trend'].iloc[-1] - full['ema_trend'].iloc[-1]))
+    print(f"INFO: last EMA200 differs by {drift:.3f} between the full history and a {WINDOW}-candle window")
+
+    if all(results):
+        print("PASS: indicator engine verified.")
+    return all(results)
+
+if __name__ == "__main__":
+    test_indicator_engine()
@@ -0,0 +1,40 @@
+import numpy as np
+from src.utils.indicators import calculate_indicators, calculate_indicators_matrix, stack_ohlcv
+from verify_helpers import check, make_walk_candles
+
+def test_indicators_matrix():
+    print("Verifying (symbols x time) indicator kernels against calculate_indicators...")
+    # Different history lengths: shorter symbols are left-padded with NaN
+    frames = {
+        'BTCUSDT': make_walk_candles(600, 0),
+        'ETHUSDT': make_walk_candles(450, 1),
+        'SOLUSDT': make_walk_candles(250, 2),
+        'NEWUSDT': make_walk_candles(80, 3),
+    }
+    symbols, arrays = stack_ohlcv(frames)
+    matrix = calculate_indicators_matrix(arrays)
+    results = [check("stack_ohlcv right-aligns every symbol",
+                     symbols == list(frames) and arrays['close'].shape == (4, 600)
+                     and all(np.isnan(arrays['close'][i, :600 - len(df)]).all() and
+                             np.array_equal(arrays['close'][i, 600 - len(df):], df['close'].to_numpy())
+                             for i, df in enumerate(frames.values())))]
+
+    added = set(calculate_indicators(frames['BTCUSDT'].copy()).columns) - set(frames['BTCUSDT'].columns)
+    results.append(check("kernels cover every calculate_indicators column", set(matrix) == added))
+
+    for i, symbol in enumerate(symbols):
+        expected = calculate_indicators(frames[symbol].copy())
+        n = len(expected)
+        bad = [name for name, values in matrix.items()
+               if not np.allclose(values[i, 600 - n:], expected[name].to_numpy(dtype=float),
+                                  rtol=1e-9, atol=1e-9, equal_nan=True)]
+        padding = all(np.isnan(values[i, :600 - n]).all() for values in matrix.values())
+        results.append(check(f"{symbol} ({n} candles): {len(matrix)} columns match"
+                             + (f", mismatched: {bad}" if bad else ""), not bad and padding))
+
+    if all(results):
+        print("PASS: indicator kernels verified.")
+    return all(results)
+
+if __name__ == "__main__":
+    test_indicators_matrix()
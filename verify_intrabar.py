@@ -0,0 +1,99 @@
+import numpy as np
+
+from src.core.backtest import BacktestEngine, IntrabarResolver
+from verify_helpers import check
+
+MINUTE = 60_000
+BAR = 5 * MINUTE
+START = 1_704_067_200_000  # 2024-01-01 00:00 UTC
+
+class MockConfig:
+    RISK_PER_TRADE = 0.01
+    STOP_LOSS_ATR_MULTIPLIER = 2.0
+    TAKE_PROFIT_RR = 1.5
+    TRADING_FEE_RATE = 0.0
+
+class FakeStore:
+    """KlineStore stand-in serving fixed 1m candles; records backfill calls."""
+    page_limit = 1500
+
+    def __init__(self, candles):
+        self.candles = sorted(candles)  # (open_time, low, high)
+        self.backfills = []
+
+    def backfill(self, symbol, interval, start, end, progress=None, should_stop=None):
+        self.backfills.append((symbol, interval, start, end))
+        return sum(start <= t <= end for t, _, _ in self.candles)
+
+    def arrays(self, symbol, interval, start=None, end=None):
+        return {
+            'open_time': np.array([t for t, _, _ in self.candles], dtype=np.int64),
+            'low': np.array([low for _, low, _ in self.candles]),
+            'high': np.array([high for _, _, high in self.candles]),
+        }
+
+def bars():
+    """
+    5m bars: a LONG signal on bar 0 (entry 100, SL 95, TP 105); bar 2
+    touches both SL and TP.
+    """
+    times = (np.datetime64(START, 'ms') + np.arange(4) * np.timedelta64(BAR, 'ms')).astype('datetime64[ns]')
+    high = np.array([100.5, 102.0, 106.0, 101.0])
+    low = np.array([99.5, 98.0, 94.0, 99.0])
+    close = np.array([100.0, 101.0, 100.0, 100.0])
+    signals = np.array([1, 0, 0, 0], dtype=np.int8)
+    return {
+        'signals': signals, 'entry': close.copy(),
+        'stop_loss': np.full(4, 95.0), 'take_profit': np.full(4, 105.0),
+        'high': high, 'low': low, 'close': close, 'times': times,
+    }
+
+def run(store, intrabar_interval):
+    engine = BacktestEngine(None, MockConfig(), store=store, intrabar_interval=intrabar_interval)
+    data = bars()
+    resolver = engine._intrabar_resolver('BTCUSDT', data['times'])
+    trades, _ = engine.simulate_signals('BTCUSDT', **data, resolver=resolver, start=0)
+    return trades[0], resolver
+
+def test_intrabar():
+    print("Verifying intrabar SL/TP resolution from 1m candles...")
+    bar2 = START + 2 * BAR
+    results = []
+
+    # 1m replay of bar 2: up through the TP first, down through the SL later
+    tp_first = FakeStore([(bar2 + i * MINUTE, low, high) for i, (low, high) in
+                          enumerate([(99.0, 101.0), (100.5, 105.5), (97.0, 104.0), (94.0, 98.0), (95.5, 99.0)])])
+    trade, resolver = run(tp_first, '1m')
+    results.append(check("1m replay turns the SL-first bar into a TP exit",
+                         trade['exit_reason'] == 'TP Hit' and trade['exit_price'] == 105.0))
+    results.append(check("only the ambiguous bar is resolved, from one backfill page",
+                         isinstance(resolver, IntrabarResolver) and resolver.ambiguous == 1
+                         and resolver.take_profit_first == 1 and len(tp_first.backfills) == 1
+                         and tp_first.backfills[0][1] == '1m'))
+
+    sl_first = FakeStore([(bar2 + i * MINUTE, low, high) for i, (low, high) in
+                          enumerate([(94.0, 100.0), (99.0, 106.0)])])
+    trade, _ = run(sl_first, '1m')
+    results.append(check("1m replay keeps SL when the stop was hit first",
+                         trade['exit_reason'] == 'SL Hit' and trade['exit_price'] == 95.0))
+
+    trade, resolver = run(tp_first, None)
+    results.append(check("resolution off: conservative SL exit",
+                         resolver is None and trade['exit_reason'] == 'SL Hit' and trade['exit_price'] == 95.0))
+
+    empty = FakeStore([])
+    trade, _ = run(empty, '1m')
+    results.append(check("sub-bars missing from the store: conservative SL exit",
+                         trade['exit_reason'] == 'SL Hit' and len(empty.backfills) == 1))
+
+    still_ambiguous = FakeStore([(bar2, 94.0, 106.0)])
+    trade, _ = run(still_ambiguous, '1m')
+    results.append(check("a 1m candle touching both levels stays SL",
+                         trade['exit_reason'] == 'SL Hit'))
+
+    if all(results):
+        print("PASS: intrabar resolution verified.")
+    return all(results)
+
+if __name__ == "__main__":
+    test_intrabar()
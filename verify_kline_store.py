@@ -0,0 +1,196 @@
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from urllib.parse import urlparse, parse_qs
+
+import numpy as np
+from binance.client import Client
+
+from src.exchange.binance_client import BinanceClient
+from src.exchange.kline_store import KlineStore
+from verify_helpers import check
+
+MINUTE = 60_000
+# Candles the fake exchange never returns (maintenance window)
+MISSING = set()
+
+
+def fake_candle(open_time):
+    """Deterministic 1m candle for an open time (ms)."""
+    base = 100 + (open_time // MINUTE) % 1000 / 10
+    return [open_time, f"{base}", f"{base + 1}", f"{base - 1}", f"{base + 0.5}", "10.0",
+            open_time + MINUTE - 1, "0", 1, "0", "0", "0"]
+
+
+class FakeKlineHandler(BaseHTTPRequestHandler):
+    """Serves /fapi/v1/klines like Binance futures (1m only)."""
+    requests = []
+    fail_next = 0
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        query = {k: v[0] for k, v in parse_qs(url.query).items()}
+        FakeKlineHandler.requests.append(query)
+        if FakeKlineHandler.fail_next > 0:
+            FakeKlineHandler.fail_next -= 1
+            self._reply(500, {'code': -1000, 'msg': 'fake outage'})
+            return
+
+        start = int(query['startTime'])
+        end = int(query['endTime'])
+        limit = int(query.get('limit', 500))
+        first = -(-start // MINUTE) * MINUTE
+        rows = []
+        for open_time in range(first, end + 1, MINUTE):
+            if open_time in MISSING:
+                continue
+            rows.append(fake_candle(open_time))
+            if len(rows) == limit:
+                break
+        self._reply(200, rows)
+
+    def _reply(self, status, payload):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def make_exchange(port):
+    """BinanceClient pointed at the local fake endpoint."""
+    exchange = BinanceClient.__new__(BinanceClient)
+    exchange.testnet = True
+    exchange.client = Client('key', 'secret', ping=False)
+    exchange.client.FUTURES_URL = f"http://127.0.0.1:{port}/fapi/v1"
+    return exchange
+
+
+def test_kline_store():
+    print("Verifying KlineStore against a local fake kline endpoint...")
+    server = HTTPServer(('127.0.0.1', 0), FakeKlineHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    root = tempfile.mkdtemp()
+    results = []
+    try:
+        store = KlineStore(root, make_exchange(server.server_address[1]))
+        now = int(time.time() * 1000) // MINUTE * MINUTE
+        end = now - 10 * MINUTE
+        start = end - 5 * 1440 * MINUTE + MINUTE  # 7200 candles
+
+        # Exchange gap inside the range
+        MISSING.update(range(start + 1000 * MINUTE, start + 1010 * MINUTE, MINUTE))
+
+        fetched = store.backfill('BTCUSDT', '1m', start, end)
+        pages = len(FakeKlineHandler.requests)
+        results.append(check(f"initial backfill past 1500 cap ({fetched} candles, {pages} requests)",
+                             fetched == 7190 and pages == 5))
+
+        data = store.arrays('BTCUSDT', '1m', start, end)
+        expected = [t for t in range(start, end + 1, MINUTE) if t not in MISSING]
+        results.append(check("stored open times match the exchange",
+                             np.array_equal(data['open_time'], expected)))
+        results.append(check("close prices match the exchange",
+                             np.allclose(data['close'], [float(fake_candle(t)[4]) for t in expected])))
+        results.append(check("arrays are zero-copy memory-mapped views",
+                             isinstance(data['close'], np.memmap) and not data['close'].flags.owndata))
+
+        FakeKlineHandler.requests.clear()
+        fetched = store.backfill('BTCUSDT', '1m', start, end)
+        results.append(check("repeat run (incl. exchange gap) makes no requests",
+                             fetched == 0 and not FakeKlineHandler.requests))
+
+        FakeKlineHandler.requests.clear()
+        fetched = store.backfill('BTCUSDT', '1m', start - 1440 * MINUTE, end)
+        first_request = FakeKlineHandler.requests[0] if FakeKlineHandler.requests else {}
+        results.append(check("extending the range fetches only the missing day",
+                             fetched == 1440 and int(first_request.get('endTime', 0)) == start - MINUTE))
+
+        # Outage on the second page: the rest is fetched on the next run
+        far_start = start - 4 * 1440 * MINUTE
+        original = store.exchange.get_klines_range
+        calls = [0]
+
+        def flaky(symbol, interval, start_time, end_time, limit=1500):
+            calls[0] += 1
+            if calls[0] == 2:
+                FakeKlineHandler.fail_next = 1
+            return original(symbol, interval, start_time, end_time, limit)
+
+        store.exchange.get_klines_range = flaky
+        partial = store.backfill('BTCUSDT', '1m', far_start, end)
+        store.exchange.get_klines_range = original
+        rest = store.backfill('BTCUSDT', '1m', far_start, end)
+        results.append(check(f"failed page is retried on the next run ({partial} + {rest} candles)",
+                             partial == 1500 and partial + rest == 3 * 1440))
+
+        df = store.get_frame('BTCUSDT', '1m', far_start, end)
+        results.append(check("frame covers the full range without duplicates",
+                             df['timestamp'].is_monotonic_increasing and df['timestamp'].is_unique and
+                             len(df) == (end - far_start) // MINUTE + 1 - len(MISSING)))
+    finally:
+        server.shutdown()
+        shutil.rmtree(root)
+
+    if all(results):
+        print("PASS: KlineStore verified.")
+    return all(results)
+
+
+class SlowExchange:
+    """In-process fake: fake_candle rows, a short delay per page, counts calls."""
+    def __init__(self):
+        self.calls = 0
+
+    def get_klines_range(self, symbol, interval, start_time, end_time, limit):
+        self.calls += 1
+        time.sleep(0.01)
+        stop = min(end_time, start_time + (limit - 1) * MINUTE)
+        return [fake_candle(t) for t in range(start_time, stop + 1, MINUTE)]
+
+
+def test_shared_series():
+    print("Verifying concurrent backfills of one series from separate stores...")
+    root = tempfile.mkdtemp()
+    try:
+        exchange = SlowExchange()
+        # Each backtest job builds its own KlineStore over the same root
+        stores = [KlineStore(root, exchange) for _ in range(4)]
+        end = (int(time.time() * 1000) // MINUTE - 1) * MINUTE
+        start = end - 2 * 1440 * MINUTE + MINUTE
+        threads = [threading.Thread(target=store.backfill, args=('BTCUSDT', '1m', start, end)) for store in stores]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        data = stores[0].arrays('BTCUSDT', '1m', start, end)
+        expected = np.arange(start, end + 1, MINUTE)
+        series_dir = stores[0]._dir('BTCUSDT', '1m')
+        results = [
+            check(f"the series is downloaded once ({exchange.calls} requests)", exchange.calls == 2),
+            check("stored columns are complete and consistent",
+                  np.array_equal(data['open_time'], expected) and
+                  np.array_equal(data['close'], [float(fake_candle(t)[4]) for t in expected])),
+            check("no temp files are left behind",
+                  not [name for name in os.listdir(series_dir) if name.endswith('.tmp')]),
+        ]
+    finally:
+        shutil.rmtree(root)
+
+    if all(results):
+        print("PASS: shared series verified.")
+    return all(results)
+
+
+if __name__ == "__main__":
+    test_kline_store()
+    test_shared_series()
@@ -0,0 +1,57 @@
+import numpy as np
+import pandas as pd
+
+from config.settings import Config
+from src.core.backtest import BacktestEngine, create_strategy
+from src.core.optimizer import PARAM_SPACE, ParameterOptimizer, random_combinations, score
+from verify_helpers import check, make_candles
+
+def independent_score(combo, frames):
+    """One fresh strategy per symbol, full simulate() path (generate_signals + simulate_signals)."""
+    trades, finals = [], []
+    for symbol, df in frames.items():
+        strategy = create_strategy('LiquidityGrab', Config)
+        for name, value in combo.items():
+            setattr(strategy, name, value)
+        engine = BacktestEngine(None, Config, strategy=strategy)
+        symbol_trades, balance = engine.simulate(df, symbol)
+        trades.append(symbol_trades)
+        finals.append(balance)
+    return score(np.concatenate(trades), engine.initial_balance * len(frames), sum(finals))
+
+def test_optimizer():
+    print("Verifying the parameter optimizer against independent backtests...")
+    start = pd.Timestamp('2024-01-01')
+    frames = {
+        'BTCUSDT': make_candles(15 * 288, start, 0),
+        'ETHUSDT': make_candles(15 * 288, start, 1),
+    }
+    combos = random_combinations(PARAM_SPACE, 6, seed=5)
+    results = []
+
+    table = ParameterOptimizer(Config, max_workers=2).run(frames, combos)
+    params = list(PARAM_SPACE)
+    mismatched = 0
+    for _, row in table.iterrows():
+        combo = {name: row[name] for name in params}
+        expected = independent_score(combo, frames)
+        if not all(np.isclose(row[metric], value) for metric, value in expected.items()):
+            mismatched += 1
+            print(f"  {combo}: optimizer={row.to_dict()} independent={expected}")
+    results.append(check(f"{len(table)} combination scores equal independent simulate runs "
+                         f"({int(table['total_trades'].sum())} trades)",
+                         mismatched == 0 and len(table) == len(combos) and table['total_trades'].sum() > 0))
+    results.append(check("ranked best-first by total_pnl",
+                         table['rank'].tolist() == list(range(1, len(table) + 1))
+                         and table['total_pnl'].is_monotonic_decreasing))
+
+    drawdown = ParameterOptimizer(Config, max_workers=1, metric='max_drawdown_pct').run(frames, combos)
+    results.append(check("max_drawdown_pct ranks the smallest drawdown first",
+                         drawdown['max_drawdown_pct'].is_monotonic_increasing))
+
+    if all(results):
+        print("PASS: optimizer verified.")
+    return all(results)
+
+if __name__ == "__main__":
+    test_optimizer()
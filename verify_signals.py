@@ -0,0 +1,118 @@
+import pandas as pd
+import numpy as np
+from src.strategy.liquidity_grab_strategy import LiquidityGrabStrategy
+from src.strategy.range_sweep_strategy import RangeSweepStrategy
+from src.strategy.trend_pullback_strategy import TrendPullbackStrategy
+from src.strategy.scalping_strategy import ScalpingStrategy
+from src.strategy.smart_scalping_strategy import SmartScalpingStrategy
+from src.core.risk_manager import RiskManager
+
+class MockDBManager:
+    def get_recent_trades(self, limit): return []
+    def get_open_trades(self): return []
+
+class MockConfig:
+    RISK_PER_TRADE = 0.01
+    STOP_LOSS_ATR_MULTIPLIER = 2.0
+    TAKE_PROFIT_RR = 1.5
+
+def make_candles(periods, seed):
+    """Random walk with trend regimes, wick spikes and volume surges."""
+    rng = np.random.default_rng(seed)
+    drift = np.repeat(rng.normal(0, 0.15, periods // 50 + 1), 50)[:periods]
+    close = 100 + np.cumsum(drift + rng.normal(0, 0.4, periods))
+    open_ = np.roll(close, 1) + rng.normal(0, 0.1, periods)
+    open_[0] = close[0]
+    spikes = rng.choice([1, 5], periods, p=[0.9, 0.1])
+    return pd.DataFrame({
+        'timestamp': pd.date_range(start='2024-01-01', periods=periods, freq='5min'),
+        'open': open_,
+        'high': np.maximum(open_, close) + np.abs(rng.normal(0, 0.3, periods)) * spikes,
+        'low': np.minimum(open_, close) - np.abs(rng.normal(0, 0.3, periods)) * spikes[::-1],
+        'close': close,
+        'volume': rng.integers(100, 1000, periods) * rng.choice([1, 3], periods, p=[0.8, 0.2])
+    })
+
+def check_strategy(name, strategy, df, **kwargs):
+    signals = strategy.generate_signals(df, **kwargs)
+    mismatches = 0
+    fired = 0
+    for i in range(len(df)):
+        expected = strategy.analyze(df.iloc[:i + 1].copy(), **kwargs)
+        row = signals.iloc[i]
+        actual = (row['signal'], row['entry_price'], row['stop_loss'], row['take_profit'])
+        fired += expected[0] != 'NONE'
+        if expected[0] != actual[0] or not np.allclose(expected[1:], actual[1:]):
+            mismatches += 1
+            if mismatches <= 3:
+                print(f"  row {i}: analyze={expected} generate_signals={actual}")
+
+    status = "PASS" if mismatches == 0 else "FAIL"
+    print(f"{status}: {name} - {len(df)} rows, {fired} signals, {mismatches} mismatches")
+    return mismatches == 0
+
+def check_level_index(name, strategy, df, symbol):
+    """analyze() on the named-symbol LevelIndex path, fed candle by candle."""
+    frame = df.set_index('timestamp')
+    signals = strategy.generate_signals(frame)
+    mismatches = 0
+    fired = 0
+    for i in range(len(frame)):
+        expected = strategy.analyze(frame.iloc[:i + 1].copy(), symbol=symbol)
+        row = signals.iloc[i]
+        actual = (row['signal'], row['entry_price'], row['stop_loss'], row['take_profit'])
+        fired += expected[0] != 'NONE'
+        if expected[0] != actual[0] or not np.allclose(expected[1:], actual[1:]):
+            mismatches += 1
+            if mismatches <= 3:
+                print(f"  row {i}: analyze={expected} generate_signals={actual}")
+
+    status = "PASS" if mismatches == 0 else "FAIL"
+    print(f"{status}: {name} - {len(frame)} rows, {fired} signals, {mismatches} mismatches")
+    return mismatches == 0
+
+def check_forming_candle(name, strategy, df, symbol):
+    """
+    HTTP-fallback polls: each candle is first analyzed while forming (with
+    a spiked high/low/close), then again with its final values. The level
+    index must match a rescan of the frame after every poll.
+    """
+    frame = df.set_index('timestamp')
+    mismatches = 0
+    for i in range(250, len(frame)):
+        forming = frame.iloc[:i + 1].copy()
+        forming.iloc[-1, forming.columns.get_indexer(['high', 'low', 'close'])] += [5.0, -5.0, 3.0]
+        for poll in (forming, frame.iloc[:i + 1].copy()):
+            strategy.analyze(poll, symbol=symbol)
+            expected = strategy._find_key_levels(poll)
+            actual = strategy.get_levels(symbol)
+            if any(len(a) != len(e) or not np.allclose(a, e) for a, e in zip(actual, expected)):
+                mismatches += 1
+
+    status = "PASS" if mismatches == 0 else "FAIL"
+    print(f"{status}: {name} - {2 * (len(frame) - 250)} polls, {mismatches} mismatches")
+    return mismatches == 0
+
+def test_generate_signals_matches_analyze():
+    print("Verifying generate_signals() against per-row analyze()...")
+    risk_manager = RiskManager(MockConfig(), MockDBManager())
+    df = make_candles(700, seed=39)
+
+    results = [
+        check_strategy("LiquidityGrab", LiquidityGrabStrategy(risk_manager), df),
+        # Lookback above MIN_CANDLES: rows before the first full window use what they have
+        check_strategy("LiquidityGrab (lookback 300)", LiquidityGrabStrategy(risk_manager, level_lookback=300), df),
+        check_level_index("LiquidityGrab (LevelIndex, BTCUSDT)", LiquidityGrabStrategy(risk_manager), df, 'BTCUSDT'),
+        check_level_index("LiquidityGrab (LevelIndex, lookback 300)",
+                          LiquidityGrabStrategy(risk_manager, level_lookback=300), df, 'ETHUSDT'),
+        check_forming_candle("LiquidityGrab (LevelIndex, forming candle polled twice)",
+                             LiquidityGrabStrategy(risk_manager), df, 'SOLUSDT'),
+        check_strategy("RangeSweep", RangeSweepStrategy(risk_manager), df),
+        check_strategy("TrendPullback", TrendPullbackStrategy(risk_manager), df),
+        check_strategy("Scalping", ScalpingStrategy(risk_manager), df, symbol='BTCUSDT'),
+        check_strategy("SmartScalping", SmartScalpingStrategy(risk_manager), df),
+    ]
+    print("PASS: All strategies match." if all(results) else "FAIL: Some strategies differ.")
+
+if __name__ == "__main__":
+    test_generate_signals_matches_analyze()
@@ -0,0 +1,138 @@
+import json
+import time
+from types import SimpleNamespace
+import src.core.bot as bot_module
+from src.core.tick_exits import exit_reason
+from src.exchange.websocket_manager import BinanceWebSocket
+from verify_helpers import check
+
+class MockExchange:
+    def __init__(self, *args, **kwargs): pass
+
+class MockDBManager:
+    def __init__(self):
+        self.trades = []
+
+    def add_trade(self, symbol, side, entry_price, quantity, stop_loss=None, take_profit=None, strategy="Scalping"):
+        trade = SimpleNamespace(id=len(self.trades) + 1, symbol=symbol, side=side, entry_price=entry_price,
+                                quantity=quantity, stop_loss=stop_loss, take_profit=take_profit,
+                                strategy=strategy, status='OPEN', exit_price=None, pnl=None)
+        self.trades.append(trade)
+        return trade
+
+    def close_trade(self, trade_id, exit_price, pnl):
+        trade = self.trades[trade_id - 1]
+        trade.status, trade.exit_price, trade.pnl = 'CLOSED', exit_price, pnl
+        return trade
+
+    def get_open_trades(self):
+        return [t for t in self.trades if t.status == 'OPEN']
+
+class MockConfig:
+    BINANCE_API_KEY = BINANCE_API_SECRET = ""
+    TESTNET = True
+    SYMBOL = 'BTCUSDT'
+    SYMBOLS = ['BTCUSDT', 'ETHUSDT', 'SOLUSDT']
+    TIMEFRAME = '5m'
+    LEVEL_LOOKBACK = 50
+    RISK_PER_TRADE = 0.01
+    POSITION_SIZE_USDT = 0
+    STOP_LOSS_ATR_MULTIPLIER = 2.0
+    TAKE_PROFIT_RR = 1.5
+    TRADING_FEE_RATE = 0.0005
+    DRY_RUN = True
+    TICK_EXIT_STREAM = 'bookTicker'
+
+def book_ticker(symbol, bid, ask):
+    stream = f"{symbol.lower()}@bookTicker"
+    return json.dumps({'stream': stream, 'data': {'e': 'bookTicker', 's': symbol, 'b': str(bid), 'a': str(ask)}})
+
+def wait_for(condition, timeout=5):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if condition():
+            return True
+        time.sleep(0.001)
+    return False
+
+def test_tick_exits():
+    print("Verifying tick-level SL/TP exits...")
+    results = []
+    results.append(check("exit_reason matches the loop's SL/TP rules", [
+        exit_reason('LONG', 95, 95, 110), exit_reason('LONG', 110, 95, 110), exit_reason('LONG', 100, 95, 110),
+        exit_reason('SHORT', 105, 105, 90), exit_reason('SHORT', 90, 105, 90), exit_reason('SHORT', 100, 105, 90),
+    ] == ['SL Hit', 'TP Hit', None, 'SL Hit', 'TP Hit', None]))
+
+    bot_module.BinanceClient = MockExchange
+    db = MockDBManager()
+    bot = bot_module.TradingBot(MockConfig, db)
+    # WebSocket without connecting: subscriptions are recorded on the shards
+    bot.ws_manager = BinanceWebSocket(MockConfig.SYMBOLS, timeframe='5m',
+                                      on_tick=bot.tick_exits.on_tick, tick_stream='bookTicker')
+    bot.tick_executor = bot_module.ThreadPoolExecutor(max_workers=1)
+    ws = bot.ws_manager
+
+    long_trade = db.add_trade('BTCUSDT', 'LONG', 100.0, 1.0, stop_loss=95.0, take_profit=110.0)
+    bot._sync_tick_exits()
+    results.append(check("ticks subscribed only for symbols with open trades",
+                         set(s for s in ws.stream_connection if s.endswith('@bookTicker')) == {'btcusdt@bookTicker'}))
+
+    ws._on_message(None, book_ticker('BTCUSDT', 96.0, 96.1))
+    time.sleep(0.05)
+    results.append(check("tick inside the levels leaves the trade open", long_trade.status == 'OPEN'))
+
+    t0 = time.perf_counter()
+    for bid in (94.9, 94.8, 94.7):  # Burst of ticks through the stop
+        ws._on_message(None, book_ticker('BTCUSDT', bid, bid + 0.1))
+    closed = wait_for(lambda: long_trade.status == 'CLOSED')
+    latency = time.perf_counter() - t0
+    results.append(check(f"long closed at the first bid through the stop in {latency * 1000:.1f}ms",
+                         closed and long_trade.exit_price == 94.9))
+    results.append(check("closing the last trade drops the tick subscription",
+                         wait_for(lambda: not any(s.endswith('@bookTicker') for s in ws.stream_connection))))
+
+    short_trade = db.add_trade('ETHUSDT', 'SHORT', 100.0, 1.0, stop_loss=105.0, take_profit=90.0)
+    bot._sync_tick_exits()
+    ws._on_message(None, book_ticker('ETHUSDT', 89.9, 90.1))
+    time.sleep(0.05)
+    results.append(check("short waits for the ask to reach its take-profit", short_trade.status == 'OPEN'))
+    ws._on_message(None, book_ticker('ETHUSDT', 89.8, 89.9))
+    results.append(check("short closed at the ask on take-profit",
+                         wait_for(lambda: short_trade.status == 'CLOSED') and short_trade.exit_price == 89.9
+                         and len([t for t in db.trades if t.status == 'CLOSED']) == 2))
+
+    # Trade closed elsewhere (e.g. web UI): the main loop's sync drops it
+    other = db.add_trade('SOLUSDT', 'LONG', 20.0, 1.0, stop_loss=19.0, take_profit=22.0)
+    bot._sync_tick_exits()
+    db.close_trade(other.id, 20.5, 0.5)
+    bot._sync_tick_exits()
+    ws._on_message(None, book_ticker('SOLUSDT', 18.0, 18.1))
+    time.sleep(0.05)
+    results.append(check("trades closed elsewhere are no longer monitored",
+                         other.exit_price == 20.5 and not bot.tick_exits.levels
+                         and not any(s.endswith('@bookTicker') for s in ws.stream_connection)))
+
+    # Removing a symbol with an open trade also drops its tick stream
+    db.add_trade('SOLUSDT', 'LONG', 20.0, 1.0, stop_loss=19.0, take_profit=22.0)
+    bot._sync_tick_exits()
+    ws.remove_symbols(['SOLUSDT'])
+    results.append(check("removed symbols stop streaming ticks",
+                         not ws.tick_symbols and not any(s.endswith('@bookTicker') for s in ws.stream_connection)))
+
+    # A misspelled TICK_EXIT_STREAM fails at construction, not at start()
+    class BadConfig(MockConfig):
+        TICK_EXIT_STREAM = 'bookticker'
+    try:
+        bot_module.TradingBot(BadConfig, MockDBManager())
+        rejected = False
+    except ValueError:
+        rejected = True
+    results.append(check("unknown TICK_EXIT_STREAM is rejected by TradingBot", rejected))
+
+    bot.tick_executor.shutdown()
+    if all(results):
+        print("PASS: tick exits verified.")
+    return all(results)
+
+if __name__ == "__main__":
+    test_tick_exits()
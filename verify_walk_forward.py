@@ -0,0 +1,72 @@
+import numpy as np
+import pandas as pd
+
+from config.settings import Config
+from src.core.backtest import BacktestEngine, create_strategy
+from src.core.optimizer import PARAM_SPACE, evaluate, prepare_datasets, random_combinations
+from src.core.walk_forward import WalkForwardOptimizer, row_ranges
+from verify_helpers import check, make_candles
+
+def test_walk_forward():
+    print("Verifying walk-forward optimization on synthetic 5m candles...")
+    # SOLUSDT lists ~10 days later than the others
+    start = pd.Timestamp('2024-01-01')
+    frames = {
+        'BTCUSDT': make_candles(60 * 288, start, 0),
+        'ETHUSDT': make_candles(60 * 288, start, 1),
+        'SOLUSDT': make_candles(50 * 288, start + pd.Timedelta(days=10), 2),
+    }
+    combos = random_combinations(PARAM_SPACE, 8, seed=3)
+    results = []
+
+    sequential = WalkForwardOptimizer(Config, train_days=20, test_days=10, max_workers=1).run(frames, combos)
+    parallel = WalkForwardOptimizer(Config, train_days=20, test_days=10, max_workers=2).run(frames, combos)
+    folds, trades = sequential['folds'], sequential['trades']
+    results.append(check(f"{len(folds)} folds tile the history after the first training window",
+                         len(folds) == 4 and (folds['test_start'].iloc[1:].values == folds['test_end'].iloc[:-1].values).all()))
+    results.append(check("parallel run matches the sequential run",
+                         np.array_equal(trades, parallel['trades']) and folds.equals(parallel['folds'])))
+
+    inside = np.zeros(len(trades), dtype=bool)
+    for _, fold in folds.iterrows():
+        in_fold = (trades['entry_time'] >= fold.test_start.to_datetime64()) & (trades['entry_time'] < fold.test_end.to_datetime64())
+        inside |= in_fold & (trades['exit_time'] < fold.test_end.to_datetime64())
+    results.append(check(f"all {len(trades)} out-of-sample trades open and close inside their test window",
+                         inside.all()))
+    results.append(check("stitched trade count matches the folds",
+                         len(trades) == folds['test_total_trades'].sum() == sequential['stats']['total_trades']))
+
+    # Fold 0 trains on the start of the history: the sliced precomputed
+    # arrays must score exactly like a run on the truncated arrays
+    datasets = prepare_datasets(frames, Config, sorted({c['LEVEL_TOLERANCE_PERCENT'] for c in combos}))
+    ranges = row_ranges(datasets, folds['train_start'].iloc[0].to_datetime64(), folds['train_end'].iloc[0].to_datetime64())
+    truncated = {}
+    for symbol, data in datasets.items():
+        hi = ranges[symbol][1]
+        if hi == 0:
+            continue
+        truncated[symbol] = {key: value.iloc[:hi] if key == 'frame' else value[:hi]
+                             for key, value in data.items() if key != 'levels'}
+        truncated[symbol]['levels'] = {tol: {k: v[:hi] for k, v in levels.items()}
+                                       for tol, levels in data['levels'].items()}
+    best = {name: folds[name].iloc[0] for name in combos[0]}
+    strategy = create_strategy('LiquidityGrab', Config)
+    expected = evaluate(best, truncated, strategy, BacktestEngine(None, Config, strategy=strategy))
+    results.append(check("fold 0 training metric matches an independent evaluation",
+                         np.isclose(folds['train_total_pnl'].iloc[0], expected['total_pnl'])))
+
+    # Lower-is-better metric: each fold must pick the smallest drawdown
+    drawdown = WalkForwardOptimizer(Config, train_days=20, test_days=10, max_workers=1,
+                                    metric='max_drawdown_pct').run(frames, combos)['folds']
+    fold0 = [evaluate(combo, truncated, strategy, BacktestEngine(None, Config, strategy=strategy))['max_drawdown_pct']
+             for combo in combos]
+    results.append(check("max_drawdown_pct picks the smallest training drawdown",
+                         np.isclose(drawdown['train_max_drawdown_pct'].iloc[0], min(fold0))
+                         and min(fold0) < max(fold0)))
+
+    if all(results):
+        print("PASS: walk-forward verified.")
+    return all(results)
+
+if __name__ == "__main__":
+    test_walk_forward()
@@ -0,0 +1,186 @@
+import base64
+import hashlib
+import inspect
+import json
+import queue
+import socket
+import socketserver
+import threading
+import time
+import numpy as np
+import src.exchange.websocket_manager as wm
+from src.exchange.websocket_manager import BinanceWebSocket
+from verify_helpers import check
+
+STEP = 60_000  # 1m
+GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+
+class StandInServer(socketserver.ThreadingTCPServer):
+    """Local WebSocket endpoint: accepts connections, pushes text frames, drops on demand."""
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self):
+        super().__init__(('127.0.0.1', 0), StandInHandler)
+        self.accepted = queue.Queue()  # (socket, path) per connection
+        self.paths = []
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+
+    @property
+    def url(self):
+        return f"ws://127.0.0.1:{self.server_address[1]}/stream"
+
+    def next_connection(self, timeout=10):
+        return self.accepted.get(timeout=timeout)
+
+class StandInHandler(socketserver.BaseRequestHandler):
+    def handle(self):
+        request = b''
+        while b'\r\n\r\n' not in request:
+            chunk = self.request.recv(4096)
+            if not chunk:
+                return
+            request += chunk
+        lines = request.decode().split('\r\n')
+        headers = dict(line.split(': ', 1) for line in lines[1:] if ': ' in line)
+        accept = base64.b64encode(hashlib.sha1((headers['Sec-WebSocket-Key'] + GUID).encode()).digest()).decode()
+        self.request.sendall((
+            "HTTP/1.1 101 Switching Protocols\r\nUpgrade: websocket\r\nConnection: Upgrade\r\n"
+            f"Sec-WebSocket-Accept: {accept}\r\n\r\n"
+        ).encode())
+        self.server.paths.append(lines[0].split(' ')[1])
+        self.server.accepted.put(self.request)
+        # Client frames (SUBSCRIBE, pings) are ignored; wait until dropped
+        try:
+            while self.request.recv(4096):
+                pass
+        except OSError:
+            pass
+
+def send_text(sock, text):
+    data = text.encode()
+    header = bytes([0x81, len(data)]) if len(data) < 126 else bytes([0x81, 126]) + len(data).to_bytes(2, 'big')
+    sock.sendall(header + data)
+
+def drop(sock):
+    sock.shutdown(socket.SHUT_RDWR)
+    sock.close()
+
+def candle(open_time):
+    price = 100 + (open_time // STEP) % 50
+    return [open_time, price, price + 1, price - 1, price + 0.5, 10.0]
+
+def kline_message(symbol, open_time, closed=True):
+    t, o, h, l, c, v = candle(open_time)
+    return json.dumps({'stream': f"{symbol.lower()}@kline_1m", 'data': {'e': 'kline', 'k': {
+        's': symbol, 't': t, 'x': closed, 'o': str(o), 'h': str(h), 'l': str(l), 'c': str(c), 'v': str(v),
+    }}})
+
+class FakeRest:
+    """REST klines from the same synthetic series the stand-in server streams."""
+    def __init__(self):
+        self.requests = []
+
+    def get_klines_range(self, symbol, interval, start_time, end_time, limit=1500):
+        self.requests.append((symbol, start_time, end_time))
+        first = -(-start_time // STEP) * STEP
+        times = range(first, min(end_time, first + (limit - 1) * STEP) + 1, STEP)
+        return [candle(t) + [t + STEP - 1] for t in times]
+
+def last_closed(ws, symbol):
+    buffer = ws.candle_cache.get(symbol)
+    return buffer.last_timestamp if buffer is not None else None
+
+def wait_for(condition, timeout=10):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return False
+
+def test_reconnect():
+    print("Verifying reconnect backoff and REST backfill against a local WebSocket server...")
+    wm.RECONNECT_BASE_DELAY = 0.02
+    wm.RECONNECT_MAX_DELAY = 0.2
+    server = StandInServer()
+    symbols = ['BTCUSDT', 'ETHUSDT']
+    closes = []
+    ws = BinanceWebSocket(symbols, timeframe='1m', on_candle_close=lambda symbol, df: closes.append((symbol, df)))
+    ws.stream_url = server.url
+    depths = []
+    open_handler = wm.StreamConnection._on_open
+    wm.StreamConnection._on_open = lambda self, sock: (depths.append(len(inspect.stack())), open_handler(self, sock))
+    results = []
+
+    # The backfill filters closed candles by the clock: stay within one minute
+    if time.time() % 60 > 45:
+        time.sleep(60 - time.time() % 60)
+    ws.start()
+    ws.http_client = FakeRest()
+    sock = server.next_connection()
+    forming = int(time.time() * 1000) // STEP * STEP
+    for t in range(forming - 40 * STEP, forming - 11 * STEP, STEP):
+        for symbol in symbols:
+            send_text(sock, kline_message(symbol, t))
+
+    # A closed candle missing on a live connection: backfill, no analysis
+    send_text(sock, kline_message('BTCUSDT', forming - 10 * STEP))
+    results.append(check("gap on the live stream backfills from the first missing candle",
+                         wait_for(lambda: last_closed(ws, 'BTCUSDT') == forming - STEP) and
+                         ws.http_client.requests[0][:2] == ('BTCUSDT', forming - 11 * STEP)))
+    wait_for(lambda: ws.dispatch_metrics()['dispatched'] == 2 * 29 + 1 and ws.dispatch_metrics()['queue_depth'] == 0)
+    time.sleep(0.1)
+    results.append(check("analysis skipped on the frame with the hole",
+                         not any(df['timestamp'].iloc[-1].value // 1_000_000 == forming - 10 * STEP
+                                 for _, df in closes)))
+    requeued = [df for symbol, df in closes if symbol == 'BTCUSDT'][-1]
+    requeued_times = requeued['timestamp'].to_numpy().astype('datetime64[ms]').astype(np.int64)
+    results.append(check("after the backfill the newest closed frame is analyzed, without holes",
+                         requeued_times[-1] == forming - STEP and bool((np.diff(requeued_times) == STEP).all())))
+
+    # Connection drops while candles keep closing
+    drop(sock)
+    sock = server.next_connection()
+    results.append(check("reconnected after a drop via the combined-stream URL",
+                         server.paths[-1].startswith('/stream?streams=') and len(server.paths) == 2))
+    results.append(check("reconnect backfill fetched exactly the missed range",
+                         wait_for(lambda: len(ws.http_client.requests) == 2) and
+                         ws.http_client.requests[1][:2] == ('ETHUSDT', forming - 11 * STEP)))
+
+    ok = wait_for(lambda: all(last_closed(ws, s) == forming - STEP for s in symbols))
+    results.append(check("candles missed while disconnected are analyzed once, on the newest frame",
+                         wait_for(lambda: ws.dispatch_metrics()['dispatched'] == 2 * 29 + 2) and
+                         closes[-1][0] == 'ETHUSDT' and
+                         closes[-1][1]['timestamp'].iloc[-1].value // 1_000_000 == forming - STEP))
+    for symbol in symbols:
+        timestamps, values = ws.candle_cache[symbol].arrays()
+        ok &= len(timestamps) == 40 and bool((np.diff(timestamps) == STEP).all())
+        ok &= np.array_equal(values, np.array([candle(t)[1:] for t in timestamps]))
+    results.append(check("caches are contiguous and match the exchange after backfill", ok))
+
+    # Repeated drops: unlimited reconnects on one supervisor thread, no recursion
+    thread = ws.connections[0].thread
+    for _ in range(12):
+        drop(sock)
+        sock = server.next_connection()
+    results.append(check("12 more drops all reconnected (no attempt limit)", len(server.paths) == 14))
+    results.append(check("same supervisor thread, constant stack depth",
+                         ws.connections[0].thread is thread and len(set(depths)) == 1))
+
+    delays = [wm.reconnect_delay(attempt) for attempt in range(10) for _ in range(50)]
+    results.append(check("backoff is jittered and capped",
+                         max(delays) <= wm.RECONNECT_MAX_DELAY and len(set(delays)) > 1 and
+                         wm.RECONNECT_BASE_DELAY / 2 <= min(delays)))
+
+    ws.stop()
+    results.append(check("stop() ends the supervisor loop",
+                         wait_for(lambda: not thread.is_alive(), timeout=5)))
+    server.shutdown()
+
+    if all(results):
+        print("PASS: reconnect and backfill verified.")
+    return all(results)
+
+if __name__ == "__main__":
+    test_reconnect()
@@ -0,0 +1,95 @@
+import json
+import threading
+import time
+from urllib.parse import urlparse, parse_qs
+import src.exchange.websocket_manager as wm
+from src.exchange.websocket_manager import BinanceWebSocket, MAX_STREAMS_PER_CONNECTION
+from verify_helpers import check
+
+class FakeWebSocketApp:
+    """In-process stand-in for websocket.WebSocketApp: opens at once, records frames."""
+    apps = []
+
+    def __init__(self, url, on_message, on_error, on_close, on_open):
+        self.url = url
+        self.on_message = on_message
+        self.on_close = on_close
+        self.on_open = on_open
+        self.sent = []
+        self.closed = threading.Event()
+        FakeWebSocketApp.apps.append(self)
+
+    def run_forever(self):
+        self.on_open(self)
+        self.closed.wait()
+        self.on_close(self, 1000, "closed")
+
+    def send(self, frame):
+        self.sent.append(json.loads(frame))
+
+    def close(self):
+        self.closed.set()
+
+    def streams(self):
+        return set(parse_qs(urlparse(self.url).query)['streams'][0].split('/'))
+
+class FakeWebSocketModule:
+    WebSocketApp = FakeWebSocketApp
+
+def kline_message(symbol, open_time, close):
+    stream = f"{symbol.lower()}@kline_5m"
+    return json.dumps({'stream': stream, 'data': {'e': 'kline', 'k': {
+        's': symbol, 't': open_time, 'x': True, 'o': close, 'h': close, 'l': close, 'c': close, 'v': 1,
+    }}})
+
+def test_shards():
+    print("Verifying sharded combined-stream connections...")
+    wm.websocket = FakeWebSocketModule
+    symbols = [f"SYM{i}USDT" for i in range(250)]
+    ws = BinanceWebSocket(symbols, timeframe='5m')
+    ws.start()
+    apps = list(FakeWebSocketApp.apps)
+    results = []
+
+    results.append(check(f"250 symbols over {len(apps)} connections of <= {MAX_STREAMS_PER_CONNECTION} streams",
+                         len(apps) == 2 and all(len(app.streams()) <= MAX_STREAMS_PER_CONNECTION for app in apps)))
+    results.append(check("combined-stream URLs cover every stream once",
+                         all(urlparse(app.url).path == '/stream' for app in apps) and
+                         set.union(*(app.streams() for app in apps)) == {f"sym{i}usdt@kline_5m" for i in range(250)}
+                         and sum(len(app.streams()) for app in apps) == 250))
+
+    ws._on_message(None, kline_message('SYM7USDT', 0, 42.0))
+    ws._on_message(None, json.dumps({'result': None, 'id': 1}))
+    results.append(check("combined-stream messages reach the candle cache",
+                         ws.candle_cache['SYM7USDT'].arrays()[1][-1, 3] == 42.0))
+
+    added = ws.add_symbols(['SYM1USDT', 'NEWAUSDT', 'NEWBUSDT'])
+    frames = apps[1].sent
+    results.append(check("runtime add sends SUBSCRIBE on the connection with room, no reconnect",
+                         added == ['NEWAUSDT', 'NEWBUSDT'] and len(FakeWebSocketApp.apps) == 2 and
+                         frames[-1]['method'] == 'SUBSCRIBE' and
+                         frames[-1]['params'] == ['newausdt@kline_5m', 'newbusdt@kline_5m']))
+
+    removed = ws.remove_symbols(['SYM7USDT', 'UNKNOWNUSDT'])
+    owner = next(app for app in apps if 'sym7usdt@kline_5m' in app.streams())
+    results.append(check("runtime remove sends UNSUBSCRIBE and drops the cache",
+                         removed == ['SYM7USDT'] and owner.sent[-1] == {
+                             'method': 'UNSUBSCRIBE', 'params': ['sym7usdt@kline_5m'], 'id': owner.sent[-1]['id']}
+                         and 'SYM7USDT' not in ws.candle_cache))
+
+    ws.add_symbols([f"MORE{i}USDT" for i in range(MAX_STREAMS_PER_CONNECTION)])
+    time.sleep(0.1)
+    results.append(check("a full set of shards opens another connection",
+                         len(FakeWebSocketApp.apps) == 3 and len(ws.connections) == 3 and ws.connected))
+
+    ws.remove_symbols([stream.split('@')[0] for stream in ws.connections[0].streams])
+    results.append(check("a connection left without streams is closed",
+                         len(ws.connections) == 2 and apps[0].closed.is_set()))
+
+    ws.stop()
+    if all(results):
+        print("PASS: sharded WebSocket manager verified.")
+    return all(results)
+
+if __name__ == "__main__":
+    test_shards()
@@ -0,0 +1,97 @@
+import json
+import threading
+import time
+import numpy as np
+import pandas as pd
+from src.exchange.websocket_manager import BinanceWebSocket
+from verify_helpers import check
+
+STEP = 300_000  # 5m
+
+class FakeClient:
+    """REST klines ending with the forming candle; the first call per symbol in `flaky` fails."""
+    def __init__(self, now, flaky=()):
+        self.now = now
+        self.flaky = set(flaky)
+        self.calls = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.lock = threading.Lock()
+
+    def get_historical_klines(self, symbol, interval, limit):
+        with self.lock:
+            self.calls.append((symbol, limit))
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        time.sleep(0.05)
+        with self.lock:
+            self.in_flight -= 1
+            if symbol in self.flaky:
+                self.flaky.discard(symbol)
+                return pd.DataFrame()
+        last = self.now // STEP * STEP
+        times = np.arange(last - (limit - 1) * STEP, last + 1, STEP)
+        close = 100 + np.arange(limit, dtype=float)
+        return pd.DataFrame({
+            'timestamp': pd.to_datetime(times, unit='ms'),
+            'open': close, 'high': close + 1, 'low': close - 1, 'close': close, 'volume': 10.0,
+        })
+
+def kline_message(symbol, open_time, close, closed):
+    return json.dumps({'e': 'kline', 'k': {
+        's': symbol, 't': open_time, 'x': closed, 'o': close, 'h': close, 'l': close, 'c': close, 'v': 1,
+    }})
+
+def test_warm_start():
+    print("Verifying REST warm-start of the WebSocket candle cache...")
+    symbols = [f"SYM{i}USDT" for i in range(12)]
+    now = int(time.time() * 1000)
+    forming = now // STEP * STEP
+    client = FakeClient(now, flaky=['SYM3USDT'])
+    closes = []
+    closed = threading.Event()
+
+    def on_candle_close(symbol, df):
+        closes.append((symbol, df))
+        closed.set()
+
+    ws = BinanceWebSocket(symbols, timeframe='5m', http_client=client, on_candle_close=on_candle_close)
+    results = []
+
+    # The stream delivered the last closed candle before the history arrived
+    ws._on_message(None, kline_message('SYM0USDT', forming - STEP, 555.0, True))
+    ws._on_message(None, kline_message('SYM0USDT', forming, 556.0, False))
+    seeded = ws.warm_start(max_workers=4)
+
+    results.append(check("every symbol seeded (one after a retry)", seeded == len(symbols)))
+    results.append(check("REST concurrency bounded by max_workers", client.max_in_flight <= 4))
+    results.append(check("all symbols ready without streamed history", all(ws.is_ready(s) for s in symbols)))
+
+    ok = True
+    for symbol in symbols:
+        timestamps, values = ws.candle_cache[symbol].arrays()
+        ok &= len(timestamps) == ws.max_cached_candles
+        ok &= bool((np.diff(timestamps) == STEP).all()) and timestamps[-1] == forming - STEP
+    results.append(check("caches hold contiguous closed candles up to the forming one", ok))
+
+    df = ws.get_candles('SYM0USDT', 205)
+    results.append(check("streamed candle wins over REST history",
+                         df['close'].iloc[-2] == 555.0 and df['close'].iloc[-1] == 556.0))
+
+    # Live stream continues on top of the history
+    closed.clear()
+    ws._on_message(None, kline_message('SYM1USDT', forming, 999.0, True))
+    closed.wait(5)
+    symbol, df = closes[-1]
+    results.append(check("next streamed close extends the seeded cache",
+                         symbol == 'SYM1USDT' and len(df) == 205 and df['close'].iloc[-1] == 999.0
+                         and (df['timestamp'].diff().iloc[1:] == pd.Timedelta(minutes=5)).all()))
+
+    ws.stop()
+
+    if all(results):
+        print("PASS: warm-start verified.")
+    return all(results)
+
+if __name__ == "__main__":
+    test_warm_start()